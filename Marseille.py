@@ -1,807 +1,1391 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
+# matplotlib est importé à la demande : les exécutions sans figure (--data-only) n'en paient pas le coût
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+# Indicateurs simulés, dans l'ordre de génération (colonne, méthode de simulation)
+INDICATEURS = (
+    # Données démographiques
+    ('Population', '_simulate_population'),
+    ('Menages', '_simulate_households'),
+    # Recettes communales
+    ('Recettes_Totales', '_simulate_total_revenue'),
+    ('Impots_Locaux', '_simulate_tax_revenue'),
+    ('Dotations_Etat', '_simulate_state_grants'),
+    ('Autres_Recettes', '_simulate_other_revenue'),
+    # Dépenses communales
+    ('Depenses_Totales', '_simulate_total_expenses'),
+    ('Fonctionnement', '_simulate_operating_expenses'),
+    ('Investissement', '_simulate_investment_expenses'),
+    ('Charge_Dette', '_simulate_debt_charges'),
+    ('Personnel', '_simulate_staff_costs'),
+    # Indicateurs financiers
+    ('Epargne_Brute', '_simulate_gross_savings'),
+    ('Dette_Totale', '_simulate_total_debt'),
+    ('Taux_Endettement', '_simulate_debt_ratio'),
+    ('Taux_Fiscalite', '_simulate_tax_rate'),
+    # Données immobilières (spécifiques à Marseille)
+    ('Prix_m2_Moyen', '_simulate_avg_price_per_sqm'),
+    ('Transactions_Immobilieres', '_simulate_real_estate_transactions'),
+    ('Nouveaux_Logements', '_simulate_new_housing'),
+    ('Taxe_Fonciere', '_simulate_property_tax'),
+    ('Taxe_Habitation', '_simulate_residence_tax'),
+    # Investissements spécifiques adaptés à Marseille
+    ('Investissement_Immobilier', '_simulate_real_estate_investment'),
+    ('Investissement_Transport', '_simulate_transport_investment'),
+    ('Investissement_Portuaire', '_simulate_port_investment'),
+    ('Investissement_Tourisme', '_simulate_tourism_investment'),
+    ('Investissement_Culture', '_simulate_culture_investment'),
+    ('Investissement_Education', '_simulate_education_investment'),
+)
+COLONNES = tuple(column for column, _ in INDICATEURS)
+
+# Indicateurs exprimés en montants ou volumes annuels, répartis sur les périodes infra-annuelles ;
+# les autres (population, prix, dette, taux) sont des niveaux
+FLUX = tuple(column for column in COLONNES if column not in (
+    'Population', 'Menages', 'Dette_Totale', 'Taux_Endettement', 'Taux_Fiscalite', 'Prix_m2_Moyen'))
+
+# Indicateurs monétaires, en millions d'euros (M€) ; les autres sont des effectifs, des prix au m² ou des taux
+MONETAIRES = tuple(column for column in COLONNES if column not in (
+    'Population', 'Menages', 'Taux_Endettement', 'Taux_Fiscalite', 'Prix_m2_Moyen', 'Transactions_Immobilieres',
+    'Nouveaux_Logements'))
+
+# Types du mode compact (generate_financial_data(compact=True), city_frame) : indicateurs en
+# float32 (7 chiffres significatifs, bien au-delà de la précision des modèles), années en int16
+COMPACT_FLOAT = np.float32
+COMPACT_YEAR = np.int16
+
+# Résolutions temporelles : (unité datetime64, pas) ; datetime64 couvre des horizons
+# bien au-delà de 2262, limite des horodatages pandas en nanosecondes
+RESOLUTIONS = {
+    'annuelle': ('Y', 1),
+    'trimestrielle': ('M', 3),
+    'mensuelle': ('M', 1),
+    'quotidienne': ('D', 1),
+}
+
+# Profils saisonniers mensuels (moyenne 1) : marché plus actif au printemps et avant l'été
+SAISONNALITE_TRANSACTIONS = np.array([0.80, 0.85, 1.00, 1.05, 1.10, 1.20, 1.15, 0.85, 1.00, 1.05, 0.95, 1.00])
+SAISONNALITE_PRIX = np.array([0.990, 0.990, 0.995, 1.000, 1.005, 1.010, 1.015, 1.010, 1.005, 1.000, 0.990, 0.990])
+
+# Nombre de flux aléatoires par graine : un par arrondissement (1 à 16) plus "default" (0)
+N_ARRONDISSEMENTS = 16
+
+# Configuration spécifique à chaque arrondissement marseillais
+ARRONDISSEMENT_CONFIGS = {
+    "1er": {
+        "population_base": 40000,
+        "budget_base": 80,
+        "type": "centre_ville",
+        "specialites": ["vieux_port", "commerce", "administration", "tourisme"],
+        "prix_m2_base": 4500,
+        "segment_immobilier": "haut_de_gamme"
+    },
+    "2e": {
+        "population_base": 25000,
+        "budget_base": 60,
+        "type": "portuaire",
+        "specialites": ["vieux_port", "panier", "culture", "tourisme"],
+        "prix_m2_base": 5000,
+        "segment_immobilier": "premium"
+    },
+    "3e": {
+        "population_base": 45000,
+        "budget_base": 85,
+        "type": "populaire",
+        "specialites": ["commerces", "residentiel", "diversite", "proximite_centre"],
+        "prix_m2_base": 3200,
+        "segment_immobilier": "mixte"
+    },
+    "4e": {
+        "population_base": 50000,
+        "budget_base": 90,
+        "type": "historique",
+        "specialites": ["le_panier", "historique", "artistique", "tourisme"],
+        "prix_m2_base": 4800,
+        "segment_immobilier": "haut_de_gamme"
+    },
+    "5e": {
+        "population_base": 42000,
+        "budget_base": 75,
+        "type": "residentiel",
+        "specialites": ["collines", "calme", "vues_mer", "residentiel"],
+        "prix_m2_base": 3800,
+        "segment_immobilier": "residentiel"
+    },
+    "6e": {
+        "population_base": 40000,
+        "budget_base": 120,
+        "type": "bourgeois",
+        "specialites": ["prestige", "bord_mer", "luxe", "calme"],
+        "prix_m2_base": 6500,
+        "segment_immobilier": "luxe"
+    },
+    "7e": {
+        "population_base": 35000,
+        "budget_base": 100,
+        "type": "cotier",
+        "specialites": ["corniche", "plages", "tourisme", "prestige"],
+        "prix_m2_base": 6000,
+        "segment_immobilier": "luxe"
+    },
+    "8e": {
+        "population_base": 80000,
+        "budget_base": 150,
+        "type": "diversifie",
+        "specialites": ["plages", "periere", "commerce", "residentiel"],
+        "prix_m2_base": 4200,
+        "segment_immobilier": "mixte"
+    },
+    "9e": {
+        "population_base": 75000,
+        "budget_base": 110,
+        "type": "residentiel",
+        "specialites": ["mazargues", "calanques", "nature", "residentiel"],
+        "prix_m2_base": 3500,
+        "segment_immobilier": "residentiel"
+    },
+    "10e": {
+        "population_base": 60000,
+        "budget_base": 95,
+        "type": "populaire",
+        "specialites": ["estaque", "industriel", "portuaire", "diversite"],
+        "prix_m2_base": 2800,
+        "segment_immobilier": "abordable"
+    },
+    "11e": {
+        "population_base": 60000,
+        "budget_base": 90,
+        "type": "populaire",
+        "specialites": ["marseille_est", "commerces", "jeunes", "dynamique"],
+        "prix_m2_base": 2700,
+        "segment_immobilier": "abordable"
+    },
+    "12e": {
+        "population_base": 65000,
+        "budget_base": 100,
+        "type": "residentiel",
+        "specialites": ["olympiques", "stades", "parcs", "familial"],
+        "prix_m2_base": 3000,
+        "segment_immobilier": "mixte"
+    },
+    "13e": {
+        "population_base": 90000,
+        "budget_base": 130,
+        "type": "universitaire",
+        "specialites": ["universite", "hopitaux", "commerce", "diversite"],
+        "prix_m2_base": 2900,
+        "segment_immobilier": "universitaire"
+    },
+    "14e": {
+        "population_base": 65000,
+        "budget_base": 85,
+        "type": "populaire",
+        "specialites": ["sainte_marthe", "commerces", "populaire", "proximite_centre"],
+        "prix_m2_base": 2600,
+        "segment_immobilier": "abordable"
+    },
+    "15e": {
+        "population_base": 85000,
+        "budget_base": 120,
+        "type": "populaire",
+        "specialites": ["littoral", "industriel", "portuaire", "diversite"],
+        "prix_m2_base": 2500,
+        "segment_immobilier": "abordable"
+    },
+    "16e": {
+        "population_base": 20000,
+        "budget_base": 45,
+        "type": "cotier",
+        "specialites": ["l'esteve", "calanques", "nature", "calme"],
+        "prix_m2_base": 3200,
+        "segment_immobilier": "residentiel"
+    },
+    # Configuration par défaut
+    "default": {
+        "population_base": 50000,
+        "budget_base": 80,
+        "type": "residentiel",
+        "specialites": ["residentiel", "commerce_local", "services"],
+        "prix_m2_base": 3500,
+        "segment_immobilier": "mixte"
+    }
+}
+
+# Clés de configuration indexées par numéro d'arrondissement (0 = configuration par défaut)
+ARRONDISSEMENT_KEYS = ('default',) + tuple(
+    f"{number}{'er' if number == 1 else 'e'}" for number in range(1, N_ARRONDISSEMENTS + 1))
+
+# Vocabulaires codés de la table compilée (type, segment, spécialités)
+TYPES = tuple(sorted({config["type"] for config in ARRONDISSEMENT_CONFIGS.values()}))
+SEGMENTS = tuple(sorted({config["segment_immobilier"] for config in ARRONDISSEMENT_CONFIGS.values()}))
+SPECIALITES = tuple(sorted(
+    {specialite for config in ARRONDISSEMENT_CONFIGS.values() for specialite in config["specialites"]}
+    # Spécialités testées par les modèles même si aucun arrondissement ne les déclare
+    | {"residentiel", "transport", "portuaire", "tourisme", "culture", "universite"}))
+SPECIALITE_BITS = {specialite: 1 << bit for bit, specialite in enumerate(SPECIALITES)}
+
+# Taux de croissance linéaire par défaut (calibrables, voir calibrate)
+CROISSANCE_PRIX = {
+    "luxe": 0.040,  # Croissance forte pour le luxe
+    "premium": 0.038,  # Croissance pour le premium
+    "haut_de_gamme": 0.035,  # Croissance pour le haut de gamme
+}  # Croissance moyenne : 0.030
+CROISSANCE_RECETTES = {
+    "luxe": 0.025,  # Croissance forte dans les quartiers aisés
+    "populaire": 0.020,  # Croissance modérée
+}  # Croissance moyenne : 0.022
+
+# Périodes conjoncturelles du marché immobilier (début, fin) ; la dernière court jusqu'à la fin des séries
+PERIODES_CONJONCTURE = ((2002, 2007), (2008, 2009), (2010, 2013), (2014, 2019), (2020, 2021), (2022, None))
+
+# Régimes par période (niveau, pente) : niveau + pente × (année - début)
+REGIMES_PRIX = (
+    (1.0, 0.04),  # Période de croissance modérée
+    (0.92, 0.0),  # Impact de la crise financière
+    (1.0, 0.06),  # Effet Capitale Européenne de la Culture
+    (1.0, 0.04),  # Croissance soutenue
+    (1.01, 0.0),  # Résilience pendant le COVID
+    (1.0, 0.035),  # Reprise post-COVID
+)
+REGIMES_TRANSACTIONS = (
+    (1.0, 0.06),  # Croissance modérée
+    (0.70, 0.0),  # Forte baisse pendant la crise
+    (1.0, 0.08),  # Effet Capitale de la Culture
+    (1.0, 0.05),  # Croissance régulière
+    (0.78, 0.0),  # Fort ralentissement COVID
+    (1.0, 0.06),  # Reprise post-COVID
+)
+
+CONFIG_DTYPE = np.dtype([
+    ('population_base', 'f8'),
+    ('budget_base', 'f8'),
+    ('prix_m2_base', 'f8'),
+    ('type', 'u1'),
+    ('segment_immobilier', 'u1'),
+    ('specialites', 'u8'),
+    # Leviers de scénario (voir SCENARIO_LEVERS) : écart ajouté aux taux de croissance linéaire,
+    # baisse annuelle de la taxe d'habitation à partir de 2018
+    ('ajustement_croissance', 'f8'),
+    ('suppression_taxe_habitation', 'f8'),
+    # Paramètres calibrables (voir calibrate) : croissance linéaire des prix, des recettes et des
+    # transactions, échelle des transactions, régimes (niveau, pente) de PERIODES_CONJONCTURE
+    ('croissance_prix', 'f8'),
+    ('croissance_recettes', 'f8'),
+    ('croissance_transactions', 'f8'),
+    ('ajustement_transactions', 'f8'),
+    ('regimes_prix', 'f8', (len(PERIODES_CONJONCTURE), 2)),
+    ('regimes_transactions', 'f8', (len(PERIODES_CONJONCTURE), 2)),
+])
+
+def _compile_config_table():
+    """Compile les configurations en un tableau structuré NumPy indexé par numéro d'arrondissement"""
+    table = np.zeros(len(ARRONDISSEMENT_KEYS), dtype=CONFIG_DTYPE)
+    for number, key in enumerate(ARRONDISSEMENT_KEYS):
+        config = ARRONDISSEMENT_CONFIGS[key]
+        table[number] = (
+            config["population_base"],
+            config["budget_base"],
+            config["prix_m2_base"],
+            TYPES.index(config["type"]),
+            SEGMENTS.index(config["segment_immobilier"]),
+            sum(SPECIALITE_BITS[specialite] for specialite in config["specialites"]),
+            config.get("ajustement_croissance", 0.0),
+            config.get("suppression_taxe_habitation", 0.15),
+            config.get("croissance_prix", CROISSANCE_PRIX.get(config["segment_immobilier"], 0.030)),
+            config.get("croissance_recettes", CROISSANCE_RECETTES.get(config["type"], 0.022)),
+            config.get("croissance_transactions", 0.012),
+            config.get("ajustement_transactions", 1.0),
+            config.get("regimes_prix", REGIMES_PRIX),
+            config.get("regimes_transactions", REGIMES_TRANSACTIONS),
+        )
+    return table
+
+CONFIG_TABLE = _compile_config_table()
+
+# Événements marseillais : (première année, dernière année ou None, colonne, multiplicateur, libellé)
+EVENEMENTS_MARSEILLE = (
+    # Capitale Européenne de la Culture 2013
+    (2013, 2013, 'Investissement_Culture', 3.0, "Capitale Européenne de la Culture"),
+    (2013, 2013, 'Investissement_Tourisme', 1.8, "Capitale Européenne de la Culture"),
+    (2013, 2013, 'Prix_m2_Moyen', 1.08, "Capitale Européenne de la Culture"),
+    # Développement du tramway (phases successives)
+    (2007, 2008, 'Investissement_Transport', 2.2, "Lancement tramway"),
+    (2010, 2011, 'Investissement_Transport', 1.8, "Extensions tramway"),
+    (2019, 2020, 'Investissement_Transport', 1.6, "Nouvelles extensions tramway"),
+    # Euroméditerranée (grand projet d'aménagement)
+    (2005, 2015, 'Investissement_Immobilier', 1.4, "Euroméditerranée"),
+    (2005, 2015, 'Nouveaux_Logements', 1.3, "Euroméditerranée"),
+    # Impact COVID-19 (2020-2021) - marché résilient mais impacté
+    (2020, 2020, 'Transactions_Immobilieres', 0.75, "COVID-19"),
+    (2020, 2020, 'Prix_m2_Moyen', 0.98, "COVID-19"),
+    (2021, 2021, 'Prix_m2_Moyen', 1.02, "COVID-19 - reprise modérée"),
+    (2021, 2021, 'Transactions_Immobilieres', 1.08, "COVID-19 - reprise modérée"),
+    # Plan de relance marseillais (2022 et au-delà)
+    (2022, None, 'Investissement_Transport', 1.12, "Plan de relance"),
+    (2022, None, 'Investissement_Immobilier', 1.15, "Plan de relance"),
+    (2022, None, 'Nouveaux_Logements', 1.20, "Plan de relance"),
+)
+
+def load_events(path):
+    """Charge une table d'événements CSV (colonnes debut, fin, colonne, multiplicateur, libelle)"""
+    table = pd.read_csv(path, dtype={'colonne': str, 'libelle': str})
+    unknown = set(table['colonne']) - set(COLONNES)
+    if unknown:
+        raise ValueError(f"Colonnes inconnues dans la table d'événements: {sorted(unknown)}")
+    return [
+        (int(row.debut), None if pd.isna(row.fin) else int(row.fin),
+         row.colonne, float(row.multiplicateur), row.libelle)
+        for row in table.itertuples(index=False)
+    ]
+
+def arrondissement_number(name):
+    """Numéro d'arrondissement (1 à 16) à partir de 1, "1", "1er", "2e", "16ème"... ; 0 si inconnu"""
+    match = re.fullmatch(r'\s*0*(\d+)\s*(?:er|e|eme|ème)?\s*', str(name), flags=re.IGNORECASE)
+    number = int(match.group(1)) if match else 0
+    return number if 1 <= number <= N_ARRONDISSEMENTS else 0
+
+def _code_lookup(labels, values, default):
+    """Table de correspondance code -> valeur pour un vocabulaire codé"""
+    return np.array([values.get(label, default) for label in labels])
+
+
+# Indicateurs chiffrés des insights, calculés par compute_insights
+INSIGHTS = (
+    'recettes_moyennes', 'depenses_moyennes', 'prix_m2_moyen', 'transactions_moyennes',
+    'croissance_prix_pct', 'croissance_population_pct',
+    'part_impots_locaux_pct', 'part_dotations_etat_pct', 'part_taxe_fonciere_pct',
+    'prix_m2_actuel', 'impact_covid_pct',
+)
+
+EVENEMENTS_MARQUANTS = (
+    "2005-2015: Projet Euroméditerranée et transformation urbaine",
+    "2007-2010: Développement du tramway marseillais",
+    "2013: Marseille Capitale Européenne de la Culture",
+    "2014-2019: Poursuite des investissements structurants",
+    "2020-2021: Impact significatif de la crise COVID-19",
+    "2022-2025: Plan de relance et nouvelles extensions métro",
+)
+
+# Recommandations stratégiques par spécialité, puis communes à tous les arrondissements
+RECOMMANDATIONS = {
+    'portuaire': ("Développer l'économie bleue et les activités portuaires",
+                  "Valoriser le front de mer et les connexions port-ville"),
+    'tourisme': ("Renforcer l'offre touristique et l'accueil international",
+                 "Développer le tourisme de croisière et balnéaire"),
+    'culture': ("Capitaliser sur l'héritage Capitale de la Culture",
+                "Développer les industries créatives et artistiques"),
+    'universite': ("Renforcer le pôle universitaire et de recherche",
+                   "Développer l'immobilier étudiant et chercheurs"),
+}
+RECOMMANDATIONS_GENERALES = (
+    "Poursuivre les investissements en transports en commun",
+    "Améliorer la qualité de vie et les espaces publics",
+    "Lutter contre la spéculation immobilière",
+    "Développer l'offre de logements sociaux et abordables",
+)
+
+def strategic_recommendations(specialites):
+    """Recommandations stratégiques pour un ensemble de spécialités"""
+    specific = [text for specialite, texts in RECOMMANDATIONS.items() if specialite in specialites
+                for text in texts]
+    return specific + list(RECOMMANDATIONS_GENERALES)
+
+def compute_insights(values, years):
+    """Indicateurs des insights (INSIGHTS) en une passe vectorisée
+
+    values est un tableau (..., année, indicateur) dans l'ordre de COLONNES :
+    une série, un ensemble Monte Carlo (réplique, année, indicateur) ou les
+    trajectoires de plusieurs arrondissements. Chaque indicateur retourné a la
+    forme des dimensions de tête ; l'impact COVID vaut NaN si 2020 n'est pas
+    couverte.
+    """
+    values = np.asarray(values)
+    years = np.asarray(years)
+    k = COLONNES.index
+    means = values.mean(axis=-2, dtype=np.float64)
+    first = values[..., 0, :].astype(np.float64)
+    last = values[..., -1, :].astype(np.float64)
+    covid = np.flatnonzero(years == 2020)
+    price_2020 = values[..., covid[0], k('Prix_m2_Moyen')] if covid.size else np.nan
+    revenue = means[..., k('Recettes_Totales')]
+    return {
+        'recettes_moyennes': revenue,
+        'depenses_moyennes': means[..., k('Depenses_Totales')],
+        'prix_m2_moyen': means[..., k('Prix_m2_Moyen')],
+        'transactions_moyennes': means[..., k('Transactions_Immobilieres')],
+        'croissance_prix_pct': (last[..., k('Prix_m2_Moyen')] / first[..., k('Prix_m2_Moyen')] - 1) * 100,
+        'croissance_population_pct': (last[..., k('Population')] / first[..., k('Population')] - 1) * 100,
+        'part_impots_locaux_pct': means[..., k('Impots_Locaux')] / revenue * 100,
+        'part_dotations_etat_pct': means[..., k('Dotations_Etat')] / revenue * 100,
+        'part_taxe_fonciere_pct': means[..., k('Taxe_Fonciere')] / revenue * 100,
+        'prix_m2_actuel': last[..., k('Prix_m2_Moyen')],
+        'impact_covid_pct': (last[..., k('Prix_m2_Moyen')] / price_2020 - 1) * 100,
+    }
+
+
+class Metrics:
+    """Chronomètres par étape, pic mémoire (tracemalloc) et compteurs d'une exécution instrumentée
+
+    Les étapes peuvent s'imbriquer (generation > simulation/Population) ; le
+    pic mémoire d'une étape est mesuré au-dessus de la mémoire allouée à son
+    entrée. Chaque passage est aussi conservé comme événement pour la trace
+    Chrome.
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.stages = {}
+        self.counters = {}
+        self.events = []
+        self.memory_peak = 0
+        self._stack = []
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Mesure la durée (et le pic mémoire) d'un bloc sous le nom donné"""
+        import threading
+        import tracemalloc
+
+        frame = None
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            frame = [current, 0]
+            if self._stack and self._stack[-1] is not None:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            stats = self.stages.setdefault(name, {'appels': 0, 'duree_s': 0.0, 'pic_memoire_octets': 0})
+            stats['appels'] += 1
+            stats['duree_s'] += elapsed
+            if frame is not None:
+                peak = max(tracemalloc.get_traced_memory()[1], frame[1])
+                stats['pic_memoire_octets'] = max(stats['pic_memoire_octets'], peak - frame[0])
+                if self._stack and self._stack[-1] is not None:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+                self.memory_peak = max(self.memory_peak, peak)
+            self.events.append({'name': name, 'ph': 'X', 'ts': (start - self._origin) * 1e6,
+                                'dur': elapsed * 1e6, 'pid': os.getpid(), 'tid': threading.get_ident()})
+
+    def count(self, name, value=1):
+        """Incrémente un compteur"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_dict(self):
+        """Métriques sous forme de dictionnaire (étapes, compteurs, pic mémoire global)"""
+        import tracemalloc
+
+        metrics = {'etapes': {name: dict(stats) for name, stats in self.stages.items()},
+                   'compteurs': dict(self.counters)}
+        if self.memory:
+            live = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+            metrics['pic_memoire_octets'] = max(self.memory_peak, live)
+        return metrics
+
+    def merge(self, other):
+        """Ajoute les métriques et événements d'une autre exécution (ex: un processus du lot)"""
+        for name, stats in other.stages.items():
+            total = self.stages.setdefault(name, {'appels': 0, 'duree_s': 0.0, 'pic_memoire_octets': 0})
+            total['appels'] += stats['appels']
+            total['duree_s'] += stats['duree_s']
+            total['pic_memoire_octets'] = max(total['pic_memoire_octets'], stats['pic_memoire_octets'])
+        for name, value in other.counters.items():
+            self.count(name, value)
+        self.memory_peak = max(self.memory_peak, other.memory_peak)
+        shift = (other._origin - self._origin) * 1e6
+        self.events.extend({**event, 'ts': event['ts'] + shift} for event in other.events)
+
+    def write_chrome_trace(self, path):
+        """Écrit les événements au format Chrome trace (chrome://tracing, Perfetto, speedscope)"""
+        origin = min((event['ts'] for event in self.events), default=0)
+        events = [{**event, 'ts': event['ts'] - origin} for event in self.events]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+    def prometheus_text(self, prefix='marseille'):
+        """Métriques au format texte d'exposition Prometheus"""
+        lines = [f'# TYPE {prefix}_stage_seconds_total counter']
+        lines += [f'{prefix}_stage_seconds_total{{stage="{name}"}} {stats["duree_s"]:.9f}'
+                  for name, stats in self.stages.items()]
+        lines.append(f'# TYPE {prefix}_stage_calls_total counter')
+        lines += [f'{prefix}_stage_calls_total{{stage="{name}"}} {stats["appels"]}'
+                  for name, stats in self.stages.items()]
+        if self.memory:
+            lines.append(f'# TYPE {prefix}_stage_peak_memory_bytes gauge')
+            lines += [f'{prefix}_stage_peak_memory_bytes{{stage="{name}"}} {stats["pic_memoire_octets"]}'
+                      for name, stats in self.stages.items()]
+        for name, value in self.counters.items():
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+# Métriques de l'exécution instrumentée en cours (None : instrumentation désactivée)
+_METRICS = None
+_NO_STAGE = contextlib.nullcontext()
+
+def _stage(name):
+    """Étape instrumentée, ou contexte vide quand l'instrumentation est désactivée"""
+    return _NO_STAGE if _METRICS is None else _METRICS.stage(name)
+
+def _count(name, value=1):
+    if _METRICS is not None:
+        _METRICS.count(name, value)
+
+@contextlib.contextmanager
+def instrument(memory=True):
+    """Active l'instrumentation (chronomètres, compteurs, tracemalloc si memory) le temps d'un bloc
+
+        with instrument() as metrics:
+            analyzer.generate_financial_data()
+        metrics.as_dict()
+    """
+    import tracemalloc
+
+    global _METRICS
+    previous = _METRICS
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _METRICS = Metrics(memory)
+    try:
+        yield _METRICS
+    finally:
+        if memory:
+            _METRICS.memory_peak = max(_METRICS.memory_peak, tracemalloc.get_traced_memory()[1])
+        _METRICS = previous
+        if started:
+            tracemalloc.stop()
+
+
+# Dépendances des méthodes de l'analyseur : nom -> (empreinte des sources, champs de paramètres lus)
+_METHOD_DEPENDENCIES = {}
+
+def _method_dependencies(name):
+    """Empreinte du source d'une méthode et des méthodes qu'elle appelle, et champs de self.params lus"""
+    import inspect
+
+    if name not in _METHOD_DEPENDENCIES:
+        sources, fields, seen, pending = [], set(), set(), [name]
+        while pending:
+            current = pending.pop()
+            if current in seen or not hasattr(MarseilleArrondissementImmobilierAnalyzer, current):
+                continue
+            seen.add(current)
+            source = inspect.getsource(getattr(MarseilleArrondissementImmobilierAnalyzer, current))
+            sources.append(source)
+            fields.update(re.findall(r'params\[[\'"](\w+)[\'"]\]', source))
+            pending.extend(re.findall(r'self\.(\w+)\(', source))
+        digest = hashlib.sha256(''.join(sorted(sources)).encode()).hexdigest()
+        _METHOD_DEPENDENCIES[name] = (digest, sorted(fields))
+    return _METHOD_DEPENDENCIES[name]
+
 class MarseilleArrondissementImmobilierAnalyzer:
-    def __init__(self, arrondissement_name):
+    def __init__(self, arrondissement_name, seed=None):
         self.arrondissement = arrondissement_name
         self.colors = ['#003366', '#FF6B6B', '#4ECDC4', '#45B7D1', '#F9A602', 
                       '#6A0572', '#AB83A1', '#8B0000', '#228B22', '#FFD700']
         
         self.start_year = 2002
         self.end_year = 2025
+
+        # Événements marseillais appliqués aux séries (modifiable par instance)
+        self.events = list(EVENEMENTS_MARSEILLE)
+
+        # Indicateurs observés remplaçant les séries simulées (colonne -> valeurs par année, voir use_observed)
+        self.observed = {}
         
         # Configuration spécifique à chaque arrondissement marseillais
-        self.config = self._get_arrondissement_config()
-        
-    def _get_arrondissement_config(self):
-        """Retourne la configuration spécifique pour chaque arrondissement marseillais"""
-        configs = {
-            "1er": {
-                "population_base": 40000,
-                "budget_base": 80,
-                "type": "centre_ville",
-                "specialites": ["vieux_port", "commerce", "administration", "tourisme"],
-                "prix_m2_base": 4500,
-                "segment_immobilier": "haut_de_gamme"
-            },
-            "2e": {
-                "population_base": 25000,
-                "budget_base": 60,
-                "type": "portuaire",
-                "specialites": ["vieux_port", "panier", "culture", "tourisme"],
-                "prix_m2_base": 5000,
-                "segment_immobilier": "premium"
-            },
-            "3e": {
-                "population_base": 45000,
-                "budget_base": 85,
-                "type": "populaire",
-                "specialites": ["commerces", "residentiel", "diversite", "proximite_centre"],
-                "prix_m2_base": 3200,
-                "segment_immobilier": "mixte"
-            },
-            "4e": {
-                "population_base": 50000,
-                "budget_base": 90,
-                "type": "historique",
-                "specialites": ["le_panier", "historique", "artistique", "tourisme"],
-                "prix_m2_base": 4800,
-                "segment_immobilier": "haut_de_gamme"
-            },
-            "5e": {
-                "population_base": 42000,
-                "budget_base": 75,
-                "type": "residentiel",
-                "specialites": ["collines", "calme", "vues_mer", "residentiel"],
-                "prix_m2_base": 3800,
-                "segment_immobilier": "residentiel"
-            },
-            "6e": {
-                "population_base": 40000,
-                "budget_base": 120,
-                "type": "bourgeois",
-                "specialites": ["prestige", "bord_mer", "luxe", "calme"],
-                "prix_m2_base": 6500,
-                "segment_immobilier": "luxe"
-            },
-            "7e": {
-                "population_base": 35000,
-                "budget_base": 100,
-                "type": "cotier",
-                "specialites": ["corniche", "plages", "tourisme", "prestige"],
-                "prix_m2_base": 6000,
-                "segment_immobilier": "luxe"
-            },
-            "8e": {
-                "population_base": 80000,
-                "budget_base": 150,
-                "type": "diversifie",
-                "specialites": ["plages", "periere", "commerce", "residentiel"],
-                "prix_m2_base": 4200,
-                "segment_immobilier": "mixte"
-            },
-            "9e": {
-                "population_base": 75000,
-                "budget_base": 110,
-                "type": "residentiel",
-                "specialites": ["mazargues", "calanques", "nature", "residentiel"],
-                "prix_m2_base": 3500,
-                "segment_immobilier": "residentiel"
-            },
-            "10e": {
-                "population_base": 60000,
-                "budget_base": 95,
-                "type": "populaire",
-                "specialites": ["estaque", "industriel", "portuaire", "diversite"],
-                "prix_m2_base": 2800,
-                "segment_immobilier": "abordable"
-            },
-            "11e": {
-                "population_base": 60000,
-                "budget_base": 90,
-                "type": "populaire",
-                "specialites": ["marseille_est", "commerces", "jeunes", "dynamique"],
-                "prix_m2_base": 2700,
-                "segment_immobilier": "abordable"
-            },
-            "12e": {
-                "population_base": 65000,
-                "budget_base": 100,
-                "type": "residentiel",
-                "specialites": ["olympiques", "stades", "parcs", "familial"],
-                "prix_m2_base": 3000,
-                "segment_immobilier": "mixte"
-            },
-            "13e": {
-                "population_base": 90000,
-                "budget_base": 130,
-                "type": "universitaire",
-                "specialites": ["universite", "hopitaux", "commerce", "diversite"],
-                "prix_m2_base": 2900,
-                "segment_immobilier": "universitaire"
-            },
-            "14e": {
-                "population_base": 65000,
-                "budget_base": 85,
-                "type": "populaire",
-                "specialites": ["sainte_marthe", "commerces", "populaire", "proximite_centre"],
-                "prix_m2_base": 2600,
-                "segment_immobilier": "abordable"
-            },
-            "15e": {
-                "population_base": 85000,
-                "budget_base": 120,
-                "type": "populaire",
-                "specialites": ["littoral", "industriel", "portuaire", "diversite"],
-                "prix_m2_base": 2500,
-                "segment_immobilier": "abordable"
-            },
-            "16e": {
-                "population_base": 20000,
-                "budget_base": 45,
-                "type": "cotier",
-                "specialites": ["l'esteve", "calanques", "nature", "calme"],
-                "prix_m2_base": 3200,
-                "segment_immobilier": "residentiel"
-            },
-            # Configuration par défaut
-            "default": {
-                "population_base": 50000,
-                "budget_base": 80,
-                "type": "residentiel",
-                "specialites": ["residentiel", "commerce_local", "services"],
-                "prix_m2_base": 3500,
-                "segment_immobilier": "mixte"
-            }
-        }
+        self.number = arrondissement_number(arrondissement_name)
+        if not self.number:
+            raise ValueError(f"Arrondissement inconnu: {arrondissement_name} "
+                             f"(attendu: 1 à {N_ARRONDISSEMENTS} ou {', '.join(ARRONDISSEMENT_KEYS[1:])})")
+        self.config = ARRONDISSEMENT_CONFIGS[ARRONDISSEMENT_KEYS[self.number]]
+        self.params = CONFIG_TABLE[self.number]
+
+        # Flux aléatoires indépendants : graine -> arrondissement -> indicateur
+        self.seed = np.random.SeedSequence(seed).entropy
+        self._stream_seeds = None
         
-        return configs.get(self.arrondissement, configs["default"])
-    
-    def generate_financial_data(self):
-        """Génère des données financières et immobilières pour l'arrondissement marseillais"""
+    @classmethod
+    def from_params(cls, params, name="Marseille", seed=None):
+        """Analyseur sur des paramètres compilés, éventuellement vectorisés
+
+        Avec params = CONFIG_TABLE[1:, None], les modèles diffusent leurs
+        paramètres sur les 16 arrondissements à la fois.
+        """
+        analyzer = cls('1', seed=seed)
+        analyzer.arrondissement = name
+        analyzer.number = 0
+        analyzer.config = ARRONDISSEMENT_CONFIGS[ARRONDISSEMENT_KEYS[0]]
+        analyzer.params = params
+        return analyzer
+
+    def _reset_streams(self):
+        """Recrée un générateur NumPy par indicateur à partir de sa graine dérivée"""
+        if self._stream_seeds is None:
+            # Équivalent à SeedSequence(seed).spawn(N_ARRONDISSEMENTS + 1)[number], sans dériver les 16 autres
+            arrondissement_seed = np.random.SeedSequence(self.seed, spawn_key=(self.number,))
+            self._stream_seeds = dict(zip(COLONNES, arrondissement_seed.spawn(len(COLONNES))))
+        self._streams = {column: np.random.default_rng(seed)
+                         for column, seed in self._stream_seeds.items()}
+
+    def generate_financial_data(self, resolution='annuelle', compact=False):
+        """Génère des données financières et immobilières pour l'arrondissement marseillais
+
+        En mode compact, la table est assemblée dans un tampon float32
+        préalloué, l'année en int16 (voir _compact_frame).
+        """
         print(f"🏛️ Génération des données financières et immobilières pour le {self.arrondissement}e arrondissement de Marseille...")
-        
-        # Créer une base de données annuelle
-        dates = pd.date_range(start=f'{self.start_year}-01-01', 
-                             end=f'{self.end_year}-12-31', freq='Y')
-        
-        data = {'Annee': [date.year for date in dates]}
-        
-        # Données démographiques
-        data['Population'] = self._simulate_population(dates)
-        data['Menages'] = self._simulate_households(dates)
-        
-        # Recettes communales
-        data['Recettes_Totales'] = self._simulate_total_revenue(dates)
-        data['Impots_Locaux'] = self._simulate_tax_revenue(dates)
-        data['Dotations_Etat'] = self._simulate_state_grants(dates)
-        data['Autres_Recettes'] = self._simulate_other_revenue(dates)
-        
-        # Dépenses communales
-        data['Depenses_Totales'] = self._simulate_total_expenses(dates)
-        data['Fonctionnement'] = self._simulate_operating_expenses(dates)
-        data['Investissement'] = self._simulate_investment_expenses(dates)
-        data['Charge_Dette'] = self._simulate_debt_charges(dates)
-        data['Personnel'] = self._simulate_staff_costs(dates)
-        
-        # Indicateurs financiers
-        data['Epargne_Brute'] = self._simulate_gross_savings(dates)
-        data['Dette_Totale'] = self._simulate_total_debt(dates)
-        data['Taux_Endettement'] = self._simulate_debt_ratio(dates)
-        data['Taux_Fiscalite'] = self._simulate_tax_rate(dates)
-        
-        # Données immobilières (spécifiques à Marseille)
-        data['Prix_m2_Moyen'] = self._simulate_avg_price_per_sqm(dates)
-        data['Transactions_Immobilieres'] = self._simulate_real_estate_transactions(dates)
-        data['Nouveaux_Logements'] = self._simulate_new_housing(dates)
-        data['Taxe_Fonciere'] = self._simulate_property_tax(dates)
-        data['Taxe_Habitation'] = self._simulate_residence_tax(dates)
-        
-        # Investissements spécifiques adaptés à Marseille
-        data['Investissement_Immobilier'] = self._simulate_real_estate_investment(dates)
-        data['Investissement_Transport'] = self._simulate_transport_investment(dates)
-        data['Investissement_Portuaire'] = self._simulate_port_investment(dates)
-        data['Investissement_Tourisme'] = self._simulate_tourism_investment(dates)
-        data['Investissement_Culture'] = self._simulate_culture_investment(dates)
-        data['Investissement_Education'] = self._simulate_education_investment(dates)
-        
-        df = pd.DataFrame(data)
-        
+
+        self._reset_streams()
+        with _stage('generation'):
+            return self._simulate_chunk(self._years(), resolution, compact=compact)
+
+    def iter_financial_data(self, resolution='annuelle', chunk_years=10, compact=False):
+        """Génère les données par blocs de chunk_years années, à mémoire constante quel que soit l'horizon
+
+        Les flux aléatoires se poursuivent d'un bloc à l'autre : la concaténation
+        des blocs est identique à generate_financial_data(resolution).
+        """
+        self._reset_streams()
+        for first in range(self.start_year, self.end_year + 1, chunk_years):
+            last = min(first + chunk_years - 1, self.end_year)
+            yield self._simulate_chunk(np.arange(first, last + 1), resolution, compact=compact)
+
+    def _simulate_chunk(self, years, resolution, columns=COLONNES, compact=False, out=None):
+        """Simule un bloc d'années à la résolution demandée (annuelle, trimestrielle, mensuelle, quotidienne)
+
+        columns restreint la simulation à certains indicateurs ; chacun tirant
+        dans son propre flux, les valeurs sont identiques à la simulation complète.
+        compact et out : voir _compact_frame.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Résolution inconnue: {resolution} (attendu: {', '.join(RESOLUTIONS)})")
+
+        if resolution == 'annuelle':
+            # Créer une base de données annuelle
+            data = {'Annee': years}
+            data.update(self._simulate_indicators(years, columns))
+        else:
+            # Une ligne par période ; les modèles annuels sont évalués sur l'année de chaque période
+            unit, step = RESOLUTIONS[resolution]
+            dates = np.arange(np.datetime64(str(years[0]), unit), np.datetime64(str(years[-1] + 1), unit),
+                              step)
+            period_years = dates.astype('datetime64[Y]').astype(int) + 1970
+            data = {'Date': dates, 'Annee': period_years}
+            data.update(self._simulate_indicators(period_years, columns))
+
+            # Les flux annuels sont répartis sur les périodes de l'année, les niveaux sont conservés
+            unique_years, counts = np.unique(period_years, return_counts=True)
+            periods_per_year = counts[np.searchsorted(unique_years, period_years)]
+            for column in FLUX:
+                if column in data:
+                    data[column] = data[column] / periods_per_year
+
+            # Saisonnalité du marché immobilier
+            if 'Transactions_Immobilieres' in data:
+                data['Transactions_Immobilieres'] = data['Transactions_Immobilieres'] * self._seasonality(
+                    SAISONNALITE_TRANSACTIONS, dates, resolution)
+            if 'Prix_m2_Moyen' in data:
+                data['Prix_m2_Moyen'] = data['Prix_m2_Moyen'] * self._seasonality(
+                    SAISONNALITE_PRIX, dates, resolution)
+
+        if compact:
+            return self._compact_frame(data, resolution, out)
+
+        with _stage('dataframe'):
+            df = pd.DataFrame(data)
+
         # Ajouter des tendances spécifiques au marché immobilier marseillais
-        self._add_marseille_trends(df)
-        
+        with _stage('tendances'):
+            self._add_marseille_trends(df)
+
+        if self.observed:
+            self._apply_observed(df, resolution)
+
         return df
-    
-    def _simulate_population(self, dates):
+
+    def use_observed(self, table, columns=None):
+        """Substitue des valeurs observées aux indicateurs simulés, pour les années qu'elles couvrent
+
+        table suit le schéma des données générées avec une colonne
+        Arrondissement (ingest_open_data, SalesAggregate.to_frame) ; seules les
+        lignes de cet arrondissement et les valeurs renseignées sont retenues.
+        """
+        rows = table[table['Arrondissement'].astype(str) == ARRONDISSEMENT_KEYS[self.number]]
+        for column in columns or COLONNES:
+            if column in rows:
+                series = rows.set_index('Annee')[column].dropna().astype(np.float64)
+                if len(series):
+                    series.index = series.index.astype(np.int64)
+                    self.observed[column] = series
+        return self
+
+    def _apply_observed(self, df, resolution):
+        """Remplace les indicateurs observés des colonnes de df (voir _observed_values)"""
+        years = df['Annee'].to_numpy()
+        for column in self.observed:
+            if column in df:
+                values = self._observed_values(column, df[column].to_numpy(), years, resolution)
+                if values is not None:
+                    df[column] = values
+
+    def _observed_values(self, column, values, years, resolution):
+        """Série values où les années observées sont remplacées ; None si aucune ne l'est
+
+        En infra-annuel, les périodes simulées sont remises à l'échelle : le
+        total de l'année (flux) ou sa moyenne (niveaux) devient la valeur
+        observée, le profil saisonnier simulé étant conservé.
+        """
+        observed = self.observed[column].reindex(years).to_numpy()
+        known = ~np.isnan(observed)
+        if not known.any():
+            return None
+        if resolution != 'annuelle':
+            simulated = pd.Series(values).groupby(years).transform('sum' if column in FLUX else 'mean')
+            observed = values * observed / simulated.to_numpy()
+        return np.where(known, observed, values)
+
+    def _compact_frame(self, data, resolution, out=None):
+        """Assemble la table compacte : indicateurs float32 dans un tampon (période × indicateur), année int16
+
+        Chaque série, tendances et valeurs observées appliquées en float64,
+        est écrite directement dans sa colonne du tampon (out s'il est fourni,
+        par exemple une tranche du tampon d'une ville entière) puis libérée ;
+        le DataFrame est une vue sur ce tampon, sans copie. Les valeurs sont
+        celles du mode standard arrondies en float32.
+        """
+        years = data['Annee']
+        indicators = [column for column in COLONNES if column in data]
+        with _stage('tendances'):
+            factors = self._trend_factors(years)
+        with _stage('dataframe'):
+            buffer = np.empty((len(years), len(indicators)), dtype=COMPACT_FLOAT) if out is None else out
+            for k, column in enumerate(indicators):
+                values = data.pop(column) * factors[:, COLONNES.index(column)]
+                if column in self.observed:
+                    observed = self._observed_values(column, values, years, resolution)
+                    values = values if observed is None else observed
+                buffer[:, k] = values
+            df = pd.DataFrame(buffer, columns=indicators, copy=False)
+            df.insert(0, 'Annee', years.astype(COMPACT_YEAR))
+            if 'Date' in data:
+                df.insert(0, 'Date', data['Date'])
+        return df
+
+    def cache_key(self, kind, **options):
+        """Clé de cache : empreinte de la configuration, de la graine, des années, des événements et du code"""
+        payload = {
+            'kind': kind,
+            'arrondissement': ARRONDISSEMENT_KEYS[self.number],
+            'params': {name: np.asarray(self.params[name]).tolist() for name in CONFIG_DTYPE.names},
+            'seed': self.seed,
+            'annees': [self.start_year, self.end_year],
+            'events': self.events,
+            'observed': {column: series.to_dict() for column, series in self.observed.items()},
+            'code': code_version(),
+            'options': options,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def column_fingerprints(self, resolution='annuelle'):
+        """Empreinte de chaque indicateur : ce dont dépend sa série, et rien d'autre
+
+        Une colonne dépend du source de sa méthode _simulate_* (et des méthodes
+        qu'elle appelle), des champs de configuration qu'elles lisent, des
+        événements qui la visent, de son flux aléatoire (graine et
+        arrondissement), des années, de la résolution et du moteur commun
+        (_simulate_chunk, tendances, saisonnalité).
+        """
+        engine = _method_dependencies('_simulate_chunk')[0]
+        fingerprints = {}
+        for column, method in INDICATEURS:
+            source, fields = _method_dependencies(method)
+            payload = {
+                'colonne': column,
+                'modele': source,
+                'moteur': engine,
+                'params': {field: np.asarray(self.params[field]).tolist() for field in fields},
+                'evenements': [event for event in self.events if event[2] == column],
+                'observe': self.observed[column].to_dict() if column in self.observed else None,
+                'flux': [self.seed, self.number],
+                'annees': [self.start_year, self.end_year],
+                'resolution': resolution,
+                'repartition': column in FLUX,
+                'saisonnalite': {'Transactions_Immobilieres': SAISONNALITE_TRANSACTIONS,
+                                 'Prix_m2_Moyen': SAISONNALITE_PRIX}.get(column),
+            }
+            fingerprints[column] = hashlib.sha256(
+                json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+        return fingerprints
+
+    def generate_incremental(self, cache, resolution='annuelle'):
+        """generate_financial_data ne recalculant que les indicateurs dont l'empreinte a changé
+
+        Chaque colonne est conservée dans le cache de résultats sous son
+        empreinte (column_fingerprints) : après la modification d'un événement
+        ou d'un modèle, seules les colonnes concernées sont simulées, les
+        autres sont relues. Retourne les données (identiques à une génération
+        complète) et la liste des colonnes recalculées.
+        """
+        fingerprints = self.column_fingerprints(resolution)
+        cached = {column: cache.get_array(key) for column, key in fingerprints.items()}
+        stale = [column for column in COLONNES if cached[column] is None]
+
+        self._reset_streams()
+        df = self._simulate_chunk(self._years(), resolution, columns=stale)
+        for column in stale:
+            cache.put_array(fingerprints[column], df[column].to_numpy())
+        data = {column: df[column] for column in df.columns if column not in COLONNES}
+        data.update((column, df[column] if cached[column] is None else cached[column]) for column in COLONNES)
+        _count('colonnes_recalculees', len(stale))
+        return pd.DataFrame(data), stale
+
+    def panel_key(self, df, method, dpi=100, file_format='png'):
+        """Clé de cache d'un panneau : source du tracé, données des colonnes tracées, options de rendu"""
+        import inspect
+
+        source = inspect.getsource(getattr(type(self), method))
+        digest = hashlib.sha256()
+        digest.update(json.dumps([source, inspect.getsource(_render_panel), self.number,
+                                  self.start_year, self.end_year, dpi, file_format]).encode())
+        for column in ['Annee', *(column for column in COLONNES if f"'{column}'" in source)]:
+            digest.update(np.ascontiguousarray(df[column].to_numpy()).tobytes())
+        return digest.hexdigest()
+
+    def label_data(self, df):
+        """Ajoute les colonnes catégorielles Arrondissement et Segment_Immobilier (encodées en dictionnaire)"""
+        labeled = df.copy()
+        labeled.insert(0, 'Arrondissement', pd.Categorical(
+            [ARRONDISSEMENT_KEYS[self.number]] * len(df), categories=ARRONDISSEMENT_KEYS))
+        labeled.insert(1, 'Segment_Immobilier', pd.Categorical(
+            [SEGMENTS[self.params['segment_immobilier']]] * len(df), categories=SEGMENTS))
+        return labeled
+
+    @staticmethod
+    def _seasonality(profile, dates, resolution):
+        """Facteur saisonnier de chaque période à partir d'un profil mensuel"""
+        months = dates.astype('datetime64[M]').astype(int) % 12
+        if resolution == 'trimestrielle':
+            return profile.reshape(4, 3).mean(axis=1)[months // 3]
+        return profile[months]
+
+    def _years(self):
+        """Retourne les années simulées sous forme de tableau NumPy"""
+        return np.arange(self.start_year, self.end_year + 1)
+
+    def generate_ensemble(self, n_replicas, dtype=np.float64, out=None):
+        """Génère n_replicas tirages Monte Carlo sous forme d'un tableau (réplique × année × indicateur)
+
+        Les indicateurs suivent l'ordre de COLONNES ; les tendances marseillaises
+        sont appliquées comme une matrice de facteurs (année × indicateur).
+        out est un tampon préalloué de cette forme (dtype ignoré) à remplir.
+        """
+        years = self._years()
+        start = time.perf_counter()
+        self._reset_streams()
+
+        ensemble = np.empty((n_replicas, len(years), len(INDICATEURS)), dtype=dtype) if out is None else out
+        for k, (column, method) in enumerate(INDICATEURS):
+            with _stage(f'simulation/{column}'):
+                trend, sigma = getattr(self, method)(years)
+                if sigma:
+                    ensemble[:, :, k] = trend * self._noise(column, sigma, (n_replicas, len(years)))
+                else:
+                    ensemble[:, :, k] = trend
+        with _stage('tendances'):
+            ensemble *= self._trend_factors(years)
+        _count('series_annees', ensemble.size)
+
+        self._record_generation_stats(ensemble.size, time.perf_counter() - start)
+        return ensemble
+
+    def ensemble_percentiles(self, n_replicas=1000, percentiles=(5, 50, 95), dtype=np.float64):
+        """Retourne les bandes de percentiles (P5/P50/P95 par défaut) de chaque indicateur"""
+        ensemble = self.generate_ensemble(n_replicas, dtype=dtype)
+        bands = np.percentile(ensemble, percentiles, axis=0)
+
+        data = {'Annee': self._years()}
+        for k, column in enumerate(COLONNES):
+            for p, band in zip(percentiles, bands):
+                data[f'{column}_P{p}'] = band[:, k]
+        return pd.DataFrame(data)
+
+    def simulate_trends(self, years=None, columns=COLONNES):
+        """Tendances déterministes (espérance des séries, événements inclus) : (..., année, indicateur)
+
+        Les dimensions de tête sont celles de self.params, par exemple
+        (arrondissement,) pour un analyseur créé par from_params(CONFIG_TABLE[1:, None]).
+        columns restreint le calcul à certains indicateurs (dans l'ordre de COLONNES).
+        """
+        years = self._years() if years is None else years
+        shape = np.broadcast_shapes(np.shape(self.params)[:-1] + (1,) if np.ndim(self.params) else (),
+                                    (len(years),))
+        selected = [k for k, column in enumerate(COLONNES) if column in columns]
+        trends = np.empty(shape + (len(selected),))
+        for j, k in enumerate(selected):
+            trends[..., j] = getattr(self, INDICATEURS[k][1])(years)[0]
+        return trends * self._trend_factors(years)[:, selected]
+
+    def generate_indicator(self, column, n_replicas=None):
+        """Régénère une seule série (tendances incluses) sans simuler les autres indicateurs
+
+        Le résultat est identique à la colonne correspondante de
+        generate_financial_data() (ou de generate_ensemble() avec n_replicas).
+        """
+        years = self._years()
+        self._reset_streams()
+        trend, sigma = getattr(self, dict(INDICATEURS)[column])(years)
+        shape = (len(years),) if n_replicas is None else (n_replicas, len(years))
+        series = trend * self._noise(column, sigma, shape) if sigma else np.broadcast_to(trend, shape)
+        return series * self._trend_factors(years)[:, COLONNES.index(column)]
+
+    def _trend_factors(self, years):
+        """Matrice (année × indicateur) des multiplicateurs de la table d'événements"""
+        factors = np.ones((len(years), len(COLONNES)))
+        for start, end, column, multiplier, _ in self.events:
+            active = (years >= start) & (years <= (end if end is not None else years.max()))
+            factors[active, COLONNES.index(column)] *= multiplier
+        return factors
+
+    def _simulate_indicators(self, years, columns=COLONNES):
+        """Simule les séries de l'arrondissement (toutes par défaut) et mesure le débit du moteur"""
+        start = time.perf_counter()
+        data = {}
+        for column, method in INDICATEURS:
+            if column not in columns:
+                continue
+            with _stage(f'simulation/{column}'):
+                trend, sigma = getattr(self, method)(years)
+                data[column] = trend * self._noise(column, sigma, trend.shape) if sigma else trend
+        self._record_generation_stats(len(data) * len(years), time.perf_counter() - start)
+        _count('series_annees', len(data) * len(years))
+        return data
+
+    def _record_generation_stats(self, series_years, elapsed):
+        """Mémorise le débit de la dernière génération (séries-années par seconde)"""
+        self.generation_stats = {
+            'series_annees': series_years,
+            'duree_s': elapsed,
+            'series_annees_par_s': series_years / elapsed if elapsed > 0 else float('inf'),
+        }
+
+    # Moteur de simulation vectorisé : chaque série est le produit d'une base,
+    # de facteurs annuels (croissance, régimes, multiplicateurs) et d'un bruit
+    # gaussien multiplicatif tiré en un seul lot par le moteur.
+
+    def _series(self, base, factors, sigma=0.0):
+        """Retourne la tendance base × facteurs annuels et l'écart-type du bruit N(1, sigma)"""
+        trend = base
+        for factor in factors:
+            trend = trend * factor
+        return trend, sigma
+
+    def _noise(self, column, sigma, shape):
+        """Tire en un lot le bruit multiplicatif N(1, sigma) dans le flux propre à l'indicateur"""
+        return self._streams[column].normal(1, sigma, shape)
+
+    def _specialite_multiplier(self, specialite, present, absent):
+        """Multiplicateur selon la présence d'une spécialité dans le masque de l'arrondissement"""
+        return np.where(self.params["specialites"] & SPECIALITE_BITS[specialite], present, absent)
+
+    def _growth(self, years, rate):
+        """Croissance linéaire 1 + rate × i, i étant le nombre d'années depuis start_year
+
+        Le levier ajustement_croissance des paramètres s'ajoute au taux.
+        """
+        return 1 + (rate + self.params["ajustement_croissance"]) * (years - self.start_year)
+
+    @staticmethod
+    def _growth_since(years, start, rate, cap=None):
+        """Croissance linéaire à partir d'une année de référence (1 avant)"""
+        return 1 + rate * np.clip(years - start, 0, cap)
+
+    @staticmethod
+    def _year_multipliers(years, multipliers, default=1.0):
+        """Multiplicateurs ponctuels {(années,): valeur} via une table de correspondance"""
+        first = min(years.min(), *(min(group) for group in multipliers))
+        last = max(years.max(), *(max(group) for group in multipliers))
+        lookup = np.full(last - first + 1, default, dtype=float)
+        for group, value in multipliers.items():
+            lookup[np.asarray(group) - first] = value
+        return lookup[years - first]
+
+    @staticmethod
+    def _regime_multipliers(years, regimes, default):
+        """Régimes par périodes (debut, fin, niveau, pente) : niveau + pente × (année - debut)"""
+        conditions = [(years >= start) & (years <= end) for start, end, _, _ in regimes]
+        choices = [level + slope * (years - start) for start, _, level, slope in regimes]
+        start, level, slope = default
+        return np.select(conditions, choices, level + slope * (years - start))
+
+    def _conjoncture(self, years, regimes):
+        """Multiplicateurs des régimes de PERIODES_CONJONCTURE, regimes[..., période] = (niveau, pente)"""
+        periods = [(start, end, regimes[..., i, 0], regimes[..., i, 1])
+                   for i, (start, end) in enumerate(PERIODES_CONJONCTURE[:-1])]
+        start = PERIODES_CONJONCTURE[-1][0]
+        return self._regime_multipliers(years, periods, (start, regimes[..., -1, 0], regimes[..., -1, 1]))
+
+    def _simulate_population(self, years):
         """Simule la population de l'arrondissement (croissance marseillaise modérée)"""
-        base_population = self.config["population_base"]
-        
-        population = []
-        for i, date in enumerate(dates):
-            # Croissance démographique marseillaise
-            if self.config["type"] == "centre_ville":
-                growth_rate = 0.005  # Croissance modérée dans le centre
-            elif self.config["type"] == "luxe":
-                growth_rate = 0.003  # Croissance faible dans les quartiers aisés
-            elif self.config["type"] == "populaire":
-                growth_rate = 0.008  # Croissance plus forte dans les quartiers populaires
-            else:
-                growth_rate = 0.006  # Croissance moyenne
-                
-            growth = 1 + growth_rate * i
-            population.append(base_population * growth)
-        
-        return population
-    
-    def _simulate_households(self, dates):
+        base_population = self.params["population_base"]
+
+        # Croissance démographique marseillaise
+        growth_rate = _code_lookup(TYPES, {
+            "centre_ville": 0.005,  # Croissance modérée dans le centre
+            "luxe": 0.003,  # Croissance faible dans les quartiers aisés
+            "populaire": 0.008,  # Croissance plus forte dans les quartiers populaires
+        }, 0.006)[self.params["type"]]  # Croissance moyenne
+
+        return self._series(base_population, [self._growth(years, growth_rate)])
+
+    def _simulate_households(self, years):
         """Simule le nombre de ménages"""
-        base_households = self.config["population_base"] / 2.1  # Taille des ménages plus petite à Marseille
-        
-        households = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.007 * i  # Croissance modérée
-            households.append(base_households * growth)
-        
-        return households
-    
-    def _simulate_total_revenue(self, dates):
+        base_households = self.params["population_base"] / 2.1  # Taille des ménages plus petite à Marseille
+
+        return self._series(base_households, [self._growth(years, 0.007)])  # Croissance modérée
+
+    def _simulate_total_revenue(self, years):
         """Simule les recettes totales de l'arrondissement"""
-        base_revenue = self.config["budget_base"]
-        
-        revenue = []
-        for i, date in enumerate(dates):
-            # Croissance économique marseillaise
-            if self.config["type"] == "luxe":
-                growth_rate = 0.025  # Croissance forte dans les quartiers aisés
-            elif self.config["type"] == "populaire":
-                growth_rate = 0.020  # Croissance modérée
-            else:
-                growth_rate = 0.022  # Croissance moyenne
-                
-            growth = 1 + growth_rate * i
-            noise = np.random.normal(1, 0.07)
-            revenue.append(base_revenue * growth * noise)
-        
-        return revenue
-    
-    def _simulate_tax_revenue(self, dates):
+        base_revenue = self.params["budget_base"]
+
+        # Croissance économique marseillaise (CROISSANCE_RECETTES par type)
+        return self._series(base_revenue, [self._growth(years, self.params["croissance_recettes"])], 0.07)
+
+    def _simulate_tax_revenue(self, years):
         """Simule les recettes fiscales"""
-        base_tax = self.config["budget_base"] * 0.35
-        
-        tax_revenue = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.018 * i
-            noise = np.random.normal(1, 0.08)
-            tax_revenue.append(base_tax * growth * noise)
-        
-        return tax_revenue
-    
-    def _simulate_state_grants(self, dates):
+        base_tax = self.params["budget_base"] * 0.35
+
+        return self._series(base_tax, [self._growth(years, 0.018)], 0.08)
+
+    def _simulate_state_grants(self, years):
         """Simule les dotations de l'État"""
-        base_grants = self.config["budget_base"] * 0.40  # Plus de dotations à Marseille
-        
-        grants = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year >= 2010:
-                increase = 1 + 0.006 * (year - 2010)
-            else:
-                increase = 1
-            
-            noise = np.random.normal(1, 0.06)
-            grants.append(base_grants * increase * noise)
-        
-        return grants
-    
-    def _simulate_other_revenue(self, dates):
+        base_grants = self.params["budget_base"] * 0.40  # Plus de dotations à Marseille
+
+        return self._series(base_grants, [self._growth_since(years, 2010, 0.006)], 0.06)
+
+    def _simulate_other_revenue(self, years):
         """Simule les autres recettes"""
-        base_other = self.config["budget_base"] * 0.25
-        
-        other_revenue = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.020 * i
-            noise = np.random.normal(1, 0.09)
-            other_revenue.append(base_other * growth * noise)
-        
-        return other_revenue
-    
-    def _simulate_total_expenses(self, dates):
+        base_other = self.params["budget_base"] * 0.25
+
+        return self._series(base_other, [self._growth(years, 0.020)], 0.09)
+
+    def _simulate_total_expenses(self, years):
         """Simule les dépenses totales"""
-        base_expenses = self.config["budget_base"] * 0.98  # Dépenses plus élevées à Marseille
-        
-        expenses = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.025 * i
-            noise = np.random.normal(1, 0.06)
-            expenses.append(base_expenses * growth * noise)
-        
-        return expenses
-    
-    def _simulate_operating_expenses(self, dates):
+        base_expenses = self.params["budget_base"] * 0.98  # Dépenses plus élevées à Marseille
+
+        return self._series(base_expenses, [self._growth(years, 0.025)], 0.06)
+
+    def _simulate_operating_expenses(self, years):
         """Simule les dépenses de fonctionnement"""
-        base_operating = self.config["budget_base"] * 0.65  # Plus de fonctionnement à Marseille
-        
-        operating = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.022 * i
-            noise = np.random.normal(1, 0.05)
-            operating.append(base_operating * growth * noise)
-        
-        return operating
-    
-    def _simulate_investment_expenses(self, dates):
+        base_operating = self.params["budget_base"] * 0.65  # Plus de fonctionnement à Marseille
+
+        return self._series(base_operating, [self._growth(years, 0.022)], 0.05)
+
+    def _simulate_investment_expenses(self, years):
         """Simule les dépenses d'investissement"""
-        base_investment = self.config["budget_base"] * 0.33
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2007, 2013, 2019, 2024]:
-                multiplier = 1.5
-            elif year in [2009, 2015, 2021]:
-                multiplier = 0.8
-            else:
-                multiplier = 1.0
-            
-            growth = 1 + 0.020 * i
-            noise = np.random.normal(1, 0.16)
-            investment.append(base_investment * growth * multiplier * noise)
-        
-        return investment
-    
-    def _simulate_debt_charges(self, dates):
+        base_investment = self.params["budget_base"] * 0.33
+
+        multiplier = self._year_multipliers(years, {
+            (2007, 2013, 2019, 2024): 1.5,
+            (2009, 2015, 2021): 0.8,
+        })
+
+        return self._series(base_investment, [self._growth(years, 0.020), multiplier], 0.16)
+
+    def _simulate_debt_charges(self, years):
         """Simule les charges de la dette"""
-        base_debt_charge = self.config["budget_base"] * 0.08  # Dette plus élevée à Marseille
-        
-        debt_charges = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year >= 2005:
-                increase = 1 + 0.008 * (year - 2005)
-            else:
-                increase = 1
-            
-            noise = np.random.normal(1, 0.09)
-            debt_charges.append(base_debt_charge * increase * noise)
-        
-        return debt_charges
-    
-    def _simulate_staff_costs(self, dates):
+        base_debt_charge = self.params["budget_base"] * 0.08  # Dette plus élevée à Marseille
+
+        return self._series(base_debt_charge, [self._growth_since(years, 2005, 0.008)], 0.09)
+
+    def _simulate_staff_costs(self, years):
         """Simule les dépenses de personnel"""
-        base_staff = self.config["budget_base"] * 0.45  # Plus de personnel à Marseille
-        
-        staff_costs = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.021 * i
-            noise = np.random.normal(1, 0.04)
-            staff_costs.append(base_staff * growth * noise)
-        
-        return staff_costs
-    
-    def _simulate_gross_savings(self, dates):
+        base_staff = self.params["budget_base"] * 0.45  # Plus de personnel à Marseille
+
+        return self._series(base_staff, [self._growth(years, 0.021)], 0.04)
+
+    def _simulate_gross_savings(self, years):
         """Simule l'épargne brute"""
-        savings = []
-        for i, date in enumerate(dates):
-            base_saving = self.config["budget_base"] * 0.02  # Épargne plus faible à Marseille
-            
-            year = date.year
-            if year >= 2010:
-                improvement = 1 + 0.007 * (year - 2010)
-            else:
-                improvement = 1
-            
-            noise = np.random.normal(1, 0.13)
-            savings.append(base_saving * improvement * noise)
-        
-        return savings
-    
-    def _simulate_total_debt(self, dates):
+        base_saving = self.params["budget_base"] * 0.02  # Épargne plus faible à Marseille
+
+        return self._series(base_saving, [self._growth_since(years, 2010, 0.007)], 0.13)
+
+    def _simulate_total_debt(self, years):
         """Simule la dette totale"""
-        base_debt = self.config["budget_base"] * 0.90  # Dette plus élevée
-        
-        debt = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2007, 2013, 2019, 2024]:
-                change = 1.20
-            elif year in [2009, 2015, 2021]:
-                change = 0.92
-            else:
-                change = 1.0
-            
-            noise = np.random.normal(1, 0.08)
-            debt.append(base_debt * change * noise)
-        
-        return debt
-    
-    def _simulate_debt_ratio(self, dates):
+        base_debt = self.params["budget_base"] * 0.90  # Dette plus élevée
+
+        change = self._year_multipliers(years, {
+            (2007, 2013, 2019, 2024): 1.20,
+            (2009, 2015, 2021): 0.92,
+        })
+
+        return self._series(base_debt, [change], 0.08)
+
+    def _simulate_debt_ratio(self, years):
         """Simule le taux d'endettement"""
-        ratios = []
-        for i, date in enumerate(dates):
-            base_ratio = 0.85  # Endettement plus élevé à Marseille
-            
-            year = date.year
-            if year >= 2010:
-                improvement = 1 - 0.008 * (year - 2010)
-            else:
-                improvement = 1
-            
-            noise = np.random.normal(1, 0.06)
-            ratios.append(base_ratio * improvement * noise)
-        
-        return ratios
-    
-    def _simulate_tax_rate(self, dates):
+        base_ratio = 0.85  # Endettement plus élevé à Marseille
+
+        return self._series(base_ratio, [self._growth_since(years, 2010, -0.008)], 0.06)
+
+    def _simulate_tax_rate(self, years):
         """Simule le taux de fiscalité (plus élevé à Marseille)"""
-        rates = []
-        for i, date in enumerate(dates):
-            base_rate = 1.05  # Fiscalité plus élevée
-            
-            year = date.year
-            if year >= 2010:
-                increase = 1 + 0.005 * (year - 2010)
-            else:
-                increase = 1
-            
-            noise = np.random.normal(1, 0.04)
-            rates.append(base_rate * increase * noise)
-        
-        return rates
-    
-    def _simulate_avg_price_per_sqm(self, dates):
+        base_rate = 1.05  # Fiscalité plus élevée
+
+        return self._series(base_rate, [self._growth_since(years, 2010, 0.005)], 0.04)
+
+    def _simulate_avg_price_per_sqm(self, years):
         """Simule le prix moyen au m² (spécifique à Marseille)"""
-        base_price = self.config["prix_m2_base"]
-        
-        prices = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance du marché immobilier marseillais
-            if self.config["segment_immobilier"] == "luxe":
-                growth_rate = 0.040  # Croissance forte pour le luxe
-            elif self.config["segment_immobilier"] == "premium":
-                growth_rate = 0.038  # Croissance pour le premium
-            elif self.config["segment_immobilier"] == "haut_de_gamme":
-                growth_rate = 0.035  # Croissance pour le haut de gamme
-            else:
-                growth_rate = 0.030  # Croissance moyenne
-            
-            # Ajustements annuels basés sur des événements réels
-            if 2002 <= year <= 2007:
-                # Période de croissance modérée
-                multiplier = 1 + 0.04 * (year - 2002)
-            elif 2008 <= year <= 2009:
-                # Impact de la crise financière
-                multiplier = 0.92
-            elif 2010 <= year <= 2013:
-                # Effet Capitale Européenne de la Culture
-                multiplier = 1 + 0.06 * (year - 2010)
-            elif 2014 <= year <= 2019:
-                # Croissance soutenue
-                multiplier = 1 + 0.04 * (year - 2014)
-            elif 2020 <= year <= 2021:
-                # Résilience pendant le COVID
-                multiplier = 1.01
-            else:
-                # Reprise post-COVID
-                multiplier = 1 + 0.035 * (year - 2022)
-            
-            growth = 1 + growth_rate * i
-            noise = np.random.normal(1, 0.10)
-            prices.append(base_price * growth * multiplier * noise)
-        
-        return prices
-    
-    def _simulate_real_estate_transactions(self, dates):
+        base_price = self.params["prix_m2_base"]
+
+        # Croissance du marché immobilier marseillais (CROISSANCE_PRIX par segment)
+        growth = self._growth(years, self.params["croissance_prix"])
+
+        # Ajustements annuels basés sur des événements réels (REGIMES_PRIX)
+        multiplier = self._conjoncture(years, self.params["regimes_prix"])
+
+        return self._series(base_price, [growth, multiplier], 0.10)
+
+    def _simulate_real_estate_transactions(self, years):
         """Simule le nombre de transactions immobilières"""
-        base_transactions = self.config["population_base"] / 120  # Base proportionnelle à la population
-        
-        transactions = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Variations selon la conjoncture
-            if 2002 <= year <= 2007:
-                multiplier = 1 + 0.06 * (year - 2002)  # Croissance modérée
-            elif 2008 <= year <= 2009:
-                multiplier = 0.70  # Forte baisse pendant la crise
-            elif 2010 <= year <= 2013:
-                multiplier = 1 + 0.08 * (year - 2010)  # Effet Capitale de la Culture
-            elif 2014 <= year <= 2019:
-                multiplier = 1 + 0.05 * (year - 2014)  # Croissance régulière
-            elif 2020 <= year <= 2021:
-                multiplier = 0.78  # Fort ralentissement COVID
-            else:
-                multiplier = 1 + 0.06 * (year - 2022)  # Reprise post-COVID
-            
-            growth = 1 + 0.012 * i
-            noise = np.random.normal(1, 0.14)
-            transactions.append(base_transactions * growth * multiplier * noise)
-        
-        return transactions
-    
-    def _simulate_new_housing(self, dates):
+        # Base proportionnelle à la population
+        base_transactions = self.params["population_base"] / 120 * self.params["ajustement_transactions"]
+
+        # Variations selon la conjoncture (REGIMES_TRANSACTIONS)
+        multiplier = self._conjoncture(years, self.params["regimes_transactions"])
+
+        return self._series(base_transactions,
+                            [self._growth(years, self.params["croissance_transactions"]), multiplier], 0.14)
+
+    def _simulate_new_housing(self, years):
         """Simule le nombre de nouveaux logements construits"""
-        base_housing = self.config["population_base"] / 600  # Base proportionnelle
-        
-        housing = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Pics de construction selon les programmes
-            if year in [2005, 2010, 2015, 2020]:
-                multiplier = 1.8  # Années de grands programmes
-            elif year in [2008, 2014, 2021]:
-                multiplier = 0.6  # Ralentissements
-            else:
-                multiplier = 1.0
-            
-            growth = 1 + 0.015 * i
-            noise = np.random.normal(1, 0.22)
-            housing.append(base_housing * growth * multiplier * noise)
-        
-        return housing
-    
-    def _simulate_property_tax(self, dates):
+        base_housing = self.params["population_base"] / 600  # Base proportionnelle
+
+        # Pics de construction selon les programmes
+        multiplier = self._year_multipliers(years, {
+            (2005, 2010, 2015, 2020): 1.8,  # Années de grands programmes
+            (2008, 2014, 2021): 0.6,  # Ralentissements
+        })
+
+        return self._series(base_housing, [self._growth(years, 0.015), multiplier], 0.22)
+
+    def _simulate_property_tax(self, years):
         """Simule la taxe foncière"""
-        base_tax = self.config["budget_base"] * 0.18  # Plus élevée à Marseille
-        
-        tax = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year >= 2010:
-                increase = 1 + 0.014 * (year - 2010)
-            else:
-                increase = 1
-            
-            noise = np.random.normal(1, 0.07)
-            tax.append(base_tax * increase * noise)
-        
-        return tax
-    
-    def _simulate_residence_tax(self, dates):
+        base_tax = self.params["budget_base"] * 0.18  # Plus élevée à Marseille
+
+        return self._series(base_tax, [self._growth_since(years, 2010, 0.014)], 0.07)
+
+    def _simulate_residence_tax(self, years):
         """Simule la taxe d'habitation (en diminution)"""
-        base_tax = self.config["budget_base"] * 0.15  # Plus élevée à Marseille
-        
-        tax = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year >= 2018:
-                # Réduction progressive de la taxe d'habitation
-                reduction = 1 - 0.15 * min(4, year - 2018)  # Suppression progressive
-            else:
-                reduction = 1
-            
-            noise = np.random.normal(1, 0.06)
-            tax.append(base_tax * reduction * noise)
-        
-        return tax
-    
-    def _simulate_real_estate_investment(self, dates):
+        base_tax = self.params["budget_base"] * 0.15  # Plus élevée à Marseille
+
+        # Réduction progressive de la taxe d'habitation (suppression progressive), jamais en dessous de zéro
+        reduction = np.maximum(
+            self._growth_since(years, 2018, -self.params["suppression_taxe_habitation"], cap=4), 0)
+
+        return self._series(base_tax, [reduction], 0.06)
+
+    def _simulate_real_estate_investment(self, years):
         """Simule l'investissement immobilier"""
-        base_investment = self.config["budget_base"] * 0.07
-        
+        base_investment = self.params["budget_base"] * 0.07
+
         # Ajustement selon les spécialités
-        multiplier = 1.4 if "residentiel" in self.config["specialites"] else 0.9
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2006, 2012, 2018, 2023]:
-                year_multiplier = 1.6
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.028 * i
-            noise = np.random.normal(1, 0.17)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
-        
-        return investment
-    
-    def _simulate_transport_investment(self, dates):
+        multiplier = self._specialite_multiplier("residentiel", 1.4, 0.9)
+
+        year_multiplier = self._year_multipliers(years, {(2006, 2012, 2018, 2023): 1.6})
+
+        return self._series(base_investment,
+                            [self._growth(years, 0.028), year_multiplier, multiplier], 0.17)
+
+    def _simulate_transport_investment(self, years):
         """Simule l'investissement en transport (métro, tramway, etc.)"""
-        base_investment = self.config["budget_base"] * 0.05
-        
+        base_investment = self.params["budget_base"] * 0.05
+
         # Ajustement selon les spécialités
-        multiplier = 1.5 if "transport" in self.config["specialites"] else 1.0
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Pics d'investissement liés aux extensions de métro/tramway
-            if year in [2003, 2007, 2010, 2019]:
-                year_multiplier = 2.0
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.025 * i
-            noise = np.random.normal(1, 0.19)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
-        
-        return investment
-    
-    def _simulate_port_investment(self, dates):
+        multiplier = self._specialite_multiplier("transport", 1.5, 1.0)
+
+        # Pics d'investissement liés aux extensions de métro/tramway
+        year_multiplier = self._year_multipliers(years, {(2003, 2007, 2010, 2019): 2.0})
+
+        return self._series(base_investment,
+                            [self._growth(years, 0.025), year_multiplier, multiplier], 0.19)
+
+    def _simulate_port_investment(self, years):
         """Simule l'investissement portuaire (spécifique à Marseille)"""
-        base_investment = self.config["budget_base"] * 0.04
-        
+        base_investment = self.params["budget_base"] * 0.04
+
         # Ajustement selon les spécialités
-        multiplier = 2.2 if "portuaire" in self.config["specialites"] else 0.4
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2005, 2010, 2015, 2020]:
-                year_multiplier = 1.8
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.030 * i
-            noise = np.random.normal(1, 0.23)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
-        
-        return investment
-    
-    def _simulate_tourism_investment(self, dates):
+        multiplier = self._specialite_multiplier("portuaire", 2.2, 0.4)
+
+        year_multiplier = self._year_multipliers(years, {(2005, 2010, 2015, 2020): 1.8})
+
+        return self._series(base_investment,
+                            [self._growth(years, 0.030), year_multiplier, multiplier], 0.23)
+
+    def _simulate_tourism_investment(self, years):
         """Simule l'investissement touristique"""
-        base_investment = self.config["budget_base"] * 0.06
-        
+        base_investment = self.params["budget_base"] * 0.06
+
         # Ajustement selon les spécialités
-        multiplier = 1.8 if "tourisme" in self.config["specialites"] else 0.7
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2007, 2013, 2019, 2024]:
-                year_multiplier = 1.7
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.026 * i
-            noise = np.random.normal(1, 0.18)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
-        
-        return investment
-    
-    def _simulate_culture_investment(self, dates):
+        multiplier = self._specialite_multiplier("tourisme", 1.8, 0.7)
+
+        year_multiplier = self._year_multipliers(years, {(2007, 2013, 2019, 2024): 1.7})
+
+        return self._series(base_investment,
+                            [self._growth(years, 0.026), year_multiplier, multiplier], 0.18)
+
+    def _simulate_culture_investment(self, years):
         """Simule l'investissement culturel"""
-        base_investment = self.config["budget_base"] * 0.04
-        
+        base_investment = self.params["budget_base"] * 0.04
+
         # Ajustement selon les spécialités
-        multiplier = 1.7 if "culture" in self.config["specialites"] else 0.7
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2010, 2013, 2016, 2022]:
-                year_multiplier = 2.0  # Effet Capitale de la Culture 2013
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.022 * i
-            noise = np.random.normal(1, 0.16)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
-        
-        return investment
-    
-    def _simulate_education_investment(self, dates):
+        multiplier = self._specialite_multiplier("culture", 1.7, 0.7)
+
+        # Effet Capitale de la Culture 2013
+        year_multiplier = self._year_multipliers(years, {(2010, 2013, 2016, 2022): 2.0})
+
+        return self._series(base_investment,
+                            [self._growth(years, 0.022), year_multiplier, multiplier], 0.16)
+
+    def _simulate_education_investment(self, years):
         """Simule l'investissement éducatif"""
-        base_investment = self.config["budget_base"] * 0.06
-        
+        base_investment = self.params["budget_base"] * 0.06
+
         # Ajustement selon les spécialités
-        multiplier = 1.7 if "universite" in self.config["specialites"] else 0.9
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2008, 2014, 2020]:
-                year_multiplier = 1.6
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.025 * i
-            noise = np.random.normal(1, 0.15)
-            investment.append(base_investment * growth * year_multiplier * multiplier * noise)
-        
-        return investment
-    
+        multiplier = self._specialite_multiplier("universite", 1.7, 0.9)
+
+        year_multiplier = self._year_multipliers(years, {(2008, 2014, 2020): 1.6})
+
+        return self._series(base_investment,
+                            [self._growth(years, 0.025), year_multiplier, multiplier], 0.15)
+
     def _add_marseille_trends(self, df):
-        """Ajoute des tendances réalistes adaptées au marché marseillais"""
-        for i, row in df.iterrows():
-            year = row['Annee']
-            
-            # Capitale Européenne de la Culture 2013
-            if year == 2013:
-                df.loc[i, 'Investissement_Culture'] *= 3.0
-                df.loc[i, 'Investissement_Tourisme'] *= 1.8
-                df.loc[i, 'Prix_m2_Moyen'] *= 1.08
-            
-            # Développement du tramway (phases successives)
-            if year in [2007, 2008]:
-                df.loc[i, 'Investissement_Transport'] *= 2.2  # Lancement tramway
-            if year in [2010, 2011]:
-                df.loc[i, 'Investissement_Transport'] *= 1.8  # Extensions
-            if year in [2019, 2020]:
-                df.loc[i, 'Investissement_Transport'] *= 1.6  # Nouvelles extensions
-            
-            # Euroméditerranée (grand projet d'aménagement)
-            if 2005 <= year <= 2015:
-                df.loc[i, 'Investissement_Immobilier'] *= 1.4
-                df.loc[i, 'Nouveaux_Logements'] *= 1.3
-            
-            # Impact COVID-19 (2020-2021) - marché résilient mais impacté
-            if 2020 <= year <= 2021:
-                if year == 2020:
-                    df.loc[i, 'Transactions_Immobilieres'] *= 0.75
-                    df.loc[i, 'Prix_m2_Moyen'] *= 0.98
-                else:
-                    df.loc[i, 'Prix_m2_Moyen'] *= 1.02  # Reprise modérée
-                    df.loc[i, 'Transactions_Immobilieres'] *= 1.08
-            
-            # Plan de relance marseillais (2022-2025)
-            if year >= 2022:
-                df.loc[i, 'Investissement_Transport'] *= 1.12
-                df.loc[i, 'Investissement_Immobilier'] *= 1.15
-                df.loc[i, 'Nouveaux_Logements'] *= 1.20
+        """Ajoute des tendances réalistes adaptées au marché marseillais (table d'événements self.events)"""
+        columns = [column for column in COLONNES if column in df]
+        factors = self._trend_factors(df['Annee'].to_numpy())
+        df[columns] = df[columns].to_numpy() * factors[:, [COLONNES.index(column) for column in columns]]
     
-    def create_financial_analysis(self, df):
-        """Crée une analyse complète des finances et de l'immobilier"""
-        plt.style.use('seaborn-v0_8')
-        fig = plt.figure(figsize=(20, 28))
-        
-        # 1. Évolution des recettes et dépenses
-        ax1 = plt.subplot(5, 2, 1)
-        self._plot_revenue_expenses(df, ax1)
-        
-        # 2. Structure des recettes
-        ax2 = plt.subplot(5, 2, 2)
-        self._plot_revenue_structure(df, ax2)
-        
-        # 3. Évolution des prix immobiliers
-        ax3 = plt.subplot(5, 2, 3)
-        self._plot_real_estate_prices(df, ax3)
-        
-        # 4. Activité immobilière
-        ax4 = plt.subplot(5, 2, 4)
-        self._plot_real_estate_activity(df, ax4)
-        
-        # 5. Structure des dépenses
-        ax5 = plt.subplot(5, 2, 5)
-        self._plot_expenses_structure(df, ax5)
-        
-        # 6. Investissements communaux
-        ax6 = plt.subplot(5, 2, 6)
-        self._plot_investments(df, ax6)
-        
-        # 7. Dette et endettement
-        ax7 = plt.subplot(5, 2, 7)
-        self._plot_debt(df, ax7)
-        
-        # 8. Indicateurs de performance
-        ax8 = plt.subplot(5, 2, 8)
-        self._plot_performance_indicators(df, ax8)
-        
-        # 9. Démographie
-        ax9 = plt.subplot(5, 2, 9)
-        self._plot_demography(df, ax9)
-        
-        # 10. Investissements sectoriels
-        ax10 = plt.subplot(5, 2, 10)
-        self._plot_sectorial_investments(df, ax10)
+    def create_financial_analysis(self, df, output_dir='.', headless=False, dpi=300, file_format='png',
+                                  figure=None):
+        """Crée une analyse complète des finances et de l'immobilier
+
+        En mode headless, le backend Agg est imposé et plt.show() n'est pas
+        appelé. Une AnalysisFigure passée en argument est réutilisée (axes
+        vidés) au lieu de recréer la figure et ses dix sous-graphiques ; sa
+        mise en page est calculée au premier rendu puis conservée.
+        L'enregistrement se fait toujours sans recadrage bbox_inches='tight'
+        (une seule passe de dessin) : toutes les planches ont les dimensions
+        de la figure, réutilisée ou non. Retourne le chemin du fichier enregistré.
+        """
+        if file_format not in FIGURE_FORMATS:
+            raise ValueError(f"Format de figure inconnu: {file_format} (attendu: {', '.join(FIGURE_FORMATS)})")
+        if headless:
+            import matplotlib
+            matplotlib.use('Agg')
+        reused = figure is not None
+        if reused:
+            figure.reset()
+        else:
+            figure = AnalysisFigure(managed=not headless)
+
+        with _stage('rendu/panneaux'):
+            for ax, (method, _) in zip(figure.axes, PANNEAUX):
+                getattr(self, method)(df, ax)
         
-        plt.suptitle(f'Analyse des Comptes Communaux et Immobiliers du {self.arrondissement}e Arrondissement de Marseille ({self.start_year}-{self.end_year})', 
-                    fontsize=16, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig(f'{self.arrondissement}e_arrondissement_marseille_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        figure.figure.suptitle(f'Analyse des Comptes Communaux et Immobiliers du {self.arrondissement}e Arrondissement de Marseille ({self.start_year}-{self.end_year})', 
+                               fontsize=16, fontweight='bold')
+        if not (reused and figure.laid_out):
+            with _stage('rendu/mise_en_page'):
+                figure.figure.tight_layout()
+            figure.laid_out = True
+        output_file = os.path.join(output_dir, f'{self.arrondissement}e_arrondissement_marseille_analysis.{file_format}')
+        with _stage(f'rendu/savefig_{file_format}'):
+            figure.figure.savefig(output_file, dpi=dpi, format=file_format)
+        _count('figures')
+        if not headless:
+            import matplotlib.pyplot as plt
+            plt.show()
         
         # Générer les insights
         self._generate_financial_insights(df)
+        return output_file
     
+    def render_panels(self, df, output_dir='.', workers=None, dpi=100, file_format='png', composite=True,
+                      executor=None, cache=None):
+        """Rend les dix panneaux en parallèle (une image par panneau) puis compose la planche
+
+        Chaque panneau est dessiné dans son propre processus sur une figure de
+        10 × 5.6 pouces (une case de la grille 5 × 2). En PNG, les tuiles sont
+        assemblées avec le titre en une planche ; sinon elles sont conservées
+        séparément. Un executor existant peut être passé pour réutiliser ses
+        processus d'un arrondissement à l'autre. Avec un cache de résultats,
+        seuls les panneaux dont les données tracées (ou le code) ont changé
+        sont redessinés, les autres tuiles sont reprises du cache. Retourne
+        les chemins produits, les panneaux redessinés et les durées (mur et
+        cumul des panneaux).
+        """
+        if file_format not in FIGURE_FORMATS:
+            raise ValueError(f"Format de figure inconnu: {file_format} (attendu: {', '.join(FIGURE_FORMATS)})")
+        prefix = os.path.join(output_dir, f'{self.arrondissement}e_arrondissement_marseille')
+        tasks = [(self.arrondissement, self.start_year, self.end_year, df, method, dpi,
+                  f'{prefix}_panel_{index:02d}.{file_format}')
+                 for index, (method, _) in enumerate(PANNEAUX, 1)]
+
+        start = time.perf_counter()
+        tiles = [task[-1] for task in tasks]
+        keys = [self.panel_key(df, task[4], dpi, file_format) for task in tasks] if cache else None
+        if cache:
+            tasks = [task for task, key in zip(tasks, keys) if not cache.get_file(key, task[-1])]
+        if not tasks:
+            panel_times = []
+        elif executor is not None:
+            panel_times = list(executor.map(_render_panel, tasks))
+        elif workers == 1 or len(tasks) == 1:
+            panel_times = [_render_panel(task) for task in tasks]
+        else:
+            with calibrated_pool(workers) as pool:
+                panel_times = list(pool.map(_render_panel, tasks))
+        if cache:
+            for task in tasks:
+                cache.put_file(keys[tiles.index(task[-1])], task[-1])
+        _count('panneaux_recalcules', len(tasks))
+
+        result = {'tuiles': tiles, 'panneaux_recalcules': [task[4] for task in tasks],
+                  'duree_panneaux_s': sum(panel_times)}
+        if composite and file_format == 'png':
+            title = (f'Analyse des Comptes Communaux et Immobiliers du {self.arrondissement}e '
+                     f'Arrondissement de Marseille ({self.start_year}-{self.end_year})')
+            result['planche'] = f'{prefix}_analysis.png'
+            composite_key = hashlib.sha256(''.join([title, str(dpi), *keys]).encode()).hexdigest() if cache else None
+            if not (cache and cache.get_file(composite_key, result['planche'])):
+                _composite_tiles(tiles, title, dpi, result['planche'])
+                if cache:
+                    cache.put_file(composite_key, result['planche'])
+        result['duree_mur_s'] = time.perf_counter() - start
+        return result
+
     def _plot_revenue_expenses(self, df, ax):
         """Plot de l'évolution des recettes et dépenses"""
         ax.plot(df['Annee'], df['Recettes_Totales'], label='Recettes Totales', 
@@ -1002,86 +1586,2853 @@ class MarseilleArrondissementImmobilierAnalyzer:
         ax.legend()
         ax.grid(True, alpha=0.3, axis='y')
     
+    def compute_financial_insights(self, df):
+        """Insights de l'arrondissement sous forme de dictionnaire (indicateurs chiffrés et contexte)"""
+        stats = compute_insights(df[list(COLONNES)].to_numpy(), df['Annee'].to_numpy())
+        return {
+            'arrondissement': self.arrondissement,
+            'debut': self.start_year,
+            'fin': self.end_year,
+            **{key: float(value) for key, value in stats.items()},
+            'segment_immobilier': self.config['segment_immobilier'],
+            'type': self.config['type'],
+            'specialites': list(self.config['specialites']),
+            'prix_m2_base': self.config['prix_m2_base'],
+            'evenements': list(EVENEMENTS_MARQUANTS),
+            'recommandations': strategic_recommendations(self.config['specialites']),
+        }
+
     def _generate_financial_insights(self, df):
-        """Génère des insights analytiques adaptés au marché marseillais"""
+        """Génère et affiche des insights analytiques adaptés au marché marseillais ; retourne leur dictionnaire"""
+        with _stage('insights'):
+            insights = self.compute_financial_insights(df)
         print(f"🏛️ INSIGHTS ANALYTIQUES - {self.arrondissement}e Arrondissement de Marseille")
         print("=" * 70)
         
         # 1. Statistiques de base
         print("\n1. 📈 STATISTIQUES GÉNÉRALES:")
-        avg_revenue = df['Recettes_Totales'].mean()
-        avg_expenses = df['Depenses_Totales'].mean()
-        avg_price = df['Prix_m2_Moyen'].mean()
-        avg_transactions = df['Transactions_Immobilieres'].mean()
-        
-        print(f"Recettes moyennes annuelles: {avg_revenue:.2f} M€")
-        print(f"Dépenses moyennes annuelles: {avg_expenses:.2f} M€")
-        print(f"Prix moyen au m²: {avg_price:.0f} €")
-        print(f"Transactions immobilières moyennes: {avg_transactions:.0f}")
+        print(f"Recettes moyennes annuelles: {insights['recettes_moyennes']:.2f} M€")
+        print(f"Dépenses moyennes annuelles: {insights['depenses_moyennes']:.2f} M€")
+        print(f"Prix moyen au m²: {insights['prix_m2_moyen']:.0f} €")
+        print(f"Transactions immobilières moyennes: {insights['transactions_moyennes']:.0f}")
         
         # 2. Croissance immobilière
         print("\n2. 📊 CROISSANCE IMMOBILIÈRE:")
-        price_growth = ((df['Prix_m2_Moyen'].iloc[-1] / 
-                        df['Prix_m2_Moyen'].iloc[0]) - 1) * 100
-        population_growth = ((df['Population'].iloc[-1] / 
-                             df['Population'].iloc[0]) - 1) * 100
-        
-        print(f"Croissance des prix au m² ({self.start_year}-{self.end_year}): {price_growth:.1f}%")
-        print(f"Croissance de la population ({self.start_year}-{self.end_year}): {population_growth:.1f}%")
+        print(f"Croissance des prix au m² ({self.start_year}-{self.end_year}): {insights['croissance_prix_pct']:.1f}%")
+        print(f"Croissance de la population ({self.start_year}-{self.end_year}): {insights['croissance_population_pct']:.1f}%")
         
         # 3. Structure financière
         print("\n3. 📋 STRUCTURE FINANCIÈRE:")
-        tax_share = (df['Impots_Locaux'].mean() / df['Recettes_Totales'].mean()) * 100
-        state_share = (df['Dotations_Etat'].mean() / df['Recettes_Totales'].mean()) * 100
-        property_tax_share = (df['Taxe_Fonciere'].mean() / df['Recettes_Totales'].mean()) * 100
-        
-        print(f"Part des impôts locaux dans les recettes: {tax_share:.1f}%")
-        print(f"Part des dotations de l'État dans les recettes: {state_share:.1f}%")
-        print(f"Part de la taxe foncière dans les recettes: {property_tax_share:.1f}%")
+        print(f"Part des impôts locaux dans les recettes: {insights['part_impots_locaux_pct']:.1f}%")
+        print(f"Part des dotations de l'État dans les recettes: {insights['part_dotations_etat_pct']:.1f}%")
+        print(f"Part de la taxe foncière dans les recettes: {insights['part_taxe_fonciere_pct']:.1f}%")
         
         # 4. Marché immobilier
         print("\n4. 🏠 MARCHÉ IMMOBILIER:")
-        last_price = df['Prix_m2_Moyen'].iloc[-1]
-        price_2020 = df.loc[df['Annee'] == 2020, 'Prix_m2_Moyen'].values[0]
-        covid_impact = ((last_price / price_2020) - 1) * 100
-        
-        print(f"Prix actuel au m²: {last_price:.0f} €")
-        print(f"Impact COVID-19 sur les prix (2020-{self.end_year}): +{covid_impact:.1f}%")
-        print(f"Segment immobilier: {self.config['segment_immobilier']}")
+        print(f"Prix actuel au m²: {insights['prix_m2_actuel']:.0f} €")
+        print(f"Impact COVID-19 sur les prix (2020-{self.end_year}): +{insights['impact_covid_pct']:.1f}%")
+        print(f"Segment immobilier: {insights['segment_immobilier']}")
         
         # 5. Spécificités de l'arrondissement marseillais
         print(f"\n5. 🌟 SPÉCIFICITÉS DU {self.arrondissement}E ARRONDISSEMENT:")
-        print(f"Type d'arrondissement: {self.config['type']}")
-        print(f"Spécialités: {', '.join(self.config['specialites'])}")
-        print(f"Prix de référence au m²: {self.config['prix_m2_base']} €")
+        print(f"Type d'arrondissement: {insights['type']}")
+        print(f"Spécialités: {', '.join(insights['specialites'])}")
+        print(f"Prix de référence au m²: {insights['prix_m2_base']} €")
         
         # 6. Événements marquants du marché marseillais
         print("\n6. 📅 ÉVÉNEMENTS MARQUANTS MARSEILLE:")
-        print("• 2005-2015: Projet Euroméditerranée et transformation urbaine")
-        print("• 2007-2010: Développement du tramway marseillais")
-        print("• 2013: Marseille Capitale Européenne de la Culture")
-        print("• 2014-2019: Poursuite des investissements structurants")
-        print("• 2020-2021: Impact significatif de la crise COVID-19")
-        print("• 2022-2025: Plan de relance et nouvelles extensions métro")
+        for event in insights['evenements']:
+            print(f"• {event}")
         
         # 7. Recommandations stratégiques
         print("\n7. 💡 RECOMMANDATIONS STRATÉGIQUES:")
-        if "portuaire" in self.config["specialites"]:
-            print("• Développer l'économie bleue et les activités portuaires")
-            print("• Valoriser le front de mer et les connexions port-ville")
-        if "tourisme" in self.config["specialites"]:
-            print("• Renforcer l'offre touristique et l'accueil international")
-            print("• Développer le tourisme de croisière et balnéaire")
-        if "culture" in self.config["specialites"]:
-            print("• Capitaliser sur l'héritage Capitale de la Culture")
-            print("• Développer les industries créatives et artistiques")
-        if "universite" in self.config["specialites"]:
-            print("• Renforcer le pôle universitaire et de recherche")
-            print("• Développer l'immobilier étudiant et chercheurs")
-        print("• Poursuivre les investissements en transports en commun")
-        print("• Améliorer la qualité de vie et les espaces publics")
-        print("• Lutter contre la spéculation immobilière")
-        print("• Développer l'offre de logements sociaux et abordables")
+        for recommendation in insights['recommandations']:
+            print(f"• {recommendation}")
+        return insights
+
+def benchmark_generation(arrondissement_name="1er", start_year=2002, end_year=2025, repeats=50):
+    """Mesure le débit du moteur de simulation en séries-années par seconde"""
+    analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement_name)
+    analyzer.start_year = start_year
+    analyzer.end_year = end_year
+    years = analyzer._years()
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        analyzer._reset_streams()
+        analyzer._simulate_indicators(years)
+    elapsed = time.perf_counter() - start
+
+    series_years = repeats * len(INDICATEURS) * len(years)
+    throughput = series_years / elapsed
+    print(f"⚡ Débit du moteur ({start_year}-{end_year}, {repeats} répétitions): "
+          f"{throughput:,.0f} séries-années/s")
+    return throughput
+
+# Formats d'export et extensions associées
+EXPORT_FORMATS = {
+    'csv': 'csv',
+    'parquet': 'parquet',
+    'feather': 'feather',
+}
+_FORMAT_ALIASES = {'arrow': 'feather', 'ipc': 'feather', 'pq': 'parquet'}
+
+def _export_format(path, file_format=None):
+    """Format d'export explicite ou déduit de l'extension du chemin"""
+    file_format = file_format or os.path.splitext(path)[1].lstrip('.').lower()
+    file_format = _FORMAT_ALIASES.get(file_format, file_format)
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu: {file_format} (attendu: {', '.join(EXPORT_FORMATS)})")
+    return file_format
+
+def to_arrow_table(df, float32=False):
+    """Convertit un DataFrame en table Arrow (catégories encodées en dictionnaire, float32 en option)"""
+    import pyarrow as pa
+
+    if float32:
+        df = df.astype({column: np.float32 for column in df.columns if df[column].dtype == np.float64})
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def export_chunks(chunks, path, file_format=None, float32=False):
+    """Écrit un flux de blocs DataFrame en CSV, Parquet ou Feather (Arrow IPC) sans les concaténer en mémoire
+
+    Le format est déduit de l'extension si file_format n'est pas précisé.
+    Retourne le nombre de lignes écrites.
+    """
+    file_format = _export_format(path, file_format)
+
+    rows = 0
+    writer = None
+    with _stage(f'export/{file_format}'):
+        try:
+            for chunk in chunks:
+                if file_format == 'csv':
+                    if float32:
+                        chunk = chunk.astype({column: np.float32 for column in chunk.columns
+                                              if chunk[column].dtype == np.float64})
+                    chunk.to_csv(path, index=False, mode='w' if rows == 0 else 'a', header=rows == 0)
+                else:
+                    table = to_arrow_table(chunk, float32)
+                    if writer is None:
+                        if file_format == 'parquet':
+                            import pyarrow.parquet as pq
+                            writer = pq.ParquetWriter(path, table.schema)
+                        else:
+                            import pyarrow as pa
+                            writer = pa.ipc.new_file(path, table.schema)
+                    writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    _count('lignes_exportees', rows)
+    return rows
+
+def export_data(df, path, file_format=None, float32=False, partitioned=False):
+    """Exporte un DataFrame ; avec partitioned, écrit un jeu de données partitionné par arrondissement
+
+    Le jeu partitionné suit la convention Hive (path/Arrondissement=1er/...) et
+    peut être complété arrondissement par arrondissement, par exemple par les
+    processus du traitement par lots.
+    """
+    file_format = _export_format(path, file_format)
+    if not partitioned:
+        return export_chunks([df], path, file_format, float32)
+
+    if file_format == 'csv':
+        raise ValueError("Le partitionnement par arrondissement requiert le format parquet ou feather")
+    import pyarrow.dataset as ds
+
+    table = to_arrow_table(df, float32)
+    arrondissements = '-'.join(str(value) for value in df['Arrondissement'].unique())
+    ds.write_dataset(table, path, format='parquet' if file_format == 'parquet' else 'ipc',
+                     partitioning=['Arrondissement'], partitioning_flavor='hive',
+                     basename_template=f'{arrondissements}-part-{{i}}.{EXPORT_FORMATS[file_format]}',
+                     existing_data_behavior='overwrite_or_ignore')
+    return len(df)
+
+def load_data(path, columns=None, arrondissements=None, file_format=None):
+    """Relit un export CSV, Parquet ou Feather, éventuellement restreint à quelques colonnes et arrondissements
+
+    Pour Parquet et Feather, seules les colonnes demandées sont lues (sans
+    analyser le reste du fichier) ; les répertoires partitionnés sont acceptés.
+    Les arrondissements s'écrivent comme en ligne de commande (6, "6", "6e").
+    """
+    if arrondissements is not None:
+        numbers = [arrondissement_number(arrondissement) for arrondissement in arrondissements]
+        if not all(numbers):
+            raise ValueError(f"Arrondissements inconnus: {[a for a, n in zip(arrondissements, numbers) if not n]}")
+        arrondissements = [ARRONDISSEMENT_KEYS[number] for number in numbers]
+    if os.path.isdir(path):
+        file_format = file_format or next(
+            _export_format(name) for _, _, names in os.walk(path) for name in names)
+    file_format = _export_format(path, file_format)
+
+    if file_format == 'csv':
+        usecols = None if columns is None else list(dict.fromkeys(
+            list(columns) + (['Arrondissement'] if arrondissements is not None else [])))
+        df = pd.read_csv(path, usecols=usecols)
+        if arrondissements is not None:
+            df = df[df['Arrondissement'].isin(arrondissements)]
+            df = df[list(columns)] if columns is not None else df
+        return df.reset_index(drop=True)
+
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(path, format='parquet' if file_format == 'parquet' else 'ipc',
+                         partitioning=ds.partitioning(flavor='hive', dictionaries='infer')
+                         if os.path.isdir(path) else None)
+    row_filter = None
+    if arrondissements is not None:
+        row_filter = ds.field('Arrondissement').isin(arrondissements)
+    df = dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+    if 'Arrondissement' in df.columns:
+        df['Arrondissement'] = df['Arrondissement'].astype('category')
+    return df
+
+def benchmark_rendering(arrondissements=('1', '6', '13'), dpi=100, file_format='png', output_dir=None):
+    """Compare, à résolution et format égaux, le rendu headless sur une nouvelle figure et sur une figure réutilisée"""
+    import tempfile
+
+    output_dir = output_dir or tempfile.mkdtemp(prefix='marseille_rendu_')
+    timings = {'nouvelle_figure': 0.0, 'figure_reutilisee': 0.0}
+    figure = AnalysisFigure(managed=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for arrondissement in arrondissements:
+            analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=0)
+            df = analyzer.generate_financial_data()
+
+            start = time.perf_counter()
+            analyzer.create_financial_analysis(df, output_dir, headless=True, dpi=dpi, file_format=file_format)
+            timings['nouvelle_figure'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            analyzer.create_financial_analysis(df, output_dir, headless=True, dpi=dpi,
+                                               file_format=file_format, figure=figure)
+            timings['figure_reutilisee'] += time.perf_counter() - start
+
+    gain = timings['nouvelle_figure'] / timings['figure_reutilisee']
+    print(f"🖼️ Rendu de {len(arrondissements)} arrondissements ({file_format}, {dpi} dpi): "
+          f"nouvelle figure {timings['nouvelle_figure']:.2f}s, "
+          f"figure réutilisée {timings['figure_reutilisee']:.2f}s, gain x{gain:.1f}")
+    return {**timings, 'gain': gain}
+
+# Scénarios de démarrage à froid mesurés par benchmark_startup
+STARTUP_SCENARIOS = {
+    'donnees': 'import Marseille',
+    'figures': 'import Marseille, matplotlib.pyplot',
+    # seaborn, importé autrefois au démarrage, ne fait plus partie des dépendances (requirements.txt)
+    'imports_historiques': 'import pandas, numpy, matplotlib.pyplot',
+}
+
+def benchmark_startup(repeats=5):
+    """Mesure le temps d'import à froid (python -X importtime) de chaque scénario, en millisecondes
+
+    Le total est la somme des temps cumulés des imports de premier niveau ;
+    on retient le minimum sur plusieurs processus pour limiter le bruit.
+    """
+    results = {}
+    for name, code in STARTUP_SCENARIOS.items():
+        totals = []
+        for _ in range(repeats):
+            completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       capture_output=True, text=True, check=True)
+            total_us = 0
+            for line in completed.stderr.splitlines():
+                if not line.startswith('import time:') or 'cumulative' in line:
+                    continue
+                _, cumulative, module = line.split('|')
+                if not module[1:].startswith(' '):
+                    total_us += int(cumulative)
+            totals.append(total_us / 1000)
+        results[name] = min(totals)
+
+    print("🚀 Temps d'import à froid (python -X importtime):")
+    for name, duration in results.items():
+        print(f"  {name}: {duration:.0f} ms")
+    return results
+
+# Tailles d'ensemble Monte Carlo mesurées par la suite de benchmarks
+BENCH_ENSEMBLE_SIZES = (1, 10, 100, 1000, 10000)
+BENCH_DIR = 'benchmarks'
+
+def _benchmark_cases(output_dir):
+    """Cas de la suite : nom -> fonction de préparation qui retourne la fonction mesurée"""
+    def analyzer(arrondissement='1'):
+        return MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=0)
+
+    def data(resolution='annuelle'):
+        return analyzer().generate_financial_data(resolution)
+
+    cases = {
+        'generation/annuelle': lambda: analyzer().generate_financial_data,
+        'generation/mensuelle': lambda: functools.partial(analyzer().generate_financial_data, 'mensuelle'),
+        'generation/16_arrondissements': lambda: lambda: [analyzer(str(i)).generate_financial_data()
+                                                          for i in range(1, N_ARRONDISSEMENTS + 1)],
+        'tendances/arrondissement': lambda: (lambda a, df: lambda: a._add_marseille_trends(df.copy()))(
+            analyzer(), data()),
+        'tendances/ville': lambda: simulate_city_trends,
+        'batch/16_arrondissements': lambda: functools.partial(
+            run_batch, seed=0, output_dir=os.path.join(output_dir, 'batch'), data_only=True),
+        'insights/16_arrondissements': lambda: functools.partial(insights_table, n_replicas=100, seed=0),
+    }
+    for size in BENCH_ENSEMBLE_SIZES:
+        cases[f'ensemble/{size}'] = (lambda size: lambda: functools.partial(
+            analyzer().generate_ensemble, size, np.float32))(size)
+    for file_format, extension in EXPORT_FORMATS.items():
+        for resolution in ('annuelle', 'mensuelle'):
+            cases[f'export/{file_format}/{resolution}'] = (lambda file_format, extension, resolution: lambda: functools.partial(
+                export_data, data(resolution), os.path.join(output_dir, f'export_{resolution}.{extension}'),
+                file_format))(file_format, extension, resolution)
+    for figure_format in FIGURE_FORMATS:
+        cases[f'rendu/{figure_format}'] = (lambda figure_format: lambda: functools.partial(
+            analyzer().create_financial_analysis, data(), output_dir, headless=True, dpi=100,
+            file_format=figure_format, figure=_worker_figure()))(figure_format)
+    return cases
+
+def _benchmark_metadata():
+    """Contexte d'une série de mesures : commit, versions, machine"""
+    import platform
+
+    def git(*args):
+        completed = subprocess.run(['git', *args], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   capture_output=True, text=True)
+        return completed.stdout.strip() if completed.returncode == 0 else None
+
+    commit = git('rev-parse', '--short', 'HEAD')
+    dirty = git('status', '--porcelain', '--untracked-files=no', os.path.basename(__file__))
+    return {
+        'commit': f'{commit}-modifie' if commit and dirty else commit,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'code_version': code_version(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def run_benchmarks(only=None, min_time=0.5, max_repeats=50, output=None):
+    """Exécute la suite de benchmarks (hors ligne) et enregistre les résultats en JSON
+
+    Chaque cas est préparé, exécuté une fois à blanc, puis répété au moins
+    trois fois et jusqu'à min_time secondes (max_repeats au plus) ; on garde
+    le minimum, la médiane, la moyenne et l'écart type en secondes. only
+    filtre les cas par expression régulière sur leur nom. Les résultats sont
+    écrits dans output (par défaut benchmarks/<commit>.json), à comparer
+    entre commits avec compare_benchmarks.
+    """
+    import statistics
+    import tempfile
+
+    meta = _benchmark_metadata()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='marseille_bench_') as output_dir, \
+            contextlib.redirect_stdout(io.StringIO()):
+        for name, setup in _benchmark_cases(output_dir).items():
+            if only and not any(re.search(pattern, name) for pattern in only):
+                continue
+            func = setup()
+            func()
+            timings = []
+            while len(timings) < 3 or (sum(timings) < min_time and len(timings) < max_repeats):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            results[name] = {
+                'min_s': min(timings),
+                'mediane_s': statistics.median(timings),
+                'moyenne_s': statistics.fmean(timings),
+                'ecart_type_s': statistics.stdev(timings),
+                'repetitions': len(timings),
+            }
+            print(f"⏱️ {name}: {results[name]['mediane_s'] * 1000:.2f} ms", file=sys.stderr)
+
+    output = output or os.path.join(BENCH_DIR, f"{meta['commit'] or 'resultats'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'resultats': results}, f, indent=2, ensure_ascii=False)
+    print(f"💾 Résultats des benchmarks: {output}", file=sys.stderr)
+    return {'meta': meta, 'resultats': results}
+
+def compare_benchmarks(before, after, threshold=1.10):
+    """Compare deux fichiers de résultats (médianes) ; retourne les ratios et la liste des régressions
+
+    Un cas régresse quand sa médiane dépasse threshold fois celle de référence.
+    """
+    with open(before, encoding='utf-8') as f:
+        reference = json.load(f)
+    with open(after, encoding='utf-8') as f:
+        candidate = json.load(f)
+
+    ratios, regressions = {}, []
+    print(f"📊 {reference['meta']['commit']} -> {candidate['meta']['commit']}")
+    for name, result in candidate['resultats'].items():
+        if name not in reference['resultats']:
+            continue
+        ratio = result['mediane_s'] / reference['resultats'][name]['mediane_s']
+        ratios[name] = ratio
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  ⚠️ régression'
+        print(f"  {name}: {reference['resultats'][name]['mediane_s'] * 1000:.2f} ms -> "
+              f"{result['mediane_s'] * 1000:.2f} ms (x{ratio:.2f}){flag}")
+    return {'ratios': ratios, 'regressions': regressions}
+
+def simulate_city_trends(start_year=2002, end_year=2025):
+    """Tendances des 16 arrondissements en un seul passage vectorisé : (arrondissement × année × indicateur)"""
+    analyzer = MarseilleArrondissementImmobilierAnalyzer.from_params(CONFIG_TABLE[1:, None])
+    analyzer.start_year = start_year
+    analyzer.end_year = end_year
+    return analyzer.simulate_trends()
+
+def insights_table(arrondissements=None, n_replicas=1, seed=None, dtype=np.float32):
+    """Insights de plusieurs arrondissements (tous par défaut), une ligne par réplique Monte Carlo
+
+    Chaque ensemble (réplique × année × indicateur) est réduit en une passe
+    par compute_insights, un arrondissement à la fois ; avec n_replicas=1,
+    la ligne correspond à la série de generate_financial_data().
+    """
+    arrondissements = list(arrondissements or [str(i) for i in range(1, N_ARRONDISSEMENTS + 1)])
+    seed = np.random.SeedSequence(seed).entropy
+    tables = []
+    for arrondissement in arrondissements:
+        analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=seed)
+        stats = compute_insights(analyzer.generate_ensemble(n_replicas, dtype=dtype), analyzer._years())
+        tables.append(analyzer.label_data(pd.DataFrame({'Replique': np.arange(n_replicas), **stats})))
+    return pd.concat(tables, ignore_index=True)
+
+def generate_city_data(arrondissements=None, resolution='annuelle', n_replicas=1, seed=None, start_year=2002,
+                       end_year=2025, compact=True):
+    """Données de plusieurs arrondissements (tous par défaut) en une table : arrondissement × réplique × période
+
+    En mode compact, un seul tampon float32 (ligne × indicateur) est alloué
+    pour toute la ville puis rempli arrondissement par arrondissement, sans
+    table intermédiaire ; Arrondissement et Segment_Immobilier sont
+    catégoriels, Annee en int16, Replique en int16 (int32 au-delà). Sinon,
+    les tables standard (float64, int64) sont concaténées, comme référence du
+    rapport mémoire. Les répliques Monte Carlo (n_replicas > 1) sont annuelles.
+    """
+    if n_replicas > 1 and resolution != 'annuelle':
+        raise ValueError("Les répliques Monte Carlo ne sont disponibles qu'en résolution annuelle")
+    seed = np.random.SeedSequence(seed).entropy
+    analyzers = []
+    for arrondissement in arrondissements or [str(i) for i in range(1, N_ARRONDISSEMENTS + 1)]:
+        analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=seed)
+        analyzer.start_year = start_year
+        analyzer.end_year = end_year
+        analyzers.append(analyzer)
+    years = np.arange(start_year, end_year + 1)
+    replica_dtype = np.int16 if n_replicas <= np.iinfo(np.int16).max else np.int32
+
+    if not compact:
+        tables = []
+        for analyzer in analyzers:
+            with _stage('generation'):
+                if n_replicas > 1:
+                    df = pd.DataFrame(analyzer.generate_ensemble(n_replicas).reshape(-1, len(COLONNES)),
+                                      columns=COLONNES)
+                    df.insert(0, 'Annee', np.tile(years, n_replicas))
+                    df.insert(0, 'Replique', np.repeat(np.arange(n_replicas), len(years)))
+                else:
+                    analyzer._reset_streams()
+                    df = analyzer._simulate_chunk(years, resolution)
+            tables.append(analyzer.label_data(df))
+        return pd.concat(tables, ignore_index=True)
+
+    unit, step = RESOLUTIONS[resolution]
+    periods = len(years) if resolution == 'annuelle' else len(
+        np.arange(np.datetime64(str(start_year), unit), np.datetime64(str(end_year + 1), unit), step))
+    rows_per_arrondissement = n_replicas * periods
+    buffer = np.empty((len(analyzers) * rows_per_arrondissement, len(COLONNES)), dtype=COMPACT_FLOAT)
+    blocks = buffer.reshape(len(analyzers), rows_per_arrondissement, len(COLONNES))
+    frame = None
+    for analyzer, block in zip(analyzers, blocks):
+        with _stage('generation'):
+            if n_replicas > 1:
+                analyzer.generate_ensemble(n_replicas, out=block.reshape(n_replicas, periods, len(COLONNES)))
+            else:
+                analyzer._reset_streams()
+                frame = analyzer._simulate_chunk(years, resolution, compact=True, out=block)
+
+    table = pd.DataFrame(buffer, columns=COLONNES, copy=False)
+    period_years = years.astype(COMPACT_YEAR) if frame is None else frame['Annee'].to_numpy()
+    table.insert(0, 'Annee', np.tile(period_years, len(analyzers) * n_replicas))
+    if frame is not None and 'Date' in frame:
+        table.insert(0, 'Date', np.tile(frame['Date'].to_numpy(), len(analyzers)))
+    if n_replicas > 1:
+        table.insert(0, 'Replique', np.tile(np.repeat(np.arange(n_replicas, dtype=replica_dtype), periods),
+                                            len(analyzers)))
+    numbers = np.array([analyzer.number for analyzer in analyzers])
+    table.insert(0, 'Segment_Immobilier', pd.Categorical.from_codes(
+        np.repeat(CONFIG_TABLE['segment_immobilier'][numbers], rows_per_arrondissement), categories=SEGMENTS))
+    table.insert(0, 'Arrondissement', pd.Categorical.from_codes(
+        np.repeat(numbers, rows_per_arrondissement), categories=ARRONDISSEMENT_KEYS))
+    return table
+
+def memory_report(arrondissements=None, resolution='mensuelle', n_replicas=1, seed=0, start_year=2002,
+                  end_year=2025):
+    """Compare les modes standard et compact de generate_city_data sur la même génération
+
+    Une ligne par mode : lignes, taille de la table (memory_usage profond),
+    dont indicateurs, pic d'allocation pendant la construction (tracemalloc),
+    durée, et rapport de taille au mode standard.
+    """
+    rows = []
+    for compact in (False, True):
+        with instrument(memory=True) as metrics:
+            with _stage('construction'):
+                table = generate_city_data(arrondissements, resolution, n_replicas, seed, start_year, end_year,
+                                           compact)
+        usage = table.memory_usage(deep=True, index=False)
+        rows.append({
+            'Mode': 'compact' if compact else 'standard',
+            'Lignes': len(table),
+            'Octets_Table': int(usage.sum()),
+            'Octets_Indicateurs': int(usage[list(COLONNES)].sum()),
+            'Pic_Construction': metrics.stages['construction']['pic_memoire_octets'],
+            'Duree_s': metrics.stages['construction']['duree_s'],
+        })
+        del table
+    report = pd.DataFrame(rows)
+    report['Ratio_Table'] = report['Octets_Table'] / report['Octets_Table'].iat[0]
+    return report
+
+# Attributs de configuration selon lesquels CityCube regroupe les arrondissements
+CUBE_ATTRIBUTES = ('type', 'segment_immobilier', 'specialites')
+
+class CityCube:
+    """Cube arrondissement × année × indicateur des 16 arrondissements, avec agrégats de la ville
+
+    Les totaux de la ville et les moyennes pondérées par la population de
+    chaque année et indicateur sont calculés à la construction : total(),
+    weighted_mean() et value() sont de simples accès indexés. Les
+    regroupements par attribut de configuration (type, segment, spécialité ;
+    un arrondissement compte dans chacune de ses spécialités) sont un produit
+    matriciel appartenance × cube, calculé une fois par attribut.
+    """
+
+    def __init__(self, values, years, numbers=None):
+        self.values = np.asarray(values)
+        self.years = np.asarray(years)
+        self.numbers = np.arange(1, N_ARRONDISSEMENTS + 1) if numbers is None else np.asarray(numbers)
+        self.labels = [ARRONDISSEMENT_KEYS[number] for number in self.numbers]
+        self._year_index = {int(year): i for i, year in enumerate(self.years)}
+        self._column_index = {column: k for k, column in enumerate(COLONNES)}
+
+        population = self.values[..., self._column_index['Population']].astype(np.float64)
+        self.totals = self.values.sum(axis=0, dtype=np.float64)
+        self.weighted = np.einsum('ay,ayk->yk', population, self.values) / population.sum(axis=0)[:, None]
+        self._groups = {}
+
+    @classmethod
+    def simulate(cls, arrondissements=None, start_year=2002, end_year=2025, seed=None):
+        """Cube des séries simulées (identiques à generate_financial_data() avec la même graine)"""
+        arrondissements = list(arrondissements or [str(i) for i in range(1, N_ARRONDISSEMENTS + 1)])
+        seed = np.random.SeedSequence(seed).entropy
+        values, numbers = [], []
+        for arrondissement in arrondissements:
+            analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=seed)
+            analyzer.start_year = start_year
+            analyzer.end_year = end_year
+            values.append(analyzer.generate_ensemble(1)[0])
+            numbers.append(analyzer.number)
+        return cls(np.stack(values), np.arange(start_year, end_year + 1), numbers)
+
+    @classmethod
+    def from_trends(cls, start_year=2002, end_year=2025):
+        """Cube des tendances déterministes des 16 arrondissements (un seul passage vectorisé)"""
+        return cls(simulate_city_trends(start_year, end_year), np.arange(start_year, end_year + 1))
+
+    def _year(self, year):
+        return self._year_index[int(year)] if year is not None else slice(None)
+
+    def value(self, arrondissement, year, column):
+        """Valeur d'un indicateur pour un arrondissement et une année"""
+        a = list(self.numbers).index(arrondissement_number(arrondissement))
+        return self.values[a, self._year_index[int(year)], self._column_index[column]]
+
+    def total(self, column, year=None):
+        """Total de la ville (somme des arrondissements), pour une année ou toutes"""
+        return self.totals[self._year(year), self._column_index[column]]
+
+    def weighted_mean(self, column, year=None):
+        """Moyenne de la ville pondérée par la population (ex: prix au m² moyen de Marseille)"""
+        return self.weighted[self._year(year), self._column_index[column]]
+
+    def _membership(self, attribute):
+        """Étiquettes des groupes et matrice d'appartenance (groupe × arrondissement)"""
+        params = CONFIG_TABLE[self.numbers]
+        if attribute == 'specialites':
+            labels = SPECIALITES
+            member = (params['specialites'][None, :] & np.array([SPECIALITE_BITS[s] for s in labels],
+                                                                 dtype=np.uint64)[:, None]) != 0
+        elif attribute in ('type', 'segment_immobilier'):
+            labels = TYPES if attribute == 'type' else SEGMENTS
+            member = params[attribute][None, :] == np.arange(len(labels))[:, None]
+        else:
+            raise ValueError(f"Attribut inconnu: {attribute} (attendu: {', '.join(CUBE_ATTRIBUTES)})")
+        present = member.any(axis=1)
+        return [label for label, keep in zip(labels, present) if keep], member[present].astype(np.float64)
+
+    def group(self, attribute):
+        """Sommes, moyennes pondérées et effectifs par groupe : (étiquettes, (G × année × indicateur) × 2, G)"""
+        if attribute not in self._groups:
+            labels, member = self._membership(attribute)
+            population = self.values[..., self._column_index['Population']]
+            sums = np.einsum('ga,ayk->gyk', member, self.values)
+            weighted = (np.einsum('ga,ay,ayk->gyk', member, population, self.values)
+                        / (member @ population)[:, :, None])
+            self._groups[attribute] = (labels, sums, weighted, member.sum(axis=1).astype(int))
+        return self._groups[attribute]
+
+    def group_by(self, attribute, how='sum', columns=None):
+        """Table (groupe, année) des indicateurs agrégés par attribut ; how = 'sum', 'mean' ou 'weighted'"""
+        labels, sums, weighted, counts = self.group(attribute)
+        if how == 'sum':
+            cube = sums
+        elif how == 'mean':
+            cube = sums / counts[:, None, None]
+        elif how == 'weighted':
+            cube = weighted
+        else:
+            raise ValueError(f"Agrégation inconnue: {how} (attendu: sum, mean, weighted)")
+        columns = list(columns or COLONNES)
+        data = {attribute: np.repeat(labels, len(self.years)), 'Annee': np.tile(self.years, len(labels))}
+        for column in columns:
+            data[column] = cube[:, :, self._column_index[column]].ravel()
+        return pd.DataFrame(data)
+
+    def ranking(self, column, year=None, ascending=False):
+        """Classement des arrondissements sur un indicateur (dernière année par défaut)"""
+        year = self.years[-1] if year is None else year
+        values = self.values[:, self._year_index[int(year)], self._column_index[column]]
+        return pd.Series(values, index=pd.Index(self.labels, name='Arrondissement'),
+                         name=column).sort_values(ascending=ascending)
+
+    def city_frame(self):
+        """Totaux et moyennes pondérées de la ville par année"""
+        data = {'Annee': self.years}
+        for column, k in self._column_index.items():
+            data[f'{column}_Total'] = self.totals[:, k]
+            data[f'{column}_Moyenne_Ponderee'] = self.weighted[:, k]
+        return pd.DataFrame(data)
+
+    def to_frame(self):
+        """Cube à plat : une ligne par arrondissement et année"""
+        data = {
+            'Arrondissement': pd.Categorical(np.repeat(self.labels, len(self.years)), categories=ARRONDISSEMENT_KEYS),
+            'Annee': np.tile(self.years, len(self.labels)),
+        }
+        data.update(zip(COLONNES, self.values.reshape(-1, len(COLONNES)).T))
+        return pd.DataFrame(data)
+
+# Leviers des scénarios : description et valeur de référence
+SCENARIO_LEVERS = {
+    'prix_m2_base': ("multiplicateur du prix de référence au m²", 1.0),
+    'budget_base': ("multiplicateur du budget de référence", 1.0),
+    'population_base': ("multiplicateur de la population de référence", 1.0),
+    'ajustement_croissance': ("écart ajouté aux taux de croissance linéaire (0.01 = +1 point)", 0.0),
+    'suppression_taxe_habitation': ("baisse annuelle de la taxe d'habitation à partir de 2018 "
+                                    "(taxe nulle à partir de 0.25)", 0.15),
+    'covid': ("intensité des événements et régimes COVID-19 de 2020-2021 (0 = sans COVID, 1 = référence)", 1.0),
+}
+# Période conjoncturelle COVID-19 de REGIMES_PRIX et REGIMES_TRANSACTIONS, mise à l'échelle par le levier covid
+PERIODE_COVID = PERIODES_CONJONCTURE.index((2020, 2021))
+# Indicateurs dont les modèles lisent ces régimes, seuls recalculés pour chaque intensité COVID
+COLONNES_CONJONCTURE = ('Prix_m2_Moyen', 'Transactions_Immobilieres')
+# Leviers multipliant un paramètre compilé (les autres leviers de paramètres le remplacent)
+_SCALED_LEVERS = ('prix_m2_base', 'budget_base', 'population_base')
+# Indicateurs agrégés à l'échelle de la ville par moyenne pondérée par la population (les autres par somme)
+MOYENNES_PONDEREES = ('Prix_m2_Moyen', 'Taux_Endettement', 'Taux_Fiscalite')
+
+def _scenario_trends(params, start_year, end_year, columns=COLONNES):
+    """Tendances hors événements d'un bloc de paramètres (combinaison × arrondissement) ; exécutable en processus"""
+    analyzer = MarseilleArrondissementImmobilierAnalyzer.from_params(params[..., None])
+    analyzer.start_year = start_year
+    analyzer.end_year = end_year
+    analyzer.events = []
+    return analyzer.simulate_trends(columns=columns)
+
+def _scale_covid_regimes(params, covid):
+    """Multiplie l'écart à 1 du niveau et la pente des régimes COVID-19 (PERIODE_COVID) par covid"""
+    for field in ('regimes_prix', 'regimes_transactions'):
+        regimes = params[field]
+        regimes[..., PERIODE_COVID, 0] = 1 + covid * (regimes[..., PERIODE_COVID, 0] - 1)
+        regimes[..., PERIODE_COVID, 1] *= covid
+
+def _scenario_event_factors(years, events, covid):
+    """Facteurs (année × indicateur) des événements, l'écart à 1 des événements COVID-19 étant multiplié par covid"""
+    analyzer = MarseilleArrondissementImmobilierAnalyzer('1')
+    analyzer.events = [(start, end, column, 1 + covid * (multiplier - 1) if label.startswith('COVID-19')
+                        else multiplier, label)
+                       for start, end, column, multiplier, label in events]
+    return analyzer._trend_factors(years)
+
+def scenario_sweep(grid, arrondissements=None, start_year=2002, end_year=2025, events=EVENEMENTS_MARSEILLE,
+                   workers=None, parallel_cells=5_000_000):
+    """Évalue toutes les combinaisons d'une grille de leviers sur les tendances des arrondissements
+
+    grid associe à chaque levier de SCENARIO_LEVERS ses valeurs, par exemple
+    {'ajustement_croissance': [-0.01, 0, 0.01], 'covid': [0, 1, 1.5]}. Les
+    tendances ne sont calculées qu'une fois par combinaison distincte des
+    leviers de paramètres (hors covid), en un passage vectorisé (combinaison ×
+    arrondissement × année × indicateur). L'intensité COVID met à l'échelle
+    les facteurs d'événements, calculés une fois par intensité, et les
+    régimes COVID des paramètres : seuls les indicateurs de
+    COLONNES_CONJONCTURE sont recalculés par combinaison et intensité.
+    Au-delà de parallel_cells cellules, les combinaisons sont réparties sur
+    un pool de processus. Retourne une table à plat : une ligne par
+    scénario, arrondissement et année.
+    """
+    unknown = set(grid) - set(SCENARIO_LEVERS)
+    if unknown:
+        raise ValueError(f"Leviers inconnus: {sorted(unknown)} (attendu: {', '.join(SCENARIO_LEVERS)})")
+    arrondissements = list(arrondissements or [str(i) for i in range(1, N_ARRONDISSEMENTS + 1)])
+    numbers = [arrondissement_number(arrondissement) for arrondissement in arrondissements]
+    if not all(numbers):
+        raise ValueError(f"Arrondissements inconnus: {[a for a, n in zip(arrondissements, numbers) if not n]}")
+    years = np.arange(start_year, end_year + 1)
+
+    levers = list(grid)
+    grids = np.meshgrid(*[np.asarray(grid[lever], dtype=float) for lever in levers], indexing='ij')
+    combinations = np.stack([values.ravel() for values in grids], axis=-1).reshape(-1, len(levers))
+
+    # Combinaisons distinctes des leviers de paramètres et intensités COVID distinctes
+    param_levers = [lever for lever in levers if lever != 'covid']
+    param_columns = combinations[:, [levers.index(lever) for lever in param_levers]]
+    param_keys, param_index = np.unique(param_columns, axis=0, return_inverse=True)
+    covid = combinations[:, levers.index('covid')] if 'covid' in grid else np.ones(len(combinations))
+    covid_values, covid_index = np.unique(covid, return_inverse=True)
+
+    params = np.repeat(CONFIG_TABLE[numbers][None, :], len(param_keys), axis=0)
+    for j, lever in enumerate(param_levers):
+        if lever in _SCALED_LEVERS:
+            params[lever] *= param_keys[:, j, None]
+        else:
+            params[lever] = param_keys[:, j, None]
+
+    def compute(params, columns=COLONNES):
+        function = functools.partial(_scenario_trends, start_year=start_year, end_year=end_year, columns=columns)
+        cells = params.size * len(years) * len(columns)
+        if workers != 1 and cells > parallel_cells and len(params) > 1:
+            blocks = np.array_split(params, min(len(params), 4 * (workers or os.cpu_count())), axis=0)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return np.concatenate(list(executor.map(function, blocks)))
+        return function(params)
+
+    param_index = param_index.ravel()
+    values = compute(params)[param_index]
+    if not (covid_values == 1).all():
+        # Régimes COVID mis à l'échelle : combinaison × intensité, indicateurs de COLONNES_CONJONCTURE seulement
+        scaled = np.repeat(params[:, None], len(covid_values), axis=1)
+        _scale_covid_regimes(scaled, covid_values[None, :, None])
+        regimes = compute(scaled.reshape(-1, len(numbers)), COLONNES_CONJONCTURE)
+        regimes = regimes.reshape(len(params), len(covid_values), *regimes.shape[1:])
+        values[..., [COLONNES.index(column) for column in COLONNES_CONJONCTURE]] = regimes[param_index, covid_index]
+    factors = np.stack([_scenario_event_factors(years, events, value) for value in covid_values])
+    values *= factors[covid_index][:, None]
+
+    n_scenarios, n_arrondissements, n_years = values.shape[:3]
+    rows_per_scenario = n_arrondissements * n_years
+    data = {'Scenario': np.repeat(np.arange(n_scenarios), rows_per_scenario)}
+    for k, lever in enumerate(levers):
+        data[lever] = np.repeat(combinations[:, k], rows_per_scenario)
+    data['Arrondissement'] = pd.Categorical(
+        np.tile(np.repeat([ARRONDISSEMENT_KEYS[number] for number in numbers], n_years), n_scenarios),
+        categories=ARRONDISSEMENT_KEYS)
+    data['Annee'] = np.tile(years, n_scenarios * n_arrondissements)
+    data.update(zip(COLONNES, values.reshape(-1, len(COLONNES)).T))
+    return pd.DataFrame(data)
+
+def sensitivity_summary(table, columns=('Prix_m2_Moyen', 'Recettes_Totales', 'Taxe_Habitation'), year=None):
+    """Résumé tornade d'un balayage : effet principal de chaque levier sur la ville en fin de période
+
+    Pour chaque indicateur, la valeur de la ville (somme des arrondissements,
+    ou moyenne pondérée par la population pour MOYENNES_PONDEREES) de chaque
+    scénario est moyennée par niveau de levier ; l'amplitude est l'écart entre
+    le niveau le plus bas et le plus haut. Les lignes sont triées par
+    indicateur puis amplitude décroissante. Le levier covid n'agit que sur
+    2020-2021 : son effet n'apparaît qu'avec une année de résumé de cette période.
+    """
+    levers = [column for column in table.columns if column in SCENARIO_LEVERS]
+    year = table['Annee'].max() if year is None else year
+    final = table[table['Annee'] == year]
+    weights = final['Population']
+
+    aggregated = final.groupby('Scenario')[levers].first()
+    for column in columns:
+        if column in MOYENNES_PONDEREES:
+            aggregated[column] = ((final[column] * weights).groupby(final['Scenario']).sum()
+                                  / weights.groupby(final['Scenario']).sum())
+        else:
+            aggregated[column] = final.groupby('Scenario')[column].sum()
+
+    rows = []
+    for column in columns:
+        for lever in levers:
+            effects = aggregated.groupby(lever)[column].mean()
+            if len(effects) < 2:
+                continue
+            low, high = effects.iloc[0], effects.iloc[-1]
+            rows.append({
+                'indicateur': column,
+                'levier': lever,
+                'niveau_bas': effects.index[0],
+                'niveau_haut': effects.index[-1],
+                'valeur_bas': low,
+                'valeur_haut': high,
+                'amplitude': abs(high - low),
+                'amplitude_pct': abs(high - low) / abs(aggregated[column].mean()) * 100,
+            })
+    summary = pd.DataFrame(rows)
+    if summary.empty:
+        return summary
+    return (summary.sort_values(['indicateur', 'amplitude'], ascending=[True, False])
+            .reset_index(drop=True))
+
+def print_tornado(summary, width=40):
+    """Affiche le résumé tornade sous forme de barres"""
+    for column, rows in summary.groupby('indicateur', sort=False):
+        print(f"\n🌪️ {column} :")
+        scale = rows['amplitude_pct'].max() or 1.0
+        for row in rows.itertuples(index=False):
+            bar = '█' * round(width * row.amplitude_pct / scale)
+            print(f"  {row.levier:<28} {bar} {row.amplitude_pct:.1f}% "
+                  f"({row.niveau_bas:g} → {row.valeur_bas:,.1f} ; {row.niveau_haut:g} → {row.valeur_haut:,.1f})")
+
+# Panneaux de l'analyse, dans l'ordre de la grille 5 × 2 (méthode de tracé, titre)
+PANNEAUX = (
+    ('_plot_revenue_expenses', "Évolution des recettes et dépenses"),
+    ('_plot_revenue_structure', "Structure des recettes"),
+    ('_plot_real_estate_prices', "Évolution des prix immobiliers"),
+    ('_plot_real_estate_activity', "Activité immobilière"),
+    ('_plot_expenses_structure', "Structure des dépenses"),
+    ('_plot_investments', "Investissements communaux"),
+    ('_plot_debt', "Dette et endettement"),
+    ('_plot_performance_indicators', "Indicateurs de performance"),
+    ('_plot_demography', "Démographie"),
+    ('_plot_sectorial_investments', "Investissements sectoriels"),
+)
+
+# Formats de figure acceptés par create_financial_analysis
+FIGURE_FORMATS = ('png', 'svg', 'pdf')
+
+class AnalysisFigure:
+    """Figure 20 × 28 pouces et sa grille de 5 × 2 axes, préallouées et réutilisables
+
+    Avec managed=False, la figure est créée hors de pyplot (canevas Agg) :
+    elle n'est jamais affichée et n'a pas besoin d'être fermée.
+    """
+
+    def __init__(self, managed=True):
+        import matplotlib.style
+        matplotlib.style.use('seaborn-v0_8')
+        if managed:
+            import matplotlib.pyplot as plt
+            self.figure = plt.figure(figsize=(20, 28))
+        else:
+            from matplotlib.figure import Figure
+            self.figure = Figure(figsize=(20, 28))
+        self.axes = list(self.figure.subplots(5, 2).flat)
+        self.laid_out = False
+
+    def reset(self):
+        """Vide les axes (et supprime les axes jumeaux) avant un nouveau rendu"""
+        for ax in self.figure.axes[len(self.axes):]:
+            ax.remove()
+        for ax in self.axes:
+            ax.clear()
+
+_CODE_VERSION = None
+
+def code_version():
+    """Empreinte du code source du module, intégrée aux clés de cache"""
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        with open(__file__, 'rb') as source:
+            _CODE_VERSION = hashlib.sha256(source.read()).hexdigest()[:16]
+    return _CODE_VERSION
+
+# Répertoire et taille maximale par défaut du cache de résultats
+CACHE_DIR = os.environ.get('MARSEILLE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'marseille'))
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Fraction de max_bytes visée par une éviction, pour ne pas reparcourir le cache à chaque écriture
+CACHE_EVICT_TARGET = 0.9
+
+# Taille de chaque répertoire de cache connue de ce processus, mesurée à sa première écriture
+_CACHE_SIZES = {}
+
+class ResultCache:
+    """Cache disque adressé par contenu (DataFrames et fichiers rendus), borné en taille avec éviction LRU
+
+    L'ouverture ne parcourt pas le répertoire : sa taille est mesurée à la
+    première écriture du processus, puis suivie à chaque écriture par toutes
+    les instances du processus ; le répertoire n'est reparcouru que lorsqu'elle
+    dépasse max_bytes, et l'éviction libère alors jusqu'à
+    CACHE_EVICT_TARGET × max_bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, refresh=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        os.makedirs(directory, exist_ok=True)
+        self._size_key = os.path.abspath(directory)
+
+    @property
+    def size(self):
+        """Taille totale suivie (octets), ou None avant la première écriture du processus"""
+        return _CACHE_SIZES.get(self._size_key)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, f'{key}{suffix}')
+
+    def _hit(self, path):
+        """Retourne True si l'entrée existe (et la marque comme récemment utilisée)"""
+        if self.refresh or not os.path.exists(path):
+            _count('cache_miss')
+            return False
+        os.utime(path)
+        _count('cache_hit')
+        return True
+
+    def get_data(self, key):
+        """DataFrame en cache pour cette clé, ou None"""
+        path = self._path(key, '.pkl')
+        return pd.read_pickle(path) if self._hit(path) else None
+
+    def put_data(self, key, df):
+        """Met un DataFrame en cache"""
+        self._store(self._path(key, '.pkl'), lambda tmp: df.to_pickle(tmp))
+
+    def get_array(self, key):
+        """Tableau NumPy en cache pour cette clé, ou None"""
+        path = self._path(key, '.npy')
+        return np.load(path) if self._hit(path) else None
+
+    def put_array(self, key, array):
+        """Met un tableau NumPy en cache"""
+        def write(tmp):
+            with open(tmp, 'wb') as f:
+                np.save(f, array)
+        self._store(self._path(key, '.npy'), write)
+
+    def get_path(self, key, suffix):
+        """Chemin de l'entrée en cache, lue sur place sans copie (copies colonne volumineuses), ou None"""
+        path = self._path(key, suffix)
+        return path if self._hit(path) else None
+
+    def put_path(self, key, suffix, write):
+        """Met en cache le fichier écrit par write(chemin temporaire) ; retourne son chemin"""
+        path = self._path(key, suffix)
+        self._store(path, write)
+        return path
+
+    def get_file(self, key, destination):
+        """Copie le fichier en cache vers destination ; retourne True en cas de succès"""
+        path = self._path(key, os.path.splitext(destination)[1])
+        if not self._hit(path):
+            return False
+        shutil.copyfile(path, destination)
+        return True
+
+    def put_file(self, key, source):
+        """Met en cache un fichier rendu (figure, export)"""
+        self._store(self._path(key, os.path.splitext(source)[1]), lambda tmp: shutil.copyfile(source, tmp))
+
+    def _store(self, path, write):
+        """Écrit atomiquement une entrée (sûr entre processus), puis évince si la taille dépasse max_bytes"""
+        if self.size is None:
+            self.evict()
+        tmp = f'{path}.{os.getpid()}.tmp'
+        try:
+            write(tmp)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            _CACHE_SIZES[self._size_key] += os.path.getsize(tmp) - replaced
+            os.replace(tmp, path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+        if self.size > self.max_bytes:
+            self.evict(CACHE_EVICT_TARGET * self.max_bytes)
+
+    def evict(self, target=None):
+        """Supprime les entrées les moins récemment utilisées au-delà de target (max_bytes par défaut)"""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes if target is None else target
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+        _CACHE_SIZES[self._size_key] = total
+
+# Ingestion des données ouvertes réelles (comptes communaux, DVF) au schéma de generate_financial_data
+INGEST_CHUNKSIZE = 100_000
+INGEST_FORMATS = ('csv', 'txt', 'xlsx', 'xls')
+# Unités des montants des comptes communaux -> facteur vers les M€ de MONETAIRES (comptes publiés en euros)
+COMPTES_UNITES = {'euros': 1e-6, 'milliers': 1e-3, 'millions': 1.0}
+
+# En-têtes usuels des extraits de comptes (normalisés : minuscules, sans accents, séparateurs "_") ;
+# un en-tête égal au nom normalisé d'une colonne du schéma lui est aussi rattaché
+COMPTES_ALIAS = {
+    'annee': 'Annee', 'exercice': 'Annee', 'exer': 'Annee',
+    'arrondissement': 'Arrondissement', 'code_insee': 'Arrondissement', 'insee': 'Arrondissement',
+    'code_commune': 'Arrondissement', 'com_code': 'Arrondissement', 'code_postal': 'Arrondissement',
+    'population_totale': 'Population', 'pop_totale': 'Population', 'ptot': 'Population',
+    'nombre_de_menages': 'Menages',
+    'total_des_recettes': 'Recettes_Totales', 'produits_de_fonctionnement': 'Recettes_Totales',
+    'total_des_produits_de_fonctionnement': 'Recettes_Totales',
+    'impots_et_taxes': 'Impots_Locaux',
+    'dotation_globale_de_fonctionnement': 'Dotations_Etat', 'dgf': 'Dotations_Etat',
+    'total_des_depenses': 'Depenses_Totales', 'charges_de_fonctionnement': 'Fonctionnement',
+    'total_des_charges_de_fonctionnement': 'Fonctionnement',
+    'depenses_d_investissement': 'Investissement', 'depenses_d_equipement': 'Investissement',
+    'charges_financieres': 'Charge_Dette', 'interets_de_la_dette': 'Charge_Dette',
+    'charges_de_personnel': 'Personnel', 'frais_de_personnel': 'Personnel',
+    'caf_brute': 'Epargne_Brute',
+    'encours_de_la_dette': 'Dette_Totale', 'encours_de_dette': 'Dette_Totale',
+    'encours_total_de_la_dette': 'Dette_Totale',
+    'taxe_fonciere_sur_les_proprietes_baties': 'Taxe_Fonciere', 'tfpb': 'Taxe_Fonciere',
+    'taxe_d_habitation': 'Taxe_Habitation', 'th': 'Taxe_Habitation',
+}
+
+# Champs DVF retenus : nom normalisé -> en-têtes des fichiers publiés (format géolocalisé
+# "geo-dvf" et fichier brut valeursfoncieres-AAAA.txt) ou de fichiers simples à une vente par ligne
+DVF_CHAMPS = {
+    'Mutation': ('id_mutation',),
+    'Date': ('date_mutation', 'date_vente', 'date'),
+    'Disposition': ('numero_disposition', 'no_disposition'),
+    'Nature': ('nature_mutation',),
+    'Valeur': ('valeur_fonciere', 'prix_vente', 'prix', 'price'),
+    'Code_Postal': ('code_postal', 'cp', 'postcode'),
+    'Departement': ('code_departement',),
+    'Commune': ('code_commune',),
+    'Type_Local': ('type_local',),
+    'Surface': ('surface_reelle_bati', 'surface_habitable', 'surface'),
+}
+DVF_OBLIGATOIRES = ('Date', 'Valeur', 'Surface')
+DVF_VENTES = ('Vente', "Vente en l'état futur d'achèvement", 'Adjudication')
+DVF_VEFA = "Vente en l'état futur d'achèvement"
+# "Logement" : ventes des fichiers simples, sans nature de mutation ni type de local
+DVF_LOCAUX_HABITATION = ('Appartement', 'Maison', 'Logement')
+
+def _normalize_header(name):
+    """En-tête normalisé : minuscules, sans accents, séparateurs remplacés par _"""
+    import unicodedata
+
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+def _arrondissement_code(value):
+    """Numéro d'arrondissement d'un libellé, d'un code postal (13001-13016) ou INSEE (13201-13216) ; 0 sinon"""
+    match = re.fullmatch(r'\s*(\d{5})(?:\.0*)?\s*', str(value))
+    if match:
+        code = int(match.group(1))
+        for first in (13001, 13201):
+            if first <= code < first + N_ARRONDISSEMENTS:
+                return code - first + 1
+        return 0
+    return arrondissement_number(value)
+
+def arrondissement_codes(values):
+    """Numéros d'arrondissement (0 hors Marseille) d'une série de libellés ou de codes, évalués une fois par valeur"""
+    values = pd.Series(values).astype(str)
+    codes = {value: _arrondissement_code(value) for value in values.unique()}
+    return values.map(codes).to_numpy(np.int8)
+
+def _source_format(path):
+    file_format = os.path.splitext(path)[1].lstrip('.').lower()
+    if file_format not in INGEST_FORMATS:
+        raise ValueError(f"Format de données ouvertes inconnu: {file_format} (attendu: {', '.join(INGEST_FORMATS)})")
+    return file_format
+
+def _sniff_separator(path, encoding):
+    """Séparateur CSV le plus fréquent de la ligne d'en-tête (; | , ou tabulation)"""
+    with open(path, encoding=encoding, errors='replace') as source:
+        header = source.readline()
+    return max(';|,\t', key=header.count)
+
+def source_headers(path, sep=None, encoding='utf-8'):
+    """En-têtes d'un fichier CSV ou d'un classeur (première feuille)"""
+    file_format = _source_format(path)
+    if file_format == 'xlsx':
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        try:
+            return [str(name) for name in next(workbook.active.iter_rows(max_row=1, values_only=True))]
+        finally:
+            workbook.close()
+    if file_format == 'xls':
+        return [str(name) for name in pd.read_excel(path, engine='xlrd', nrows=0).columns]
+    return list(pd.read_csv(path, sep=sep or _sniff_separator(path, encoding), encoding=encoding, nrows=0).columns)
+
+def iter_source_chunks(path, dtypes, chunksize=INGEST_CHUNKSIZE, sep=None, decimal=None, encoding='utf-8'):
+    """Lit un CSV ou un classeur XLSX/XLS par blocs de chunksize lignes, limité aux en-têtes de dtypes et typé
+
+    Les CSV sont lus par pandas avec les types fixés d'avance (pas
+    d'inférence) ; les classeurs XLSX sont parcourus ligne à ligne par
+    openpyxl en lecture seule. Le séparateur est déduit de l'en-tête et la
+    virgule décimale est supposée avec les séparateurs ; et |.
+    """
+    file_format = _source_format(path)
+    if file_format in ('csv', 'txt'):
+        sep = sep or _sniff_separator(path, encoding)
+        yield from pd.read_csv(path, sep=sep, decimal=decimal or (',' if sep in ';|' else '.'), encoding=encoding,
+                               usecols=list(dtypes), dtype=dtypes, chunksize=chunksize)
+        return
+
+    def typed(rows, names, first):
+        # Index continu d'un bloc à l'autre, comme les blocs de read_csv
+        chunk = pd.DataFrame(rows, columns=names, index=pd.RangeIndex(first, first + len(rows)))
+        for name, dtype in dtypes.items():
+            chunk[name] = (pd.to_numeric(chunk[name], errors='coerce') if dtype == 'float64'
+                           else chunk[name].astype(str).where(chunk[name].notna()))
+        return chunk
+
+    if file_format == 'xls':
+        frame = pd.read_excel(path, engine='xlrd', usecols=list(dtypes))
+        for first in range(0, len(frame), chunksize):
+            yield typed(frame.iloc[first:first + chunksize].to_numpy(), list(frame.columns), first)
+        return
+
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(name) for name in next(rows)]
+        positions = [header.index(name) for name in dtypes]
+        chunk, first = [], 0
+        for row in rows:
+            chunk.append([row[position] for position in positions])
+            if len(chunk) == chunksize:
+                yield typed(chunk, list(dtypes), first)
+                chunk, first = [], first + chunksize
+        if chunk:
+            yield typed(chunk, list(dtypes), first)
+    finally:
+        workbook.close()
+
+def _resolve_fields(headers, aliases, mapping=None):
+    """Correspondance en-tête du fichier -> champ normalisé (le premier en-tête reconnu l'emporte)"""
+    mapping = dict(mapping or {})
+    fields = {}
+    for header in headers:
+        field = mapping.get(header) or aliases.get(_normalize_header(header))
+        if field and field not in fields.values():
+            fields[header] = field
+    return fields
+
+def _normalize_comptes(chunk, fields):
+    """Bloc de comptes communaux renommé et typé ; les lignes hors Marseille ou sans année sont écartées"""
+    chunk = chunk.rename(columns=fields)
+    years = pd.to_numeric(chunk['Annee'].str.extract(r'(\d{4})', expand=False), errors='coerce')
+    codes = arrondissement_codes(chunk['Arrondissement'])
+    keep = (codes > 0) & years.notna().to_numpy()
+    data = {'Arrondissement': codes[keep], 'Annee': years[keep].to_numpy(np.int16)}
+    data.update((column, chunk[column].to_numpy(np.float64)[keep]) for column in COLONNES if column in chunk)
+    return pd.DataFrame(data)
+
+def _normalize_dvf(chunk, fields):
+    """Bloc DVF renommé et typé : une ligne par local ou parcelle, mutations de Marseille seulement"""
+    chunk = chunk.rename(columns=fields)
+    codes = np.zeros(len(chunk), dtype=np.int8)
+    if 'Code_Postal' in chunk:
+        codes = arrondissement_codes(chunk['Code_Postal'])
+    if 'Commune' in chunk:
+        commune = chunk['Commune'].fillna('')
+        if 'Departement' in chunk:
+            # Fichier brut : code commune sur trois chiffres, département à part
+            commune = chunk['Departement'].fillna('').str.zfill(2) + commune.str.zfill(3)
+        codes = np.where(codes > 0, codes, arrondissement_codes(commune)).astype(np.int8)
+    years = pd.to_numeric(chunk['Date'].str.extract(r'(\d{4})', expand=False), errors='coerce')
+    keep = (codes > 0) & years.notna().to_numpy()
+
+    if 'Mutation' in chunk:
+        mutation = chunk['Mutation']
+    elif 'Disposition' in chunk:
+        # Fichier brut sans identifiant : une mutation est repérée par sa date, sa disposition, sa valeur et sa commune
+        mutation = chunk['Date'].str.cat([chunk['Disposition'].fillna(''), chunk['Valeur'].astype(str),
+                                          pd.Series(codes, index=chunk.index).astype(str)], sep='|')
+    else:
+        # Fichier simple : une vente par ligne, repérée par son rang dans le fichier
+        mutation = pd.Series(chunk.index.astype(str), index=chunk.index)
+    return pd.DataFrame({
+        'Mutation': mutation[keep].to_numpy(),
+        'Annee': years[keep].to_numpy(np.int16),
+        'Arrondissement': codes[keep],
+        'Nature': chunk['Nature'][keep].to_numpy() if 'Nature' in chunk else 'Vente',
+        'Type_Local': chunk['Type_Local'][keep].to_numpy() if 'Type_Local' in chunk else 'Logement',
+        'Valeur': chunk['Valeur'][keep].to_numpy(np.float64),
+        'Surface': chunk['Surface'][keep].to_numpy(np.float64),
+    })
+
+def _columnar_source(path, kind, cache, chunksize=INGEST_CHUNKSIZE, mapping=None, sep=None, decimal=None,
+                     encoding='utf-8'):
+    """Chemin de la copie Parquet normalisée d'un fichier source, convertie par blocs au premier chargement
+
+    La copie est conservée dans le cache de résultats sous une clé dérivée
+    du fichier (chemin, taille, date de modification), des options de
+    lecture et du code de normalisation : les chargements suivants relisent
+    directement le Parquet, colonne par colonne.
+    """
+    import inspect
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    normalize = {'comptes': _normalize_comptes, 'dvf': _normalize_dvf}[kind]
+    headers = source_headers(path, sep, encoding)
+    if kind == 'comptes':
+        aliases = dict(COMPTES_ALIAS, **{_normalize_header(column): column for column in COLONNES})
+        required = ('Annee', 'Arrondissement')
+    else:
+        aliases = {alias: field for field, names in DVF_CHAMPS.items() for alias in names}
+        required = DVF_OBLIGATOIRES
+    fields = _resolve_fields(headers, aliases, mapping)
+    missing = [field for field in required if field not in fields.values()]
+    if kind == 'dvf' and not {'Code_Postal', 'Commune'} & set(fields.values()):
+        missing.append('Code_Postal ou Commune')
+    if missing:
+        raise ValueError(f"{path}: champs introuvables {missing} (en-têtes: {headers}) ; préciser --map EN_TETE=CHAMP")
+
+    stat = os.stat(path)
+    key = hashlib.sha256(json.dumps([
+        kind, os.path.abspath(path), stat.st_size, stat.st_mtime_ns, fields, sep, decimal, encoding,
+        inspect.getsource(normalize), inspect.getsource(_arrondissement_code),
+    ]).encode()).hexdigest()
+    cached = cache.get_path(key, '.parquet')
+    if cached:
+        return cached
+
+    numeric = {'Valeur', 'Surface', *COLONNES}
+    dtypes = {header: 'float64' if field in numeric else str for header, field in fields.items()}
+
+    def convert(tmp):
+        writer = None
+        try:
+            for chunk in iter_source_chunks(path, dtypes, chunksize, sep, decimal, encoding):
+                table = pa.Table.from_pandas(normalize(chunk, fields), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp, table.schema)
+                writer.write_table(table.cast(writer.schema))
+                _count('lignes_ingerees', len(chunk))
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            raise ValueError(f"{path}: aucune ligne")
+
+    print(f"📥 Conversion de {path} au format colonne...", file=sys.stderr)
+    with _stage(f'ingestion/{kind}'):
+        return cache.put_path(key, '.parquet', convert)
+
+# Esquisse des prix au m² : histogramme à classes logarithmiques (quantiles à erreur relative bornée,
+# à la manière de DDSketch) ; deux esquisses se fusionnent en additionnant leurs comptes
+SKETCH_ALPHA = 0.005
+SKETCH_BORNES = (10.0, 1e6)
+VENTES_TOTAUX = ('Transactions', 'Ventes_Prix', 'Somme_Prix_m2', 'Nouveaux')
+
+class SalesAggregate:
+    """Agrégats fusionnables des ventes par arrondissement et année : comptes, moyenne et quantiles du prix au m²
+
+    totals[a, y] cumule les transactions, les ventes dont le prix au m² est
+    connu, la somme de ces prix et les logements neufs ; counts[a, y, b]
+    compte les prix au m² par classe logarithmique de raison
+    gamma = (1 + alpha) / (1 - alpha), d'où des quantiles exacts à alpha près
+    en relatif. Deux agrégats (blocs, fichiers, processus) se fusionnent
+    exactement par merge, dans n'importe quel ordre.
+    """
+
+    def __init__(self, alpha=SKETCH_ALPHA, bounds=SKETCH_BORNES):
+        self.alpha = alpha
+        self.bounds = bounds
+        self.log_gamma = np.log((1 + alpha) / (1 - alpha))
+        self.offset = int(np.ceil(np.log(bounds[0]) / self.log_gamma))
+        self.n_bins = int(np.ceil(np.log(bounds[1]) / self.log_gamma)) - self.offset + 1
+        self.first_year = 0
+        self.counts = np.zeros((N_ARRONDISSEMENTS + 1, 0, self.n_bins), dtype=np.int64)
+        self.totals = np.zeros((N_ARRONDISSEMENTS + 1, 0, len(VENTES_TOTAUX)))
+
+    @property
+    def years(self):
+        return np.arange(self.first_year, self.first_year + self.counts.shape[1])
+
+    def _cover(self, first, last):
+        """Étend l'axe des années pour couvrir [first, last]"""
+        if self.counts.shape[1]:
+            first, last = min(first, self.first_year), max(last, self.years[-1])
+            before = self.first_year - first
+        else:
+            before = 0
+        pad = ((0, 0), (before, last - first + 1 - before - self.counts.shape[1]), (0, 0))
+        self.counts = np.pad(self.counts, pad)
+        self.totals = np.pad(self.totals, pad)
+        self.first_year = first
+
+    def add(self, arrondissements, years, prices, new_housing):
+        """Ajoute des ventes : arrondissement (1 à 16), année, prix au m² (NaN si inconnu), logements neufs"""
+        years = np.asarray(years, dtype=np.int64)
+        if not len(years):
+            return self
+        self._cover(int(years.min()), int(years.max()))
+        cells = np.ravel_multi_index((np.asarray(arrondissements, dtype=np.int64), years - self.first_year),
+                                     self.counts.shape[:2])
+        n_cells = self.counts.shape[0] * self.counts.shape[1]
+        prices = np.asarray(prices, dtype=np.float64)
+        priced = prices > 0
+        self.totals += np.stack([
+            np.bincount(cells, minlength=n_cells),
+            np.bincount(cells[priced], minlength=n_cells),
+            np.bincount(cells[priced], weights=prices[priced], minlength=n_cells),
+            np.bincount(cells, weights=np.asarray(new_housing, dtype=np.float64), minlength=n_cells),
+        ], axis=-1).reshape(self.totals.shape)
+        bins = np.clip(np.ceil(np.log(prices[priced]) / self.log_gamma).astype(np.int64) - self.offset,
+                       0, self.n_bins - 1)
+        self.counts += np.bincount(cells[priced] * self.n_bins + bins,
+                                   minlength=self.counts.size).reshape(self.counts.shape)
+        return self
+
+    def merge(self, other):
+        """Ajoute les ventes d'un autre agrégat (même précision et mêmes bornes)"""
+        if (other.alpha, other.bounds) != (self.alpha, self.bounds):
+            raise ValueError("Agrégats de précisions différentes")
+        if other.counts.shape[1]:
+            self._cover(other.first_year, int(other.years[-1]))
+            start = other.first_year - self.first_year
+            window = slice(start, start + other.counts.shape[1])
+            self.counts[:, window] += other.counts
+            self.totals[:, window] += other.totals
+        return self
+
+    def quantile(self, q):
+        """Quantile q du prix au m² par arrondissement et année (NaN sans vente)
+
+        Valeur de rang floor(q * (n - 1)) parmi les n ventes, à alpha près en relatif.
+        """
+        cumulative = self.counts.cumsum(axis=-1)
+        n = cumulative[..., -1]
+        index = (cumulative <= (q * (n - 1))[..., None]).sum(axis=-1)
+        gamma = np.exp(self.log_gamma)
+        return np.where(n > 0, 2 * gamma ** (index + self.offset) / (gamma + 1), np.nan)
+
+    def to_frame(self):
+        """Une ligne par arrondissement et année ayant des ventes, colonnes au schéma des données générées"""
+        transactions, priced, price_sum, new_housing = np.moveaxis(self.totals, -1, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = price_sum / priced
+        median = self.quantile(0.5)
+        codes, offsets = np.nonzero(transactions)
+        return pd.DataFrame({
+            'Arrondissement': pd.Categorical(np.array(ARRONDISSEMENT_KEYS)[codes], categories=ARRONDISSEMENT_KEYS),
+            'Annee': offsets + self.first_year,
+            'Prix_m2_Moyen': mean[codes, offsets],
+            'Prix_m2_Median': median[codes, offsets],
+            'Transactions_Immobilieres': transactions[codes, offsets],
+            'Nouveaux_Logements': new_housing[codes, offsets],
+        })
+
+def _dvf_sales(rows):
+    """Ventes de logements d'un bloc de mutations complètes : arrondissement, année, prix au m², logements neufs
+
+    Dans DVF, la valeur foncière d'une mutation est répétée sur chacune de
+    ses lignes : elle est comptée une fois, rapportée à la surface bâtie
+    cumulée de ses appartements et maisons.
+    """
+    habitation = rows['Type_Local'].isin(DVF_LOCAUX_HABITATION).to_numpy()
+    rows = rows.assign(Surface=rows['Surface'].where(habitation, 0.0).fillna(0.0), Logements=habitation)
+    mutations = rows.groupby('Mutation', sort=False, observed=True).agg(
+        Arrondissement=('Arrondissement', 'first'), Annee=('Annee', 'first'), Nature=('Nature', 'first'),
+        Valeur=('Valeur', 'first'), Surface=('Surface', 'sum'), Logements=('Logements', 'sum'))
+    mutations = mutations[mutations['Nature'].isin(DVF_VENTES).to_numpy() & (mutations['Logements'] > 0).to_numpy()]
+    priced = (mutations['Valeur'] > 0) & (mutations['Surface'] > 0)
+    return mutations.assign(Prix_m2=(mutations['Valeur'] / mutations['Surface']).where(priced),
+                            Nouveaux=mutations['Logements'].where(mutations['Nature'] == DVF_VEFA, 0))
+
+def _add_sales(aggregate, rows):
+    sales = _dvf_sales(rows)
+    aggregate.add(sales['Arrondissement'], sales['Annee'], sales['Prix_m2'], sales['Nouveaux'])
+
+def aggregate_dvf(path, batch_size=INGEST_CHUNKSIZE):
+    """Agrège une copie Parquet DVF normalisée en SalesAggregate, lot par lot à mémoire bornée
+
+    Les lignes d'une mutation étant contiguës dans les fichiers publiés, la
+    dernière mutation d'un lot est reportée au lot suivant.
+    """
+    import pyarrow.parquet as pq
+
+    aggregate, carry = SalesAggregate(), None
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        rows = batch.to_pandas()
+        if carry is not None:
+            rows = pd.concat([carry, rows], ignore_index=True)
+        last = rows['Mutation'].to_numpy() == rows['Mutation'].iat[-1]
+        carry = rows[last]
+        if not last.all():
+            _add_sales(aggregate, rows[~last])
+    if carry is not None:
+        _add_sales(aggregate, carry)
+    return aggregate
+
+def _aggregate_sales_file(path, cache_dir, refresh=False, **options):
+    """Conversion (si besoin) et agrégation d'un fichier de ventes, dans un processus du pool"""
+    cache = ResultCache(cache_dir, refresh=refresh)
+    return aggregate_dvf(_columnar_source(path, 'dvf', cache, **options), options.get('chunksize', INGEST_CHUNKSIZE))
+
+def _as_list(paths):
+    return [] if paths is None else [paths] if isinstance(paths, (str, os.PathLike)) else list(paths)
+
+def aggregate_sales(paths, workers=None, mapping=None, chunksize=INGEST_CHUNKSIZE, cache_dir=CACHE_DIR,
+                    refresh=False, sep=None, decimal=None, encoding='utf-8'):
+    """Agrège des fichiers de ventes (DVF ou une vente par ligne : prix, surface, date, code postal)
+
+    Chaque fichier est converti et parcouru par blocs dans son propre
+    processus ; les agrégats des fichiers sont ensuite fusionnés. Retourne un
+    SalesAggregate (to_frame pour la table par arrondissement et année).
+    """
+    import tempfile
+
+    paths = _as_list(paths)
+    with contextlib.ExitStack() as stack:
+        if cache_dir is None:
+            cache_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='marseille-ingestion-'))
+        aggregate = functools.partial(_aggregate_sales_file, cache_dir=cache_dir, refresh=refresh, mapping=mapping,
+                                      chunksize=chunksize, sep=sep, decimal=decimal, encoding=encoding)
+        if workers == 1 or len(paths) <= 1:
+            partials = [aggregate(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count(), len(paths))) as executor:
+                partials = list(executor.map(aggregate, paths))
+    total = SalesAggregate()
+    for partial in partials:
+        total.merge(partial)
+    return total
+
+def ingest_open_data(comptes=None, dvf=None, mapping=None, chunksize=INGEST_CHUNKSIZE, cache_dir=CACHE_DIR,
+                     refresh=False, sep=None, decimal=None, encoding='utf-8', workers=None, unit='euros'):
+    """Données réelles (comptes communaux et/ou DVF) au schéma de generate_financial_data
+
+    comptes et dvf sont un chemin ou une liste de chemins CSV, TXT, XLSX ou
+    XLS ; mapping complète la reconnaissance des en-têtes (en-tête -> colonne).
+    Les montants des comptes (MONETAIRES), exprimés dans l'unité unit de
+    COMPTES_UNITES (euros par défaut, comme les comptes publiés), sont
+    convertis en M€. Chaque fichier est converti une fois en Parquet dans le cache, puis
+    agrégé par arrondissement et année sans être chargé en entier (les
+    fichiers DVF en parallèle, voir aggregate_sales). Les prix moyens,
+    transactions et logements neufs issus de DVF remplacent ceux des comptes.
+    Retourne une ligne par arrondissement et année : Arrondissement, Annee et
+    les colonnes de COLONNES (NaN pour les indicateurs absents des sources).
+    """
+    import tempfile
+
+    import pyarrow.parquet as pq
+
+    if unit not in COMPTES_UNITES:
+        raise ValueError(f"Unité inconnue: {unit} (attendu: {', '.join(COMPTES_UNITES)})")
+    options = dict(mapping=mapping, chunksize=chunksize, sep=sep, decimal=decimal, encoding=encoding)
+    frames = []
+    with contextlib.ExitStack() as stack:
+        if cache_dir is None:
+            cache_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='marseille-ingestion-'))
+        cache = ResultCache(cache_dir, refresh=refresh)
+
+        for path in _as_list(comptes):
+            table = pq.read_table(_columnar_source(path, 'comptes', cache, **options)).to_pandas()
+            indicators = [column for column in COLONNES if column in table]
+            for column in MONETAIRES:
+                if column in table:
+                    table[column] *= COMPTES_UNITES[unit]
+            groups = table.groupby(['Arrondissement', 'Annee'])
+            # Plusieurs lignes par arrondissement et année : les flux s'additionnent, les niveaux gardent la dernière
+            flux = [column for column in indicators if column in FLUX]
+            frames.append(pd.concat([groups[flux].sum(min_count=1),
+                                     groups[[column for column in indicators if column not in FLUX]].last()],
+                                    axis=1))
+
+        if dvf:
+            sales = aggregate_sales(dvf, workers, cache_dir=cache_dir, refresh=refresh, **options).to_frame()
+            sales.index = pd.MultiIndex.from_arrays([sales['Arrondissement'].cat.codes, sales['Annee']],
+                                                    names=['Arrondissement', 'Annee'])
+            frames.insert(0, sales[['Prix_m2_Moyen', 'Transactions_Immobilieres', 'Nouveaux_Logements']])
+
+    if not frames:
+        raise ValueError("Aucune source : préciser des fichiers de comptes et/ou DVF")
+    combined = frames[0]
+    for frame in frames[1:]:
+        combined = combined.combine_first(frame)
+    combined = combined.sort_index().reindex(columns=COLONNES)
+    codes = combined.index.get_level_values('Arrondissement').to_numpy(np.int64)
+    data = {
+        'Arrondissement': pd.Categorical(np.array(ARRONDISSEMENT_KEYS)[codes], categories=ARRONDISSEMENT_KEYS),
+        'Annee': combined.index.get_level_values('Annee').to_numpy(np.int64),
+    }
+    data.update((column, combined[column].to_numpy(np.float64)) for column in COLONNES)
+    return pd.DataFrame(data)
+
+# Étapes mesurées par le traitement par lots, dans l'ordre d'exécution
+BATCH_STAGES = ('generation', 'export', 'rendu')
+
+def _render_panel(task):
+    """Rend un panneau seul dans une figure hors pyplot ; retourne la durée du rendu"""
+    from matplotlib.figure import Figure
+    import matplotlib.style
+
+    arrondissement, start_year, end_year, df, method, dpi, path = task
+    start = time.perf_counter()
+    analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement)
+    analyzer.start_year = start_year
+    analyzer.end_year = end_year
+
+    matplotlib.style.use('seaborn-v0_8')
+    figure = Figure(figsize=(10, 5.6))
+    getattr(analyzer, method)(df, figure.add_subplot())
+    figure.tight_layout()
+    figure.savefig(path, dpi=dpi)
+    return time.perf_counter() - start
+
+def _composite_tiles(tiles, title, dpi, path):
+    """Assemble les tuiles PNG des panneaux en grille 5 × 2 sous un bandeau de titre"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    import matplotlib.image as mpimg
+
+    images = [mpimg.imread(tile)[:, :, :3] for tile in tiles]
+    rows = [np.concatenate(images[i:i + 2], axis=1) for i in range(0, len(images), 2)]
+    grid = np.concatenate(rows, axis=0)
+
+    band = Figure(figsize=(grid.shape[1] / dpi, 0.8), dpi=dpi)
+    canvas = FigureCanvasAgg(band)
+    band.text(0.5, 0.5, title, ha='center', va='center', fontsize=16, fontweight='bold')
+    canvas.draw()
+    band_image = np.asarray(canvas.buffer_rgba())[:, :grid.shape[1], :3] / 255.0
+
+    mpimg.imsave(path, np.concatenate([band_image, grid], axis=0))
+    return path
+
+_WORKER_FIGURE = None
+
+def _worker_figure():
+    """Figure headless propre au processus, réutilisée pour tous ses arrondissements"""
+    global _WORKER_FIGURE
+    if _WORKER_FIGURE is None:
+        _WORKER_FIGURE = AnalysisFigure(managed=False)
+    return _WORKER_FIGURE
+
+def _run_arrondissement(arrondissement, seed, output_dir, file_format='csv', float32=False, partitioned=False,
+                        cache_dir=None, cache_max_bytes=CACHE_MAX_BYTES, refresh=False,
+                        dpi=300, figure_format='png', data_only=False, instrument_stages=False,
+                        incremental=False, render_workers=None):
+    """Génère, exporte et rend un arrondissement ; retourne la durée de chaque étape
+
+    Avec cache_dir, les données et la figure sont servies par le cache de
+    résultats quand la configuration, la graine, les années, les événements
+    et le code sont inchangés. Avec incremental (et un cache), seules les
+    colonnes et les panneaux touchés par une modification sont recalculés ;
+    la planche est alors assemblée à partir des tuiles des panneaux. Avec
+    render_workers, les dix panneaux sont rendus en parallèle sur autant de
+    processus (render_panels) au lieu d'une seule figure. Avec
+    instrument_stages, les métriques détaillées (Metrics) sont jointes sous la
+    clé 'metrics'.
+    """
+    if instrument_stages:
+        with instrument() as metrics:
+            timings = _run_arrondissement(arrondissement, seed, output_dir, file_format, float32, partitioned,
+                                          cache_dir, cache_max_bytes, refresh, dpi, figure_format, data_only,
+                                          incremental=incremental, render_workers=render_workers)
+        timings['metrics'] = metrics
+        return timings
+
+    cache = ResultCache(cache_dir, cache_max_bytes, refresh) if cache_dir else None
+    timings = {'cache_hits': 0}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=seed)
+        data_key = analyzer.cache_key('data')
+        financial_data = cache.get_data(data_key) if cache else None
+        if financial_data is not None:
+            timings['cache_hits'] += 1
+            if incremental:
+                timings['colonnes_recalculees'] = 0
+        else:
+            if incremental and cache:
+                financial_data, stale = analyzer.generate_incremental(cache)
+                timings['colonnes_recalculees'] = len(stale)
+            else:
+                financial_data = analyzer.generate_financial_data()
+            if cache:
+                cache.put_data(data_key, financial_data)
+        timings['generation'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if partitioned:
+            output_file = os.path.join(output_dir, f'marseille_data_{analyzer.start_year}_{analyzer.end_year}')
+            export_data(analyzer.label_data(financial_data), output_file, file_format, float32, partitioned=True)
+        else:
+            output_file = os.path.join(
+                output_dir,
+                f'{arrondissement}e_arrondissement_marseille_data_{analyzer.start_year}_{analyzer.end_year}'
+                f'.{EXPORT_FORMATS[file_format]}')
+            export_data(financial_data, output_file, file_format, float32)
+        timings['export'] = time.perf_counter() - start
+
+        timings['rendu'] = 0.0
+        if data_only:
+            return timings
+
+        start = time.perf_counter()
+        figure_key = analyzer.cache_key('figure', dpi=dpi, figure_format=figure_format)
+        figure_file = os.path.join(output_dir, f'{arrondissement}e_arrondissement_marseille_analysis.{figure_format}')
+        if incremental and cache:
+            rendered = analyzer.render_panels(financial_data, output_dir, workers=render_workers or 1, dpi=dpi,
+                                              file_format=figure_format, cache=cache)
+            timings['panneaux_recalcules'] = len(rendered['panneaux_recalcules'])
+        elif cache and cache.get_file(figure_key, figure_file):
+            timings['cache_hits'] += 1
+        elif render_workers:
+            analyzer.render_panels(financial_data, output_dir, workers=render_workers, dpi=dpi,
+                                   file_format=figure_format)
+            # La planche n'est composée qu'en PNG ; les autres formats restent en tuiles
+            if cache and os.path.exists(figure_file):
+                cache.put_file(figure_key, figure_file)
+        else:
+            analyzer.create_financial_analysis(financial_data, output_dir, headless=True, dpi=dpi,
+                                               file_format=figure_format, figure=_worker_figure())
+            if cache:
+                cache.put_file(figure_key, figure_file)
+        timings['rendu'] = time.perf_counter() - start
+
+    return timings
+
+def _cpu_time():
+    """Temps CPU du processus et de ses sous-processus terminés (pool de rendu des panneaux)"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+def _run_arrondissement_timed(arrondissement, **options):
+    """_run_arrondissement, avec le temps CPU consommé sous la clé 'cpu_s'"""
+    start = _cpu_time()
+    timings = _run_arrondissement(arrondissement, **options)
+    timings['cpu_s'] = _cpu_time() - start
+    return timings
+
+def run_batch(arrondissements=None, workers=None, seed=None, output_dir='.', compare_serial=False,
+              **options):
+    """Traite plusieurs arrondissements (tous par défaut) sur un pool de processus
+
+    Retourne les durées par étape et par arrondissement, le temps mural du lot
+    et l'accélération par rapport à une exécution séquentielle. Avec
+    compare_serial=True, le lot est aussi exécuté en série pour mesurer cette
+    accélération ; sinon la durée en série est estimée par le temps CPU cumulé
+    des arrondissements (les durées murales des processus, qui se disputent
+    les cœurs, la surestimeraient).
+    Les options (file_format, float32, partitioned, cache_dir, refresh...)
+    sont transmises à chaque arrondissement ; avec instrument_stages=True,
+    'metriques' regroupe les Metrics de tous les processus.
+    """
+    arrondissements = list(arrondissements or [str(i) for i in range(1, N_ARRONDISSEMENTS + 1)])
+    seed = np.random.SeedSequence(seed).entropy
+    os.makedirs(output_dir, exist_ok=True)
+    run = functools.partial(_run_arrondissement_timed, seed=seed, output_dir=output_dir, **options)
+
+    serial_wall = None
+    if compare_serial:
+        start = time.perf_counter()
+        for arrondissement in arrondissements:
+            run(arrondissement)
+        serial_wall = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with calibrated_pool(workers) as executor:
+        results = list(executor.map(run, arrondissements))
+    parallel_wall = time.perf_counter() - start
+
+    per_arrondissement = dict(zip(arrondissements, results))
+    stages = {stage: sum(timings[stage] for timings in results) for stage in BATCH_STAGES}
+    if serial_wall is None:
+        serial_wall = sum(timings['cpu_s'] for timings in results)
+
+    metrics = None
+    if options.get('instrument_stages'):
+        metrics = Metrics()
+        for timings in results:
+            metrics.merge(timings.pop('metrics'))
+
+    return {
+        'seed': seed,
+        'workers': workers or os.cpu_count(),
+        'arrondissements': per_arrondissement,
+        'etapes': stages,
+        'duree_parallele_s': parallel_wall,
+        'duree_serie_s': serial_wall,
+        'acceleration': serial_wall / parallel_wall,
+        'acceleration_mesuree': compare_serial,
+        'metriques': metrics,
+    }
+
+# Indicateurs projetés et méthodes de prévision disponibles
+FORECAST_COLUMNS = ('Prix_m2_Moyen', 'Transactions_Immobilieres', 'Dette_Totale')
+FORECAST_METHODS = ('regression', 'ets')
+
+def fit_forecast_models(values, years, method='regression', fit_start=2010):
+    """Ajuste un modèle de tendance par série ; values est un tableau (série × année)
+
+    'regression' : régression linéaire du logarithme sur l'année (croissance
+    exponentielle), ajustée en un seul appel scikit-learn pour toutes les
+    séries (régression multi-sorties). 'ets' : lissage exponentiel de Holt à
+    tendance amortie (statsmodels), une série à la fois. Seules les années à
+    partir de fit_start sont utilisées. Retourne un DataFrame de paramètres,
+    une ligne par série, que forecast_from_models projette sur n'importe quel
+    horizon sans réajuster.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    years = np.asarray(years)
+    window = years >= fit_start
+    values, years = values[:, window], years[window]
+    last_year = int(years[-1])
+
+    if method == 'regression':
+        from sklearn.linear_model import LinearRegression
+
+        logs = np.log(values).T
+        regression = LinearRegression().fit((years - last_year)[:, None].astype(float), logs)
+        residuals = logs - regression.predict((years - last_year)[:, None].astype(float))
+        return pd.DataFrame({
+            'methode': method,
+            'derniere_annee': last_year,
+            'intercept': regression.intercept_,
+            'pente': regression.coef_[:, 0],
+            'sigma': residuals.std(axis=0, ddof=2),
+        })
+    if method == 'ets':
+        from statsmodels.tsa.holtwinters import Holt
+
+        rows = []
+        for series in values:
+            fit = Holt(series, damped_trend=True, initialization_method='estimated').fit()
+            rows.append({
+                'methode': method,
+                'derniere_annee': last_year,
+                'niveau': fit.level[-1],
+                'tendance': fit.trend[-1],
+                'amortissement': fit.params['damping_trend'],
+                'sigma': np.sqrt(fit.sse / len(series)),
+            })
+        return pd.DataFrame(rows)
+    raise ValueError(f"Méthode de prévision inconnue: {method} (attendu: {', '.join(FORECAST_METHODS)})")
+
+def forecast_from_models(models, end_year):
+    """Projette chaque modèle ajusté jusqu'à end_year : tableau (série × année) et années projetées
+
+    Calcul vectorisé sur toutes les séries, sans réajustement.
+    """
+    last_year = int(models['derniere_annee'].iloc[0])
+    steps = np.arange(1, end_year - last_year + 1)
+    if models['methode'].iloc[0] == 'regression':
+        forecasts = np.exp(models['intercept'].to_numpy()[:, None] + models['pente'].to_numpy()[:, None] * steps)
+    else:
+        phi = models['amortissement'].to_numpy()[:, None]
+        damped = np.cumsum(phi ** steps, axis=1)
+        forecasts = models['niveau'].to_numpy()[:, None] + damped * models['tendance'].to_numpy()[:, None]
+    return forecasts, last_year + steps
+
+def _fit_arrondissement_models(arrondissement, seed, n_replicas, method, columns, start_year, end_year,
+                               cache_dir=None, cache_max_bytes=CACHE_MAX_BYTES, refresh=False):
+    """Modèles de prévision d'un arrondissement (répliques × indicateurs), lus dans le cache s'ils existent"""
+    analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=seed)
+    analyzer.start_year = start_year
+    analyzer.end_year = end_year
+    cache = ResultCache(cache_dir, cache_max_bytes, refresh) if cache_dir else None
+    key = analyzer.cache_key('modeles_prevision', method=method, n_replicas=n_replicas, columns=list(columns))
+    models = cache.get_data(key) if cache else None
+    if models is None:
+        series = [analyzer.generate_indicator(column, n_replicas) for column in columns]
+        models = fit_forecast_models(np.concatenate(series), analyzer._years(), method)
+        models.insert(0, 'Replique', np.tile(np.arange(n_replicas), len(columns)))
+        models.insert(0, 'Indicateur', np.repeat(columns, n_replicas))
+        models.insert(0, 'Arrondissement', ARRONDISSEMENT_KEYS[analyzer.number])
+        if cache:
+            cache.put_data(key, models)
+    return models
+
+def forecast(arrondissements=None, end_year=2040, n_replicas=1, method='regression', columns=FORECAST_COLUMNS,
+             seed=None, workers=None, cache_dir=CACHE_DIR, refresh=False, history=(2002, 2025)):
+    """Prévisions des indicateurs au-delà des années simulées, pour chaque arrondissement et réplique
+
+    Les modèles sont ajustés par arrondissement dans un pool de processus
+    (toutes les répliques et indicateurs d'un arrondissement en un lot) et
+    conservés dans le cache de résultats : changer d'horizon ne réajuste
+    rien. Retourne une table : une ligne par arrondissement, réplique et année
+    projetée, une colonne par indicateur.
+    """
+    arrondissements = list(arrondissements or [str(i) for i in range(1, N_ARRONDISSEMENTS + 1)])
+    seed = np.random.SeedSequence(seed).entropy
+    columns = list(columns)
+    fit = functools.partial(_fit_arrondissement_models, seed=seed, n_replicas=n_replicas, method=method,
+                            columns=columns, start_year=history[0], end_year=history[1],
+                            cache_dir=cache_dir, refresh=refresh)
+    if workers == 1 or len(arrondissements) == 1:
+        models = [fit(arrondissement) for arrondissement in arrondissements]
+    else:
+        with calibrated_pool(workers) as executor:
+            models = list(executor.map(fit, arrondissements))
+    models = pd.concat(models, ignore_index=True)
+
+    # Modèles rangés par arrondissement, indicateur puis réplique : (A, C, R, H) -> (A, R, H, C)
+    forecasts, years = forecast_from_models(models, end_year)
+    cube = forecasts.reshape(len(arrondissements), len(columns), n_replicas, len(years)).transpose(0, 2, 3, 1)
+    labels = models['Arrondissement'].to_numpy()[::len(columns) * n_replicas]
+    data = {
+        'Arrondissement': pd.Categorical(np.repeat(labels, n_replicas * len(years)), categories=ARRONDISSEMENT_KEYS),
+        'Replique': np.tile(np.repeat(np.arange(n_replicas), len(years)), len(arrondissements)),
+        'Annee': np.tile(years, len(arrondissements) * n_replicas),
+    }
+    data.update(zip(columns, cube.reshape(-1, len(columns)).T))
+    return pd.DataFrame(data)
+
+# Calibration : indicateur observé -> champs de la table de configuration ajustés
+CALIBRATION_PARAMETRES = {
+    'Prix_m2_Moyen': ('prix_m2_base', 'croissance_prix', 'regimes_prix'),
+    'Transactions_Immobilieres': ('ajustement_transactions', 'croissance_transactions', 'regimes_transactions'),
+    'Recettes_Totales': ('budget_base', 'croissance_recettes'),
+}
+# Écart-type a priori autour de la valeur de départ : relatif pour les bases, absolu pour les taux,
+# (niveau, pente) pour les régimes ; les périodes sans observation restent ainsi à leur valeur
+CALIBRATION_A_PRIORI = {
+    'prix_m2_base': 0.5, 'budget_base': 0.5, 'ajustement_transactions': 0.5,
+    'croissance_prix': 0.02, 'croissance_recettes': 0.02, 'croissance_transactions': 0.02,
+    'regimes_prix': (0.15, 0.03), 'regimes_transactions': (0.2, 0.05),
+}
+_CALIBRATION_RELATIFS = ('prix_m2_base', 'budget_base', 'ajustement_transactions')
+CALIBRATION_MIN_OBSERVATIONS = 3
+
+def _calibration_layout(params, fields):
+    """Valeurs de départ, écarts-types a priori et positivité des champs calibrés, mis à plat"""
+    starts, scales, positive = [], [], []
+    for field in fields:
+        value = np.asarray(params[field], dtype=np.float64)
+        scale = np.broadcast_to(CALIBRATION_A_PRIORI[field], value.shape)
+        sign = np.zeros(value.shape, dtype=bool)
+        if field in _CALIBRATION_RELATIFS:
+            scale, sign = scale * value, np.ones(value.shape, dtype=bool)
+        elif field.startswith('regimes_'):
+            sign[..., 0] = True  # niveaux positifs, pentes libres
+        starts.append(value.ravel())
+        scales.append(np.ravel(scale))
+        positive.append(sign.ravel())
+    return np.concatenate(starts), np.concatenate(scales), np.concatenate(positive)
+
+def _calibrate_arrondissement(number, observed, base):
+    """Ajuste les paramètres d'un arrondissement à ses séries observées (exécutable en processus)
+
+    Estimation au maximum a posteriori par moindres carrés (scipy.optimize) :
+    écarts log(modèle / observé) rapportés au bruit du modèle, plus un
+    terme a priori par paramètre. Les paramètres sont standardisés autour de
+    base ; la jacobienne par différences finies est évaluée en un seul
+    passage vectorisé sur tous les candidats perturbés (from_params).
+    """
+    from scipy.optimize import least_squares
+
+    start = time.perf_counter()
+    analyzer = MarseilleArrondissementImmobilierAnalyzer(ARRONDISSEMENT_KEYS[number])
+    observed = observed[observed['Annee'] >= analyzer.start_year]
+    columns = [column for column in CALIBRATION_PARAMETRES if column in observed
+               and (observed[column] > 0).sum() >= CALIBRATION_MIN_OBSERVATIONS]
+    if not columns:
+        return number, {}, []
+    fields = [field for column in columns for field in CALIBRATION_PARAMETRES[column]]
+    starts, scales, positive = _calibration_layout(base[0], fields)
+    years = observed['Annee'].to_numpy(np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        targets = np.log(observed[columns].to_numpy(np.float64))
+    valid = np.isfinite(targets)
+    factors = analyzer._trend_factors(years)[:, [COLONNES.index(column) for column in columns]]
+    methods = [dict(INDICATEURS)[column] for column in columns]
+
+    def errors(x):
+        """Écarts log(modèle / observé) et bruit du modèle par indicateur, pour chaque candidat x (candidat × paramètre)"""
+        values = starts + scales * np.atleast_2d(x)
+        candidates = np.repeat(base, len(values))
+        offset = 0
+        for field in fields:
+            shape = CONFIG_DTYPE[field].shape
+            size = int(np.prod(shape, dtype=int))
+            candidates[field] = values[:, offset:offset + size].reshape((len(values),) + shape)
+            offset += size
+        model = MarseilleArrondissementImmobilierAnalyzer.from_params(candidates[:, None])
+        result = []
+        for k, method in enumerate(methods):
+            trend, sigma = getattr(model, method)(years)
+            prediction = np.broadcast_to(trend, (len(values), len(years))) * factors[:, k]
+            result.append(((np.log(np.maximum(prediction, 1e-12)) - targets[:, k])[:, valid[:, k]], sigma))
+        return result
+
+    def residuals(x):
+        return np.concatenate([error / sigma for error, sigma in errors(x)] + [np.atleast_2d(x)], axis=1)
+
+    def jacobian(x, step=1e-6):
+        batch = residuals(np.vstack([x, x + step * np.eye(len(x))]))
+        return ((batch[1:] - batch[0]) / step).T
+
+    lower = np.where(positive, np.maximum(-4.0, -0.9 * starts / scales), -4.0)
+    fit = least_squares(lambda x: residuals(x)[0], np.zeros(len(starts)), jac=jacobian,
+                        bounds=(lower, np.full(len(starts), 4.0)), method='trf')
+
+    values = starts + scales * fit.x
+    parameters, offset = {}, 0
+    for field in fields:
+        shape = CONFIG_DTYPE[field].shape
+        size = int(np.prod(shape, dtype=int))
+        parameters[field] = values[offset:offset + size].reshape(shape).tolist()
+        offset += size
+
+    elapsed = time.perf_counter() - start
+    before, after = errors(np.zeros(len(starts))), errors(fit.x)
+    report = [{
+        'Arrondissement': ARRONDISSEMENT_KEYS[number],
+        'Indicateur': column,
+        'Observations': int(valid[:, k].sum()),
+        # Erreur quadratique moyenne en log, soit une erreur relative typique
+        'Erreur_Avant': float(np.sqrt(np.mean(before[k][0] ** 2))),
+        'Erreur_Apres': float(np.sqrt(np.mean(after[k][0] ** 2))),
+        'Evaluations': int(fit.nfev + fit.njev),
+        'Duree_s': elapsed,
+    } for k, column in enumerate(columns)]
+    return number, parameters, report
+
+# Paramètres calibrés appliqués dans ce processus, réappliqués au démarrage des processus de calibrated_pool
+_CALIBRATION = {}
+
+def apply_calibration(parameters):
+    """Écrit des paramètres calibrés {arrondissement: {champ: valeur}} dans la table de configuration
+
+    Les analyseurs créés ensuite (et les clés de cache, qui dépendent des
+    paramètres) en tiennent compte ; ARRONDISSEMENT_CONFIGS est mis à jour
+    de même pour qu'une recompilation de la table les conserve, et les
+    processus de calibrated_pool les reçoivent aussi.
+    """
+    for arrondissement, fields in parameters.items():
+        number = arrondissement_number(arrondissement)
+        if not number:
+            raise ValueError(f"Arrondissement inconnu: {arrondissement}")
+        for field, value in fields.items():
+            if field not in CONFIG_DTYPE.names:
+                raise ValueError(f"Champ de configuration inconnu: {field}")
+            CONFIG_TABLE[field][number] = value
+            ARRONDISSEMENT_CONFIGS[ARRONDISSEMENT_KEYS[number]][field] = value
+            _CALIBRATION.setdefault(ARRONDISSEMENT_KEYS[number], {})[field] = value
+
+def calibrated_pool(max_workers=None, **options):
+    """Pool de processus dont chaque processus applique d'abord la calibration courante
+
+    Un processus lancé par spawn ou forkserver réimporte le module et
+    repartirait de la table de configuration par défaut.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=apply_calibration,
+                               initargs=({arrondissement: dict(fields) for arrondissement, fields in _CALIBRATION.items()},), **options)
+
+def save_calibration(parameters, path):
+    """Enregistre des paramètres calibrés en JSON"""
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(parameters, output, indent=2, ensure_ascii=False)
+
+def load_calibration(path):
+    """Relit des paramètres calibrés (save_calibration) et les applique à la table de configuration"""
+    with open(path, encoding='utf-8') as source:
+        parameters = json.load(source)
+    apply_calibration(parameters)
+    return parameters
+
+def calibrate(observed, arrondissements=None, workers=None, apply=True):
+    """Calibre les paramètres de croissance et de conjoncture sur des séries observées
+
+    observed suit le schéma des données générées avec une colonne
+    Arrondissement (ingest_open_data, SalesAggregate.to_frame) ; chaque
+    indicateur de CALIBRATION_PARAMETRES ayant assez d'années observées
+    ajuste ses champs. Les arrondissements sont calibrés en parallèle, puis
+    les paramètres obtenus écrits dans la table de configuration (apply).
+    Retourne les paramètres {arrondissement: {champ: valeur}} et le rapport
+    de qualité d'ajustement (erreur avant et après, évaluations, durée).
+    """
+    start = time.perf_counter()
+    numbers = [arrondissement_number(arrondissement) for arrondissement in
+               (arrondissements or [str(i) for i in range(1, N_ARRONDISSEMENTS + 1)])]
+    labels = observed['Arrondissement'].astype(str).to_numpy()
+    tasks = [(number, observed[labels == ARRONDISSEMENT_KEYS[number]], CONFIG_TABLE[[number]])
+             for number in numbers if number and (labels == ARRONDISSEMENT_KEYS[number]).any()]
+    if workers == 1 or len(tasks) <= 1:
+        results = [_calibrate_arrondissement(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_calibrate_arrondissement, *zip(*tasks)))
+
+    parameters = {ARRONDISSEMENT_KEYS[number]: fields for number, fields, _ in results if fields}
+    report = pd.DataFrame([row for _, _, rows in results for row in rows],
+                          columns=['Arrondissement', 'Indicateur', 'Observations', 'Erreur_Avant', 'Erreur_Apres',
+                                   'Evaluations', 'Duree_s'])
+    report.attrs['duree_totale'] = time.perf_counter() - start
+    if apply:
+        apply_calibration(parameters)
+    return parameters, report
+
+def _render_figure(arrondissement, seed, df, dpi, figure_format, cache_dir=None,
+                   cache_max_bytes=CACHE_MAX_BYTES):
+    """Rend la planche d'un arrondissement dans un processus du pool ; retourne le contenu du fichier"""
+    import tempfile
+
+    cache = ResultCache(cache_dir, cache_max_bytes) if cache_dir else None
+    analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=seed)
+    figure_key = analyzer.cache_key('figure', dpi=dpi, figure_format=figure_format)
+    with tempfile.TemporaryDirectory(prefix='marseille_service_') as output_dir:
+        figure_file = os.path.join(output_dir, f'{arrondissement}e_arrondissement_marseille_analysis.{figure_format}')
+        if not (cache and cache.get_file(figure_key, figure_file)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                analyzer.create_financial_analysis(df, output_dir, headless=True, dpi=dpi,
+                                                   file_format=figure_format, figure=_worker_figure())
+            if cache:
+                cache.put_file(figure_key, figure_file)
+        with open(figure_file, 'rb') as source:
+            return source.read()
+
+# Points d'accès du service, suivis du numéro d'arrondissement (ex: /figure/13?dpi=100)
+SERVICE_ROUTES = ('data', 'insights', 'figure')
+SERVICE_PORT = 8765
+_CONTENT_TYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'pdf': 'application/pdf',
+}
+_HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                 500: 'Internal Server Error'}
+
+class AnalysisService:
+    """Service HTTP local (asyncio) qui garde analyseurs, données et figures en mémoire
+
+    Les données et insights sont calculés dans la boucle (quelques
+    millisecondes) ; le rendu des figures part dans un pool de processus, si
+    bien que des requêtes concurrentes ne se sérialisent pas derrière
+    matplotlib. Les réponses sont conservées en mémoire (les max_entries plus
+    récentes) et les figures passent aussi par le cache de résultats disque.
+    """
+
+    def __init__(self, seed=None, workers=None, dpi=100, cache_dir=CACHE_DIR,
+                 cache_max_bytes=CACHE_MAX_BYTES, max_entries=256):
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.dpi = dpi
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.max_entries = max_entries
+        # Processus lancés par spawn : un fork hériterait des sockets clientes ouvertes
+        import multiprocessing
+        self.executor = calibrated_pool(workers, mp_context=multiprocessing.get_context('spawn'))
+        self.analyzers = {}
+        self.data = {}
+        self.responses = {}
+        self._renders = {}
+
+    def analyzer(self, number):
+        """Analyseur de l'arrondissement, créé une seule fois"""
+        if number not in self.analyzers:
+            self.analyzers[number] = MarseilleArrondissementImmobilierAnalyzer(str(number), seed=self.seed)
+        return self.analyzers[number]
+
+    def financial_data(self, number, resolution='annuelle'):
+        """Données de l'arrondissement à cette résolution, générées une seule fois"""
+        key = (number, resolution)
+        if key not in self.data:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.data[key] = self.analyzer(number).generate_financial_data(resolution)
+        return self.data[key]
+
+    def _remember(self, key, response):
+        """Conserve une réponse, en oubliant les plus anciennes au-delà de max_entries"""
+        self.responses[key] = response
+        while len(self.responses) > self.max_entries:
+            del self.responses[next(iter(self.responses))]
+        return response
+
+    def data_response(self, number, resolution='annuelle', output_format='json'):
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Résolution inconnue: {resolution} (attendu: {', '.join(RESOLUTIONS)})")
+        if output_format not in ('json', 'ndjson', 'csv'):
+            raise ValueError(f"Format de données inconnu: {output_format} (attendu: json, ndjson, csv)")
+        key = ('data', number, resolution, output_format)
+        if key not in self.responses:
+            df = self.analyzer(number).label_data(self.financial_data(number, resolution))
+            if output_format == 'csv':
+                body = df.to_csv(index=False)
+            else:
+                body = df.to_json(orient='records', lines=output_format == 'ndjson', date_format='iso',
+                                  force_ascii=False)
+            self._remember(key, (_CONTENT_TYPES[output_format], body.encode('utf-8')))
+        return self.responses[key]
+
+    def insights_response(self, number):
+        key = ('insights', number)
+        if key not in self.responses:
+            insights = self.analyzer(number).compute_financial_insights(self.financial_data(number))
+            body = json.dumps(insights, ensure_ascii=False)
+            self._remember(key, (_CONTENT_TYPES['json'], body.encode('utf-8')))
+        return self.responses[key]
+
+    async def figure_response(self, number, dpi=None, figure_format='png'):
+        import asyncio
+
+        dpi = int(dpi or self.dpi)
+        if figure_format not in FIGURE_FORMATS:
+            raise ValueError(f"Format de figure inconnu: {figure_format} (attendu: {', '.join(FIGURE_FORMATS)})")
+        if not 10 <= dpi <= 600:
+            raise ValueError(f"Résolution hors bornes: {dpi} dpi (attendu: 10 à 600)")
+        key = ('figure', number, dpi, figure_format)
+        if key in self.responses:
+            return self.responses[key]
+        # Des requêtes identiques simultanées attendent le même rendu
+        if key not in self._renders:
+            render = functools.partial(_render_figure, str(number), self.seed, self.financial_data(number),
+                                       dpi, figure_format, self.cache_dir, self.cache_max_bytes)
+            self._renders[key] = asyncio.get_running_loop().run_in_executor(self.executor, render)
+        try:
+            body = await asyncio.shield(self._renders[key])
+        finally:
+            self._renders.pop(key, None)
+        return self._remember(key, (_CONTENT_TYPES[figure_format], body))
+
+    async def handle(self, method, target):
+        """Traite une requête ; retourne (statut, type de contenu, corps)"""
+        import urllib.parse
+
+        if method != 'GET':
+            return 405, _CONTENT_TYPES['json'], b'{"erreur": "seule la methode GET est acceptee"}'
+        url = urllib.parse.urlsplit(target)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        parts = url.path.strip('/').split('/')
+        if parts == ['health']:
+            body = json.dumps({'statut': 'ok', 'analyseurs': len(self.analyzers), 'reponses': len(self.responses)})
+            return 200, _CONTENT_TYPES['json'], body.encode()
+        number = arrondissement_number(parts[1]) if len(parts) == 2 else 0
+        if parts[0] not in SERVICE_ROUTES or not number:
+            body = json.dumps({'erreur': f"chemin inconnu: {url.path}",
+                               'routes': [f'/{route}/<1-{N_ARRONDISSEMENTS}>' for route in SERVICE_ROUTES]})
+            return 404, _CONTENT_TYPES['json'], body.encode()
+        try:
+            if parts[0] == 'data':
+                content_type, body = self.data_response(number, query.get('resolution', 'annuelle'),
+                                                        query.get('format', 'json'))
+            elif parts[0] == 'insights':
+                content_type, body = self.insights_response(number)
+            else:
+                content_type, body = await self.figure_response(number, query.get('dpi'),
+                                                                query.get('format', 'png'))
+        except ValueError as error:
+            return 400, _CONTENT_TYPES['json'], json.dumps({'erreur': str(error)}, ensure_ascii=False).encode()
+        except Exception as error:
+            return 500, _CONTENT_TYPES['json'], json.dumps({'erreur': repr(error)}, ensure_ascii=False).encode()
+        return 200, content_type, body
+
+    async def _serve_connection(self, reader, writer):
+        """Boucle HTTP/1.1 d'une connexion (keep-alive sauf Connection: close)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    status, content_type, body = 400, _CONTENT_TYPES['json'], b'{"erreur": "requete invalide"}'
+                    method, version = None, 'HTTP/1.0'
+                else:
+                    status, content_type, body = await self.handle(method, target)
+                keep_alive = (method == 'GET' and version == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                writer.write(f"HTTP/1.1 {status} {_HTTP_REASONS[status]}\r\n"
+                             f"Content-Type: {content_type}\r\n"
+                             f"Content-Length: {len(body)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1'))
+                writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=SERVICE_PORT):
+        """Écoute jusqu'à interruption"""
+        import asyncio
+
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        print(f"🌐 Service Marseille sur http://{host}:{port} "
+              f"({', '.join(f'/{route}/<arrondissement>' for route in SERVICE_ROUTES)})", file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+def serve(host='127.0.0.1', port=SERVICE_PORT, **options):
+    """Lance le service HTTP (Ctrl-C ou SIGTERM pour arrêter) ; les options vont à AnalysisService"""
+    import asyncio
+    import signal
+
+    # SIGTERM s'arrête comme Ctrl-C : le pool de rendu est fermé avec le service
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(AnalysisService(**options).serve(host, port))
+
+async def _timed_request(host, port, path):
+    """GET sur une connexion neuve ; retourne (statut, latence en secondes)"""
+    import asyncio
+
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        length = 0
+        while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        await reader.readexactly(length)
+    finally:
+        writer.close()
+    return int(status_line.split()[1]), time.perf_counter() - start
+
+def load_test(host='127.0.0.1', port=SERVICE_PORT, requests=200, concurrency=16, paths=None):
+    """Envoie des requêtes concurrentes au service et rapporte les latences p50/p99 par point d'accès
+
+    Par défaut, les requêtes parcourent /data, /insights et /figure des 16
+    arrondissements. Retourne les statistiques par point d'accès (en
+    millisecondes) et le débit global.
+    """
+    import asyncio
+
+    paths = paths or [f'/{route}/{number}' for number in range(1, N_ARRONDISSEMENTS + 1) for route in SERVICE_ROUTES]
+    queue = [paths[i % len(paths)] for i in range(requests)]
+    results = []
+
+    async def client():
+        while queue:
+            path = queue.pop()
+            try:
+                status, latency = await _timed_request(host, port, path)
+            except OSError:
+                status, latency = None, float('nan')
+            results.append((path.split('?')[0].split('/')[1], status, latency))
+
+    async def run():
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    wall = time.perf_counter() - start
+
+    report = {}
+    for route in sorted({route for route, _, _ in results}):
+        latencies = np.array([latency for r, status, latency in results if r == route and status == 200]) * 1000
+        report[route] = {
+            'requetes': sum(1 for r, _, _ in results if r == route),
+            'erreurs': sum(1 for r, status, _ in results if r == route and status != 200),
+            'p50_ms': float(np.percentile(latencies, 50)) if latencies.size else float('nan'),
+            'p99_ms': float(np.percentile(latencies, 99)) if latencies.size else float('nan'),
+        }
+    report['debit_rps'] = len(results) / wall
+
+    print(f"📈 Test de charge: {len(results)} requêtes, {concurrency} clients, {report['debit_rps']:.1f} req/s")
+    for route, stats in report.items():
+        if route != 'debit_rps':
+            print(f"  /{route}: p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms, "
+                  f"erreurs: {stats['erreurs']}/{stats['requetes']}")
+    return report
+
+def _arrondissement_argument(value):
+    """Arrondissement de la ligne de commande (1 à 16, 1er, 2e...) ou 'all', validé par argparse"""
+    if value.lower() != 'all' and not arrondissement_number(value):
+        raise argparse.ArgumentTypeError(
+            f"arrondissement inconnu: {value} (attendu: 1 à {N_ARRONDISSEMENTS}, "
+            f"{', '.join(ARRONDISSEMENT_KEYS[1:])} ou all)")
+    return value
+
+def _parse_arrondissements(values):
+    """Liste d'arrondissements de la ligne de commande ; None ou 'all' désignent les 16"""
+    if not values or 'all' in [value.lower() for value in values]:
+        return [str(i) for i in range(1, N_ARRONDISSEMENTS + 1)]
+    return values
+
+def iter_records(arrondissements, start_year=2002, end_year=2025, seed=None, resolution='annuelle',
+                 replicas=1, events=(), observed=None):
+    """Produit les données arrondissement par arrondissement, un bloc par année dès qu'il est calculé
+
+    Chaque bloc porte les colonnes Arrondissement et Segment_Immobilier. Avec
+    replicas > 1 (résolution annuelle), un bloc par arrondissement contient
+    les bandes de percentiles Monte Carlo. observed est une table de valeurs
+    réelles remplaçant les indicateurs simulés (voir use_observed).
+    """
+    seed = np.random.SeedSequence(seed).entropy
+    for arrondissement in arrondissements:
+        analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=seed)
+        analyzer.start_year = start_year
+        analyzer.end_year = end_year
+        analyzer.events.extend(events)
+        if observed is not None:
+            analyzer.use_observed(observed)
+        if replicas > 1:
+            yield analyzer.label_data(analyzer.ensemble_percentiles(replicas))
+        else:
+            for chunk in analyzer.iter_financial_data(resolution, chunk_years=1):
+                yield analyzer.label_data(chunk)
+
+def write_ndjson(chunks, stream):
+    """Écrit chaque bloc en NDJSON (un enregistrement par ligne) et vide le tampon aussitôt"""
+    records = 0
+    for chunk in chunks:
+        text = chunk.to_json(orient='records', lines=True, date_format='iso', force_ascii=False)
+        stream.write(text if text.endswith('\n') else text + '\n')
+        stream.flush()
+        records += len(chunk)
+    return records
+
+def _add_generate_arguments(parser):
+    parser.add_argument('--arrondissements', nargs='+', default=['all'], type=_arrondissement_argument,
+                        help="arrondissements à générer (1 à 16, 1er, 2e...) ou 'all' (par défaut)")
+    parser.add_argument('--start-year', type=int, default=2002, help="première année")
+    parser.add_argument('--end-year', type=int, default=2025, help="dernière année")
+    parser.add_argument('--seed', type=int, default=None, help="graine aléatoire")
+    parser.add_argument('--resolution', choices=list(RESOLUTIONS), default='annuelle',
+                        help="résolution temporelle")
+    parser.add_argument('--replicas', type=int, default=1,
+                        help="nombre de répliques Monte Carlo ; au-delà de 1, sortie des bandes P5/P50/P95")
+    parser.add_argument('--events', help="table CSV d'événements supplémentaires (voir load_events)")
+    parser.add_argument('--observed', default=None, metavar='FICHIER',
+                        help="valeurs réelles (sortie de ingest ou sales) remplaçant les indicateurs simulés")
+    parser.add_argument('--calibration', default=None, metavar='FICHIER',
+                        help="paramètres calibrés (sortie de calibrate) appliqués avant la génération")
+    parser.add_argument('--format', dest='output_format', choices=['ndjson', *EXPORT_FORMATS], default='ndjson',
+                        help="ndjson (flux sur la sortie standard par défaut) ou un format de fichier")
+    parser.add_argument('--output', default='-',
+                        help="fichier NDJSON ('-' pour la sortie standard) ou répertoire des fichiers exportés")
+    parser.add_argument('--float32', action='store_true', help="exporter les indicateurs en float32")
+    parser.add_argument('--render-workers', type=int, default=None,
+                        help="rendre aussi les panneaux de chaque arrondissement, en parallèle sur N processus "
+                             "(résolution annuelle, sans répliques)")
+
+def _render_generated(arrondissements, options, output_dir, workers):
+    """Panneaux et planche de chaque arrondissement généré, à partir des mêmes données que la sortie"""
+    for arrondissement in arrondissements:
+        analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement)
+        analyzer.start_year = options['start_year']
+        analyzer.end_year = options['end_year']
+        df = pd.concat(iter_records([arrondissement], **options), ignore_index=True)
+        rendered = analyzer.render_panels(df, output_dir, workers=workers)
+        print(f"🖼️ Figure rendue: {rendered.get('planche', output_dir)} "
+              f"({rendered['duree_mur_s']:.2f}s, {workers} processus)", file=sys.stderr)
+
+def _generate_command(args):
+    """Génération non interactive : flux NDJSON ou un fichier par arrondissement"""
+    if args.replicas > 1 and args.resolution != 'annuelle':
+        raise SystemExit("Les répliques Monte Carlo ne sont disponibles qu'en résolution annuelle")
+    if args.replicas > 1 and args.observed:
+        raise SystemExit("Les valeurs observées ne s'appliquent qu'à une génération sans répliques")
+    if args.render_workers and (args.replicas > 1 or args.resolution != 'annuelle'):
+        raise SystemExit("Les figures (--render-workers) ne sont rendues qu'en résolution annuelle, sans répliques")
+    arrondissements = _parse_arrondissements(args.arrondissements)
+    events = load_events(args.events) if args.events else ()
+    if args.calibration:
+        load_calibration(args.calibration)
+    options = dict(start_year=args.start_year, end_year=args.end_year,
+                   seed=np.random.SeedSequence(args.seed).entropy,
+                   resolution=args.resolution, replicas=args.replicas, events=events,
+                   observed=load_data(args.observed) if args.observed else None)
+
+    if args.output_format == 'ndjson':
+        if args.render_workers:
+            _render_generated(arrondissements, options,
+                              '.' if args.output == '-' else os.path.dirname(args.output) or '.', args.render_workers)
+        if args.output == '-':
+            try:
+                return write_ndjson(iter_records(arrondissements, **options), sys.stdout)
+            except BrokenPipeError:
+                # Lecteur fermé (ex: | head) : fin normale du flux
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                return 0
+        with open(args.output, 'w', encoding='utf-8') as stream:
+            return write_ndjson(iter_records(arrondissements, **options), stream)
+
+    output_dir = '.' if args.output == '-' else args.output
+    os.makedirs(output_dir, exist_ok=True)
+    if args.render_workers:
+        _render_generated(arrondissements, options, output_dir, args.render_workers)
+    records = 0
+    for arrondissement in arrondissements:
+        output_file = os.path.join(
+            output_dir,
+            f'{arrondissement}e_arrondissement_marseille_data_{args.start_year}_{args.end_year}'
+            f'.{EXPORT_FORMATS[args.output_format]}')
+        records += export_chunks(iter_records([arrondissement], **options), output_file,
+                                 args.output_format, args.float32)
+        print(f"💾 Données sauvegardées: {output_file}", file=sys.stderr)
+    return records
+
+def _add_insights_arguments(parser):
+    parser.add_argument('--arrondissements', nargs='+', default=['all'], type=_arrondissement_argument,
+                        help="arrondissements à analyser ou 'all' (par défaut les 16)")
+    parser.add_argument('--replicas', type=int, default=1, help="répliques Monte Carlo (une ligne chacune)")
+    parser.add_argument('--seed', type=int, default=None, help="graine aléatoire")
+    parser.add_argument('--output', default='-',
+                        help="'-' pour du NDJSON sur la sortie standard, sinon fichier csv, parquet ou feather")
+
+def _insights_command(args):
+    """Table des insights, en NDJSON ou dans un fichier"""
+    table = insights_table(_parse_arrondissements(args.arrondissements), args.replicas, args.seed)
+    if args.output == '-':
+        return write_ndjson([table], sys.stdout)
+    export_data(table, args.output)
+    print(f"💾 Insights sauvegardés: {args.output}", file=sys.stderr)
+    return len(table)
+
+def _parse_grid(items):
+    """Grille de leviers à partir d'arguments LEVIER=v1,v2,..."""
+    grid = {}
+    for item in items:
+        lever, _, values = item.partition('=')
+        if lever not in SCENARIO_LEVERS or not values:
+            raise SystemExit(f"Levier invalide: {item} (attendu LEVIER=v1,v2 avec LEVIER parmi "
+                             f"{', '.join(SCENARIO_LEVERS)})")
+        grid[lever] = [float(value) for value in values.split(',')]
+    return grid
+
+def _add_scenarios_arguments(parser):
+    parser.add_argument('--grid', nargs='+', required=True, metavar='LEVIER=V1,V2',
+                        help="valeurs de chaque levier, ex: ajustement_croissance=-0.01,0,0.01 covid=0,1,1.5 "
+                             f"(leviers: {', '.join(SCENARIO_LEVERS)})")
+    parser.add_argument('--arrondissements', nargs='+', default=['all'], type=_arrondissement_argument,
+                        help="arrondissements concernés ou 'all' (par défaut les 16)")
+    parser.add_argument('--start-year', type=int, default=2002, help="première année")
+    parser.add_argument('--end-year', type=int, default=2025, help="dernière année")
+    parser.add_argument('--workers', type=int, default=None, help="processus pour les grandes grilles")
+    parser.add_argument('--columns', nargs='+', default=['Prix_m2_Moyen', 'Recettes_Totales', 'Taxe_Habitation'],
+                        choices=COLONNES, metavar='COLONNE', help="indicateurs du résumé tornade")
+    parser.add_argument('--year', type=int, default=None, help="année du résumé (par défaut la dernière ; 2020 ou 2021 pour le levier covid)")
+    parser.add_argument('--output', default=None, help="fichier csv, parquet ou feather de la table des scénarios")
+
+def _scenarios_command(args):
+    """Balayage de scénarios et résumé tornade"""
+    table = scenario_sweep(_parse_grid(args.grid), _parse_arrondissements(args.arrondissements),
+                           args.start_year, args.end_year, workers=args.workers)
+    print(f"🧪 {table['Scenario'].nunique()} scénarios évalués ({len(table)} lignes)")
+    summary = sensitivity_summary(table, args.columns, args.year)
+    year = table['Annee'].max() if args.year is None else args.year
+    if 'covid' in table and table['covid'].nunique() > 1 and not 2020 <= year <= 2021:
+        print(f"ℹ️ Le levier covid n'agit que sur 2020-2021 (résumé en {year}) : utiliser --year 2020")
+    print_tornado(summary)
+    if args.output:
+        export_data(table, args.output)
+        print(f"💾 Scénarios sauvegardés: {args.output}")
+    return summary
+
+def _parse_mapping(items):
+    """Correspondances EN_TETE=CHAMP de la ligne de commande"""
+    mapping = {}
+    for item in items or ():
+        header, separator, field = item.rpartition('=')
+        if not separator or not header:
+            raise argparse.ArgumentTypeError(f"Correspondance invalide: {item} (attendu EN_TETE=CHAMP)")
+        mapping[header] = field
+    return mapping
+
+def _add_ingest_arguments(parser):
+    parser.add_argument('--comptes', nargs='+', default=None, metavar='FICHIER',
+                        help="extraits des comptes communaux (csv, txt, xlsx, xls)")
+    parser.add_argument('--dvf', nargs='+', default=None, metavar='FICHIER',
+                        help="fichiers DVF des mutations immobilières (geo-dvf ou valeursfoncieres-AAAA.txt)")
+    parser.add_argument('--unit', choices=list(COMPTES_UNITES), default='euros',
+                        help="unité des montants des comptes (euros par défaut), convertis en M€")
+    _add_reading_arguments(parser)
+
+def _add_reading_arguments(parser):
+    parser.add_argument('--workers', type=int, default=None, help="processus d'agrégation (un fichier chacun)")
+    parser.add_argument('--map', nargs='+', default=None, metavar='EN_TETE=CHAMP',
+                        help="rattacher un en-tête non reconnu à une colonne du schéma ou à un champ DVF")
+    parser.add_argument('--chunksize', type=int, default=INGEST_CHUNKSIZE, help="lignes lues par bloc")
+    parser.add_argument('--sep', default=None, help="séparateur CSV (déduit de l'en-tête par défaut)")
+    parser.add_argument('--decimal', default=None, help="séparateur décimal (',' avec ; et |, '.' sinon)")
+    parser.add_argument('--encoding', default='utf-8', help="encodage des fichiers CSV")
+    parser.add_argument('--no-cache', action='store_true', help="ne pas conserver les copies colonne")
+    parser.add_argument('--refresh', action='store_true', help="reconvertir les fichiers déjà en cache")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="répertoire du cache de résultats")
+    parser.add_argument('--output', default=None, help="fichier csv, parquet ou feather des données agrégées")
+
+def _ingest_command(args):
+    """Agrège les fichiers de données ouvertes et résume la couverture obtenue"""
+    table = ingest_open_data(args.comptes, args.dvf, _parse_mapping(args.map), args.chunksize,
+                             None if args.no_cache else args.cache_dir, args.refresh, args.sep, args.decimal,
+                             args.encoding, args.workers, args.unit)
+    covered = [column for column in COLONNES if table[column].notna().any()]
+    print(f"📊 {len(table)} lignes arrondissement-année, {table['Annee'].min()}-{table['Annee'].max()}, "
+          f"{table['Arrondissement'].nunique()} arrondissements")
+    print(f"   Indicateurs renseignés ({len(covered)}/{len(COLONNES)}): {', '.join(covered)}")
+    if args.output:
+        export_data(table, args.output)
+        print(f"💾 Données sauvegardées: {args.output}")
+    return table
+
+def _add_sales_arguments(parser):
+    parser.add_argument('files', nargs='+', metavar='FICHIER',
+                        help="ventes : fichiers DVF ou une vente par ligne (prix, surface, date, code postal)")
+    parser.add_argument('--year', type=int, default=None, help="année résumée (par défaut la dernière)")
+    _add_reading_arguments(parser)
+
+def _sales_command(args):
+    """Prix au m² moyen et médian et transactions par arrondissement, depuis des fichiers de ventes"""
+    aggregate = aggregate_sales(args.files, args.workers, _parse_mapping(args.map), args.chunksize,
+                                None if args.no_cache else args.cache_dir, args.refresh, args.sep, args.decimal,
+                                args.encoding)
+    table = aggregate.to_frame()
+    if table.empty:
+        raise SystemExit("Aucune vente à Marseille dans ces fichiers")
+    year = args.year or int(table['Annee'].max())
+    print(f"🏠 Ventes de logements en {year} (prix au m² : moyenne / médiane à {aggregate.alpha:.1%} près)")
+    for row in table[table['Annee'] == year].itertuples(index=False):
+        print(f"  {row.Arrondissement:>4}: {row.Prix_m2_Moyen:8,.0f} € / {row.Prix_m2_Median:8,.0f} €  "
+              f"{row.Transactions_Immobilieres:7,.0f} transactions")
+    if args.output:
+        export_data(table, args.output)
+        print(f"💾 Agrégats sauvegardés: {args.output}")
+    return table
+
+def _add_calibrate_arguments(parser):
+    parser.add_argument('observed', metavar='FICHIER',
+                        help="séries observées par arrondissement et année (sortie de ingest ou sales)")
+    parser.add_argument('--arrondissements', nargs='+', default=['all'], type=_arrondissement_argument,
+                        help="arrondissements à calibrer ou 'all' (par défaut les 16)")
+    parser.add_argument('--workers', type=int, default=None, help="processus de calibration")
+    parser.add_argument('--output', default='calibration.json', help="fichier JSON des paramètres calibrés")
+    parser.add_argument('--report', default=None, help="fichier csv, parquet ou feather du rapport d'ajustement")
+
+def _calibrate_command(args):
+    """Calibration sur des séries observées et rapport de qualité d'ajustement"""
+    parameters, report = calibrate(load_data(args.observed), _parse_arrondissements(args.arrondissements),
+                                   args.workers)
+    if report.empty:
+        raise SystemExit(f"Aucun indicateur calibrable ({', '.join(CALIBRATION_PARAMETRES)}) "
+                         f"avec au moins {CALIBRATION_MIN_OBSERVATIONS} années observées")
+    print(f"🎯 Calibration de {len(parameters)} arrondissements en {report.attrs['duree_totale']:.2f}s "
+          "(erreur quadratique en log, avant → après)")
+    for arrondissement, rows in report.groupby('Arrondissement', sort=False):
+        fits = ', '.join(f"{row.Indicateur} {row.Erreur_Avant:.1%} → {row.Erreur_Apres:.1%} ({row.Observations} ans)"
+                         for row in rows.itertuples())
+        print(f"  {arrondissement:>4} [{rows['Duree_s'].iat[0] * 1000:.0f} ms]: {fits}")
+    save_calibration(parameters, args.output)
+    print(f"💾 Paramètres calibrés: {args.output} (generate --calibration {args.output})")
+    if args.report:
+        export_data(report, args.report)
+    return parameters
+
+def _add_forecast_arguments(parser):
+    parser.add_argument('--arrondissements', nargs='+', default=['all'], type=_arrondissement_argument,
+                        help="arrondissements à projeter ou 'all' (par défaut les 16)")
+    parser.add_argument('--end-year', type=int, default=2040, help="dernière année projetée")
+    parser.add_argument('--replicas', type=int, default=1, help="répliques Monte Carlo ajustées")
+    parser.add_argument('--method', choices=FORECAST_METHODS, default='regression', help="modèle de prévision")
+    parser.add_argument('--columns', nargs='+', default=list(FORECAST_COLUMNS), choices=COLONNES,
+                        metavar='COLONNE', help="indicateurs projetés")
+    parser.add_argument('--seed', type=int, default=None, help="graine aléatoire")
+    parser.add_argument('--workers', type=int, default=None, help="processus d'ajustement")
+    parser.add_argument('--no-cache', action='store_true', help="ne pas conserver les modèles ajustés")
+    parser.add_argument('--refresh', action='store_true', help="réajuster les modèles en cache")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="répertoire du cache de résultats")
+    parser.add_argument('--output', default=None, help="fichier csv, parquet ou feather des prévisions")
+
+def _forecast_command(args):
+    """Prévisions et résumé de la dernière année projetée"""
+    table = forecast(_parse_arrondissements(args.arrondissements), args.end_year, args.replicas, args.method,
+                     args.columns, args.seed, args.workers, None if args.no_cache else args.cache_dir,
+                     args.refresh)
+    final = table[table['Annee'] == args.end_year]
+    print(f"🔮 Prévisions {args.method} jusqu'en {args.end_year} ({args.replicas} répliques)")
+    for column in args.columns:
+        bands = final.groupby('Arrondissement', observed=True)[column].quantile([0.05, 0.5, 0.95]).unstack()
+        print(f"\n{column} en {args.end_year} (P5 / P50 / P95):")
+        for arrondissement, row in bands.iterrows():
+            print(f"  {arrondissement}: {row[0.05]:,.1f} / {row[0.5]:,.1f} / {row[0.95]:,.1f}")
+    if args.output:
+        export_data(table, args.output)
+        print(f"💾 Prévisions sauvegardées: {args.output}")
+    return table
+
+def _add_memory_arguments(parser):
+    parser.add_argument('--arrondissements', nargs='+', default=['all'], type=_arrondissement_argument,
+                        help="arrondissements à générer ou 'all' (par défaut les 16)")
+    parser.add_argument('--resolution', choices=list(RESOLUTIONS), default='mensuelle', help="pas de temps")
+    parser.add_argument('--replicas', type=int, default=1, help="répliques Monte Carlo (résolution annuelle)")
+    parser.add_argument('--seed', type=int, default=0, help="graine aléatoire")
+    parser.add_argument('--output', default=None,
+                        help="fichier csv, parquet ou feather de la table compacte (sans rapport)")
+
+def _memory_command(args):
+    """Rapport mémoire standard / compact, ou export de la table compacte de la ville"""
+    arrondissements = _parse_arrondissements(args.arrondissements)
+    if args.output:
+        table = generate_city_data(arrondissements, args.resolution, args.replicas, args.seed)
+        export_data(table, args.output)
+        print(f"💾 Table compacte ({len(table):,} lignes) sauvegardée: {args.output}")
+        return table
+    report = memory_report(arrondissements, args.resolution, args.replicas, args.seed)
+    print(f"🧮 Mémoire des données de la ville ({args.resolution}, {args.replicas} répliques)")
+    for row in report.itertuples():
+        print(f"  {row.Mode:<8} {row.Lignes:>10,} lignes  table {row.Octets_Table / 2**20:8.1f} Mo"
+              f"  pic {row.Pic_Construction / 2**20:8.1f} Mo  {row.Duree_s:6.2f} s  ×{row.Ratio_Table:.2f}")
+    return report
+
+def _add_batch_arguments(parser):
+    parser.add_argument('--arrondissements', nargs='+', default=['all'], type=_arrondissement_argument,
+                        help="arrondissements à traiter ou 'all' (par défaut les 16)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="nombre de processus (par défaut le nombre de cœurs)")
+    parser.add_argument('--seed', type=int, default=None, help="graine aléatoire")
+    parser.add_argument('--output-dir', default='.', help="répertoire de sortie")
+    parser.add_argument('--compare-serial', action='store_true',
+                        help="exécuter aussi le lot en série pour mesurer l'accélération")
+    parser.add_argument('--format', dest='file_format', choices=list(EXPORT_FORMATS), default='csv',
+                        help="format d'export des données")
+    parser.add_argument('--float32', action='store_true', help="exporter les indicateurs en float32")
+    parser.add_argument('--partitioned', action='store_true',
+                        help="un seul jeu de données partitionné par arrondissement (parquet, feather)")
+    parser.add_argument('--data-only', action='store_true',
+                        help="générer et exporter les données sans rendre de figure (matplotlib non importé)")
+    parser.add_argument('--dpi', type=int, default=300, help="résolution des figures")
+    parser.add_argument('--figure-format', choices=FIGURE_FORMATS, default='png', help="format des figures")
+    parser.add_argument('--render-workers', type=int, default=None,
+                        help="rendre les dix panneaux de chaque figure en parallèle sur N processus")
+    parser.add_argument('--no-cache', action='store_true', help="désactiver le cache de résultats")
+    parser.add_argument('--refresh', action='store_true',
+                        help="ignorer les entrées en cache et les régénérer")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="répertoire du cache de résultats")
+    parser.add_argument('--cache-size-mb', type=int, default=CACHE_MAX_BYTES // (1024 * 1024),
+                        help="taille maximale du cache (Mo)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="ne recalculer que les colonnes et panneaux touchés par une modification (via le cache)")
+    parser.add_argument('--metrics', action='store_true',
+                        help="instrumenter les étapes (durées, pic mémoire tracemalloc, compteurs)")
+    parser.add_argument('--trace', default=None, help="fichier de trace Chrome (implique --metrics)")
+    parser.add_argument('--prometheus', default=None,
+                        help="fichier de métriques au format texte Prometheus (implique --metrics)")
+
+def _batch_command(args):
+    """Traitement par lots de plusieurs arrondissements, avec rapport de durées"""
+    print("🏛️ TRAITEMENT PAR LOTS - MARSEILLE ARRONDISSEMENTS")
+    print("=" * 75)
+    report = run_batch(_parse_arrondissements(args.arrondissements), args.workers, args.seed,
+                       args.output_dir, args.compare_serial,
+                       file_format=args.file_format, float32=args.float32, partitioned=args.partitioned,
+                       cache_dir=None if args.no_cache else args.cache_dir,
+                       cache_max_bytes=args.cache_size_mb * 1024 * 1024, refresh=args.refresh,
+                       dpi=args.dpi, figure_format=args.figure_format, data_only=args.data_only,
+                       instrument_stages=bool(args.metrics or args.trace or args.prometheus),
+                       incremental=args.incremental, render_workers=args.render_workers)
+
+    print(f"🎲 Graine aléatoire: {report['seed']}")
+    print(f"⚙️ Processus: {report['workers']}")
+    for arrondissement, timings in report['arrondissements'].items():
+        details = ', '.join(f"{stage}: {timings[stage]:.2f}s" for stage in BATCH_STAGES)
+        if args.incremental and 'colonnes_recalculees' in timings:
+            details += (f", colonnes recalculées: {timings['colonnes_recalculees']}"
+                        f", panneaux redessinés: {timings.get('panneaux_recalcules', 0)}")
+        print(f"  {arrondissement}e arrondissement - {details}, cache: {timings['cache_hits']}")
+    print("\n⏱️ Durée cumulée par étape:")
+    for stage, duration in report['etapes'].items():
+        print(f"  {stage}: {duration:.2f}s")
+    mode = "mesurée" if report['acceleration_mesuree'] else "estimée d'après le temps CPU"
+    print(f"\n🚀 Lot parallèle: {report['duree_parallele_s']:.2f}s, "
+          f"série ({mode}): {report['duree_serie_s']:.2f}s, "
+          f"accélération: x{report['acceleration']:.1f}")
+
+    metrics = report['metriques']
+    if metrics is not None:
+        print("\n🔬 Étapes instrumentées les plus longues (cumul des processus):")
+        for name, stats in sorted(metrics.stages.items(), key=lambda item: -item[1]['duree_s'])[:10]:
+            print(f"  {name}: {stats['duree_s']:.3f}s, {stats['appels']} appels, "
+                  f"pic mémoire {stats['pic_memoire_octets'] / 1024 ** 2:.1f} Mo")
+        for name, value in metrics.counters.items():
+            print(f"  {name}: {value}")
+        if args.trace:
+            print(f"🧭 Trace Chrome: {metrics.write_chrome_trace(args.trace)}")
+        if args.prometheus:
+            with open(args.prometheus, 'w', encoding='utf-8') as f:
+                f.write(metrics.prometheus_text())
+            print(f"📟 Métriques Prometheus: {args.prometheus}")
+    return report
+
+def _add_serve_arguments(parser):
+    parser.add_argument('--host', default='127.0.0.1', help="adresse d'écoute")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="port d'écoute")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processus de rendu des figures (par défaut le nombre de cœurs)")
+    parser.add_argument('--seed', type=int, default=None, help="graine aléatoire")
+    parser.add_argument('--dpi', type=int, default=100, help="résolution par défaut des figures")
+    parser.add_argument('--no-cache', action='store_true', help="désactiver le cache de résultats disque")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="répertoire du cache de résultats")
+
+def _serve_command(args):
+    serve(args.host, args.port, seed=args.seed, workers=args.workers, dpi=args.dpi,
+          cache_dir=None if args.no_cache else args.cache_dir)
+
+def _add_loadtest_arguments(parser):
+    parser.add_argument('--host', default='127.0.0.1', help="adresse du service")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="port du service")
+    parser.add_argument('--requests', type=int, default=200, help="nombre total de requêtes")
+    parser.add_argument('--concurrency', type=int, default=16, help="nombre de clients simultanés")
+    parser.add_argument('--paths', nargs='+', default=None,
+                        help="chemins interrogés à tour de rôle (par défaut /data, /insights et /figure des 16)")
+    parser.add_argument('--spawn', action='store_true',
+                        help="démarrer un service temporaire (python Marseille.py serve) pour la mesure")
+
+def _loadtest_command(args):
+    """Test de charge, éventuellement contre un service démarré pour l'occasion"""
+    import urllib.request
+
+    process = None
+    if args.spawn:
+        process = subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve',
+                                    '--host', args.host, '--port', str(args.port)])
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                urllib.request.urlopen(f'http://{args.host}:{args.port}/health', timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    process.terminate()
+                    raise SystemExit("Le service n'a pas démarré")
+                time.sleep(0.1)
+    try:
+        return load_test(args.host, args.port, args.requests, args.concurrency, args.paths)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+def _add_bench_arguments(parser):
+    parser.add_argument('--only', nargs='+', default=None,
+                        help="expressions régulières filtrant les cas (ex: ensemble export/parquet)")
+    parser.add_argument('--min-time', type=float, default=0.5, help="durée minimale de mesure par cas (s)")
+    parser.add_argument('--max-repeats', type=int, default=50, help="nombre maximal de répétitions par cas")
+    parser.add_argument('--output', default=None, help="fichier JSON des résultats (par défaut benchmarks/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('AVANT', 'APRES'), default=None,
+                        help="comparer deux fichiers de résultats au lieu de mesurer")
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help="ratio de médianes au-delà duquel un cas est une régression")
+    parser.add_argument('--startup', action='store_true',
+                        help="mesurer seulement le temps d'import à froid de chaque scénario de démarrage")
+    parser.add_argument('--rendering', action='store_true',
+                        help="comparer seulement le rendu sur une nouvelle figure et sur une figure réutilisée")
+    parser.add_argument('--dpi', type=int, default=100, help="résolution des figures (--rendering)")
+    parser.add_argument('--figure-format', choices=FIGURE_FORMATS, default='png', help="format des figures (--rendering)")
+
+def _bench_command(args):
+    if args.startup:
+        return benchmark_startup()
+    if args.rendering:
+        return benchmark_rendering(dpi=args.dpi, file_format=args.figure_format)
+    if args.compare:
+        report = compare_benchmarks(*args.compare, threshold=args.threshold)
+        if report['regressions']:
+            raise SystemExit(1)
+        return report
+    return run_benchmarks(args.only, args.min_time, args.max_repeats, args.output)
+
+def cli(argv=None):
+    """Interface en ligne de commande non interactive (generate, insights, scenarios, forecast, ingest, sales, calibrate, batch, bench, serve, loadtest)"""
+    parser = argparse.ArgumentParser(
+        prog='Marseille.py',
+        description="Analyse des comptes communaux et immobiliers des arrondissements de Marseille")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser(
+        'generate', help="générer les données (flux NDJSON ou fichiers), sans figure ni saisie")
+    _add_generate_arguments(generate)
+    generate.set_defaults(handler=_generate_command)
+
+    insights = commands.add_parser(
+        'insights', help="indicateurs des insights de chaque arrondissement et réplique, en une table")
+    _add_insights_arguments(insights)
+    insights.set_defaults(handler=_insights_command)
+
+    scenarios = commands.add_parser(
+        'scenarios', help="balayage d'une grille de leviers et résumé de sensibilité (tornade)")
+    _add_scenarios_arguments(scenarios)
+    scenarios.set_defaults(handler=_scenarios_command)
+
+    ingest = commands.add_parser(
+        'ingest', help="données ouvertes réelles (comptes communaux, DVF) au schéma des données générées")
+    _add_ingest_arguments(ingest)
+    ingest.set_defaults(handler=_ingest_command)
+
+    sales = commands.add_parser(
+        'sales', help="prix au m² (moyenne, médiane) et transactions par arrondissement depuis des fichiers de ventes")
+    _add_sales_arguments(sales)
+    sales.set_defaults(handler=_sales_command)
+
+    calibration = commands.add_parser(
+        'calibrate', help="ajustement des croissances et régimes conjoncturels sur des séries observées")
+    _add_calibrate_arguments(calibration)
+    calibration.set_defaults(handler=_calibrate_command)
+
+    projection = commands.add_parser(
+        'forecast', help="projection des prix, transactions et dette au-delà des années simulées")
+    _add_forecast_arguments(projection)
+    projection.set_defaults(handler=_forecast_command)
+
+    memory = commands.add_parser(
+        'memory', help="table compacte de la ville (float32, catégories) et rapport mémoire face au mode standard")
+    _add_memory_arguments(memory)
+    memory.set_defaults(handler=_memory_command)
+
+    batch = commands.add_parser(
+        'batch', help="génération, export et rendu de plusieurs arrondissements en parallèle")
+    _add_batch_arguments(batch)
+    batch.set_defaults(handler=_batch_command)
+
+    bench = commands.add_parser('bench', help="suite de benchmarks (résultats JSON comparables entre commits)")
+    _add_bench_arguments(bench)
+    bench.set_defaults(handler=_bench_command)
+
+    service = commands.add_parser(
+        'serve', help="service HTTP local (/data, /insights, /figure) gardant les résultats en mémoire")
+    _add_serve_arguments(service)
+    service.set_defaults(handler=_serve_command)
+
+    loadtest = commands.add_parser('loadtest', help="test de charge du service (latences p50/p99)")
+    _add_loadtest_arguments(loadtest)
+    loadtest.set_defaults(handler=_loadtest_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
 
 def main():
     """Fonction principale pour Marseille"""
@@ -1107,6 +4458,7 @@ def main():
     
     # Initialiser l'analyseur
     analyzer = MarseilleArrondissementImmobilierAnalyzer(arrondissement_selectionne)
+    print(f"🎲 Graine aléatoire: {analyzer.seed}")
     
     # Générer les données
     financial_data = analyzer.generate_financial_data()
@@ -1129,4 +4481,7 @@ def main():
     print("🏠 Données: Démographie, finances, marché immobilier, investissements")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        cli(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
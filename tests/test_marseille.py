@@ -0,0 +1,260 @@
+"""Propriétés du moteur de simulation, une section par demande"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import Marseille as M
+
+ARRONDISSEMENTS = list(M.ARRONDISSEMENT_KEYS[1:])
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def _analyzer(arrondissement, seed=7):
+    return M.MarseilleArrondissementImmobilierAnalyzer(arrondissement, seed=seed)
+
+
+# Moteur vectorisé (user-001)
+
+# Sorties de la version d'origine (boucles année par année, _add_marseille_trends compris) pour les 16
+# arrondissements, le bruit désactivé en faisant renvoyer sa moyenne à np.random.normal
+BASELINE_TRENDS = os.path.join(DATA_DIR, 'baseline_trends.csv')
+
+
+@pytest.mark.parametrize('arrondissement', ARRONDISSEMENTS)
+def test_vectorized_models_match_baseline_loops(arrondissement):
+    baseline = pd.read_csv(BASELINE_TRENDS)
+    baseline = baseline[baseline['Arrondissement'] == arrondissement].reset_index(drop=True)
+    analyzer = _analyzer(arrondissement)
+    np.testing.assert_array_equal(analyzer._years(), baseline['Annee'])
+    trends = pd.DataFrame(analyzer.simulate_trends(), columns=M.COLONNES)
+    assert len(M.COLONNES) == 26
+    for column in M.COLONNES:
+        np.testing.assert_allclose(trends[column], baseline[column], rtol=1e-12, err_msg=column)
+
+
+# Flux aléatoires par arrondissement et par indicateur (user-003)
+
+def test_seeded_generation_is_reproducible():
+    first = _analyzer('6').generate_financial_data('mensuelle')
+    pd.testing.assert_frame_equal(first, _analyzer('6').generate_financial_data('mensuelle'))
+    assert not first.equals(_analyzer('6', seed=8).generate_financial_data('mensuelle'))
+
+
+def test_column_subset_equals_full():
+    analyzer = _analyzer('2')
+    full = analyzer.generate_financial_data()
+    analyzer._reset_streams()
+    subset = analyzer._simulate_chunk(analyzer._years(), 'annuelle', columns=['Prix_m2_Moyen', 'Dette_Totale'])
+    pd.testing.assert_frame_equal(subset[['Prix_m2_Moyen', 'Dette_Totale']], full[['Prix_m2_Moyen', 'Dette_Totale']])
+
+
+def test_benchmark_generation_runs():
+    assert M.benchmark_generation(repeats=2) > 0
+
+
+# Lot parallèle (user-004)
+
+def test_parallel_batch_equals_serial(tmp_path):
+    report = M.run_batch(['1', '6'], workers=2, seed=5, output_dir=str(tmp_path), file_format='parquet',
+                         data_only=True)
+    assert not report['acceleration_mesuree']
+    assert report['duree_serie_s'] == pytest.approx(sum(t['cpu_s'] for t in report['arrondissements'].values()))
+    for arrondissement in ('1', '6'):
+        exported = pd.read_parquet(
+            tmp_path / f'{arrondissement}e_arrondissement_marseille_data_2002_2025.parquet')
+        pd.testing.assert_frame_equal(exported, _analyzer(arrondissement, seed=5).generate_financial_data())
+
+
+# Table de configuration compilée (user-005)
+
+@pytest.mark.parametrize('name', ['17', '0', 'foo', 'default'])
+def test_unknown_arrondissement_is_rejected(name):
+    with pytest.raises(ValueError, match='Arrondissement inconnu'):
+        M.MarseilleArrondissementImmobilierAnalyzer(name)
+
+
+@pytest.mark.parametrize('name, key', [('1', '1er'), ('1er', '1er'), (6, '6e'), ('16ème', '16e')])
+def test_arrondissement_spellings_share_a_config(name, key):
+    assert M.MarseilleArrondissementImmobilierAnalyzer(name).config is M.ARRONDISSEMENT_CONFIGS[key]
+
+
+# Résolutions infra-annuelles et blocs (user-007)
+
+@pytest.mark.parametrize('resolution', ['annuelle', 'trimestrielle', 'mensuelle'])
+def test_chunked_generation_equals_full(resolution):
+    analyzer = _analyzer('13')
+    full = analyzer.generate_financial_data(resolution)
+    chunks = pd.concat(analyzer.iter_financial_data(resolution, chunk_years=7), ignore_index=True)
+    pd.testing.assert_frame_equal(chunks, full)
+
+
+# Exports colonnes et relecture sélective (user-008)
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet', 'feather'])
+def test_load_data_accepts_arrondissement_numbers(tmp_path, file_format):
+    path = str(tmp_path / f'ville.{file_format}')
+    M.export_data(M.generate_city_data(['1', '6'], seed=1, compact=False), path)
+    assert len(M.load_data(path, arrondissements=[6])) == len(M.load_data(path, arrondissements=['6e'])) == 24
+    assert list(M.load_data(path, ['Population'], ['1']).columns) == ['Population']
+    with pytest.raises(ValueError):
+        M.load_data(path, arrondissements=['99'])
+
+
+# Cache de résultats (user-009)
+
+def test_cache_tracks_size_without_rescanning(tmp_path, monkeypatch):
+    scans = []
+    evict = M.ResultCache.evict
+    monkeypatch.setattr(M.ResultCache, 'evict', lambda self, *args: scans.append(1) or evict(self, *args))
+    for i in range(200):
+        cache = M.ResultCache(str(tmp_path), max_bytes=50_000)
+        cache.put_array(str(i), np.zeros(100))
+    disk = sum(entry.stat().st_size for entry in tmp_path.iterdir())
+    assert cache.size == disk <= 50_000
+    assert len(scans) < 50
+    assert np.array_equal(cache.get_array('199'), np.zeros(100))
+
+
+# Rendu headless (user-010)
+
+def test_reused_figure_keeps_image_dimensions(tmp_path):
+    import matplotlib.image
+
+    analyzer = _analyzer('1')
+    df = analyzer.generate_financial_data()
+    figure = M.AnalysisFigure(managed=False)
+    shapes = []
+    for reused in (None, figure, figure):
+        path = analyzer.create_financial_analysis(df, str(tmp_path), headless=True, dpi=20, figure=reused)
+        shapes.append(matplotlib.image.imread(path).shape)
+    assert shapes[0] == shapes[1] == shapes[2] == (28 * 20, 20 * 20, 4)
+
+
+# Ligne de commande (user-013)
+
+@pytest.mark.parametrize('command', ['generate', 'batch', 'insights', 'forecast', 'memory'])
+def test_cli_rejects_unknown_arrondissement(command, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        M.cli([command, '--arrondissements', '1', '17'])
+    assert exit_info.value.code == 2
+    assert 'arrondissement inconnu: 17' in capsys.readouterr().err
+
+
+# Cube de la ville (user-016)
+
+def test_city_trends_match_each_arrondissement():
+    city = M.simulate_city_trends()
+    for number, arrondissement in enumerate(ARRONDISSEMENTS):
+        np.testing.assert_array_equal(city[number], _analyzer(arrondissement).simulate_trends())
+
+
+# Balayage de scénarios (user-019)
+
+def test_scenario_sweep_shares_trends_between_covid_levels(monkeypatch):
+    evaluated = {}
+    for column, method in (('Population', '_simulate_population'), ('Prix_m2_Moyen', '_simulate_avg_price_per_sqm')):
+        model = getattr(M.MarseilleArrondissementImmobilierAnalyzer, method)
+
+        def counted(self, years, column=column, model=model):
+            evaluated[column] = evaluated.get(column, 0) + np.size(self.params)
+            return model(self, years)
+        monkeypatch.setattr(M.MarseilleArrondissementImmobilierAnalyzer, method, counted)
+
+    table = M.scenario_sweep({'prix_m2_base': [1.0, 1.1], 'covid': [0, 1, 1.5]}, ['1', '2'], workers=1)
+    assert table['Scenario'].nunique() == 6
+    # Tendances une fois par combinaison des leviers de paramètres (2) et arrondissement (2) ;
+    # les prix, qui lisent les régimes COVID, une fois de plus par intensité COVID (3)
+    assert evaluated == {'Population': 2 * 2, 'Prix_m2_Moyen': 2 * 2 + 2 * 3 * 2}
+
+
+def test_scenario_sweep_matches_each_scenario_alone():
+    table = M.scenario_sweep({'prix_m2_base': [1.0, 1.1], 'covid': [0, 1.5]}, ['1', '13'])
+    years = np.arange(2002, 2026)
+    for _, rows in table.groupby('Scenario'):
+        params = M.CONFIG_TABLE[[1, 13]].copy()
+        params['prix_m2_base'] *= rows['prix_m2_base'].iat[0]
+        M._scale_covid_regimes(params, rows['covid'].iat[0])
+        expected = (M._scenario_trends(params, 2002, 2025)
+                    * M._scenario_event_factors(years, M.EVENEMENTS_MARSEILLE, rows['covid'].iat[0]))
+        np.testing.assert_allclose(rows[list(M.COLONNES)].to_numpy(), expected.reshape(-1, len(M.COLONNES)),
+                                   rtol=1e-13)
+
+
+def test_residence_tax_lever_stays_non_negative():
+    table = M.scenario_sweep({'suppression_taxe_habitation': [0.15, 0.4]}, ['1'])
+    assert (table['Taxe_Habitation'] >= 0).all()
+
+
+# Régénération incrémentale (user-020)
+
+def test_incremental_equals_full_regeneration(tmp_path):
+    cache = M.ResultCache(str(tmp_path))
+    analyzer = _analyzer('8')
+    data, stale = analyzer.generate_incremental(cache)
+    assert stale == list(M.COLONNES)
+    pd.testing.assert_frame_equal(data, analyzer.generate_financial_data())
+
+    analyzer.events = analyzer.events + [(2024, 2025, 'Prix_m2_Moyen', 1.1, "Test")]
+    data, stale = analyzer.generate_incremental(cache)
+    assert stale == ['Prix_m2_Moyen']
+    pd.testing.assert_frame_equal(data, analyzer.generate_financial_data())
+
+
+def test_incremental_batch_reads_the_cached_frame_once(tmp_path, monkeypatch):
+    options = dict(seed=3, output_dir=str(tmp_path), cache_dir=str(tmp_path / 'cache'), incremental=True,
+                   data_only=True)
+    M._run_arrondissement('4', **options)
+    reads = []
+    get_data, get_array = M.ResultCache.get_data, M.ResultCache.get_array
+    monkeypatch.setattr(M.ResultCache, 'get_data', lambda self, key: reads.append('data') or get_data(self, key))
+    monkeypatch.setattr(M.ResultCache, 'get_array', lambda self, key: reads.append('array') or get_array(self, key))
+    timings = M._run_arrondissement('4', **options)
+    assert reads == ['data'] and timings['cache_hits'] == 1 and timings['colonnes_recalculees'] == 0
+
+
+# Ingestion des comptes communaux (user-022)
+
+@pytest.mark.parametrize('unit, scale', [('euros', 1e6), ('milliers', 1e3), ('millions', 1.0)])
+def test_ingested_accounts_round_trip_to_model_units(tmp_path, unit, scale):
+    simulated = _analyzer('1').generate_financial_data()
+    accounts = simulated.copy()
+    accounts[list(M.MONETAIRES)] *= scale
+    accounts.insert(1, 'code_insee', 13201)
+    path = tmp_path / 'comptes.csv'
+    accounts.to_csv(path, sep=';', index=False)
+
+    ingested = M.ingest_open_data(comptes=str(path), cache_dir=None, decimal='.', unit=unit)
+    assert (ingested['Arrondissement'] == '1er').all()
+    np.testing.assert_array_equal(ingested['Annee'], simulated['Annee'])
+    for column in M.COLONNES:
+        np.testing.assert_allclose(ingested[column], simulated[column], rtol=1e-9, err_msg=column)
+    # Montants en M€ : même ordre de grandeur que le budget de référence de l'arrondissement
+    assert 0.1 < ingested['Recettes_Totales'].median() / M.CONFIG_TABLE['budget_base'][1] < 10
+
+
+# Ensembles Monte Carlo (user-002)
+
+def test_ensemble_bands_come_from_the_seeded_ensemble():
+    ensemble = _analyzer('5').generate_ensemble(200)
+    assert ensemble.shape == (200, 24, len(M.COLONNES))
+    np.testing.assert_array_equal(ensemble, _analyzer('5').generate_ensemble(200))
+    bands = _analyzer('5').ensemble_percentiles(200)
+    np.testing.assert_allclose(bands['Prix_m2_Moyen_P50'], np.percentile(ensemble[..., M.COLONNES.index('Prix_m2_Moyen')], 50, axis=0))
+    assert (bands['Prix_m2_Moyen_P5'] <= bands['Prix_m2_Moyen_P50']).all()
+    assert (bands['Prix_m2_Moyen_P50'] <= bands['Prix_m2_Moyen_P95']).all()
+
+
+# Mode compact (user-025)
+
+@pytest.mark.parametrize('resolution, n_replicas', [('annuelle', 1), ('mensuelle', 1), ('annuelle', 20)])
+def test_compact_city_data_within_float32_tolerance(resolution, n_replicas):
+    standard = M.generate_city_data(['1', '9'], resolution, n_replicas, seed=3, compact=False)
+    compact = M.generate_city_data(['1', '9'], resolution, n_replicas, seed=3)
+    assert list(compact.columns) == list(standard.columns)
+    assert (compact[list(M.COLONNES)].dtypes == np.float32).all()
+    assert compact['Annee'].dtype == np.int16
+    np.testing.assert_allclose(compact[list(M.COLONNES)].to_numpy(), standard[list(M.COLONNES)].to_numpy(), rtol=1e-6)
+    for column in compact.columns.difference(M.COLONNES):
+        assert (compact[column].to_numpy() == standard[column].to_numpy()).all()